@@ -5,6 +5,7 @@ from .technical import TechnicalReviewer
 from .domain import DomainReviewer
 from .ethics import EthicsReviewer
 from .clarity import ClarityReviewer
+from .screening import ScreeningReviewer
 from .meta import MetaReviewer
 
 __all__ = [
@@ -13,5 +14,6 @@ __all__ = [
     'DomainReviewer',
     'EthicsReviewer',
     'ClarityReviewer',
+    'ScreeningReviewer',
     'MetaReviewer'
 ]
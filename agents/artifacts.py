@@ -0,0 +1,175 @@
+"""Content-Addressed Artifact Store"""
+
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import yaml
+
+from .extraction import file_digest
+
+MANIFEST_NAME = "manifest.yaml"
+REVISION_PATTERN = re.compile(r"revision_(\d+)\.pdf$")
+
+
+class LocalBackend:
+    """Stores blobs under a local directory, sharded by digest prefix."""
+
+    def __init__(self, root: str = "artifacts"):
+        self.root = Path(root)
+
+    def path(self, digest: str) -> Path:
+        return self.root / "sha256" / digest[:2] / digest
+
+    def has(self, digest: str) -> bool:
+        return self.path(digest).exists()
+
+    def put(self, digest: str, source: Path):
+        """Copy a file into the store unless the blob already exists."""
+        target = self.path(digest)
+        if target.exists():
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_suffix(".partial")
+        shutil.copyfile(source, partial)
+        partial.replace(target)
+
+    def get(self, digest: str) -> Path:
+        """Return a local path holding the blob."""
+        target = self.path(digest)
+        if not target.exists():
+            raise FileNotFoundError(f"Artifact {digest} not found in {self.root}")
+        return target
+
+
+class GitBackend(LocalBackend):
+    """Local backend whose blobs are committed; missing blobs are read from
+    the object database on demand, so sparse or blob-less clones (with the
+    store outside the sparse cone) only download the PDFs a job reads."""
+
+    def get(self, digest: str) -> Path:
+        target = self.path(digest)
+        if not target.exists():
+            # cat-file fetches just this blob from the promisor remote in a
+            # partial clone and works whether or not the path is checked out
+            target.parent.mkdir(parents=True, exist_ok=True)
+            partial = target.with_suffix(".partial")
+            with open(partial, "wb") as f:
+                result = subprocess.run(
+                    ["git", "-C", str(target.parent), "cat-file", "blob", f"HEAD:./{target.name}"],
+                    stdout=f, stderr=subprocess.PIPE, text=False
+                )
+            if result.returncode != 0:
+                partial.unlink(missing_ok=True)
+                raise FileNotFoundError(
+                    f"Artifact {digest} not found in {self.root}: git cat-file failed: "
+                    f"{result.stderr.decode(errors='replace').strip()}"
+                )
+            partial.replace(target)
+        return super().get(digest)
+
+
+BACKENDS = {
+    "local": LocalBackend,
+    "git": GitBackend,
+}
+
+
+class ArtifactStore:
+    """Deduplicated PDF storage addressed by SHA-256."""
+
+    def __init__(self, backend: LocalBackend):
+        self.backend = backend
+
+    @classmethod
+    def from_config(cls, config: dict) -> "ArtifactStore":
+        artifacts = config.get("artifacts", {})
+        backend = BACKENDS[artifacts.get("backend", "local")]
+        return cls(backend(artifacts.get("root", "artifacts")))
+
+    def put(self, path: Path) -> dict:
+        """Store a file and return its manifest entry."""
+        digest = file_digest(path)
+        self.backend.put(digest, path)
+        return {"sha256": digest, "size": Path(path).stat().st_size}
+
+    def fetch(self, digest: str) -> Path:
+        """Return a local path for a blob, verifying its content hash."""
+        path = self.backend.get(digest)
+        if file_digest(path) != digest:
+            raise ValueError(f"Artifact {digest} is corrupt")
+        return path
+
+
+def load_manifest(submission_dir: Path) -> dict:
+    """Load a submission's artifact manifest (empty if not migrated)."""
+    manifest_path = Path(submission_dir) / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {"files": {}}
+    with open(manifest_path) as f:
+        return yaml.safe_load(f) or {"files": {}}
+
+
+def save_manifest(submission_dir: Path, manifest: dict) -> Path:
+    manifest_path = Path(submission_dir) / MANIFEST_NAME
+    with open(manifest_path, "w") as f:
+        yaml.dump(manifest, f, default_flow_style=False, sort_keys=True)
+    return manifest_path
+
+
+def submission_pdfs(submission_dir: Path) -> list:
+    """Return the submission's PDF names (relative paths), oldest version first.
+
+    The original paper.pdf comes first, followed by revisions/revision_N.pdf
+    in revision order. Names come from both the manifest and the working tree.
+    """
+    submission_dir = Path(submission_dir)
+    names = set(load_manifest(submission_dir).get("files", {}))
+    names.update(p.name for p in submission_dir.glob("*.pdf"))
+    names.update(f"revisions/{p.name}" for p in submission_dir.glob("revisions/*.pdf"))
+
+    def order(name: str):
+        match = REVISION_PATTERN.search(name)
+        return (1, int(match.group(1)), name) if match else (0, 0, name)
+
+    return sorted(names, key=order)
+
+
+def resolve_pdf(submission_dir: Path, store: ArtifactStore = None, name: str = None) -> Path:
+    """Return a local path to the latest PDF version (or a named one)."""
+    submission_dir = Path(submission_dir)
+    pdfs = submission_pdfs(submission_dir)
+    if not pdfs:
+        raise FileNotFoundError("No PDF found")
+    name = name or pdfs[-1]
+
+    local_path = submission_dir / name
+    if local_path.exists():
+        return local_path
+
+    entry = load_manifest(submission_dir).get("files", {}).get(name)
+    if entry is None:
+        raise FileNotFoundError(f"No PDF named {name}")
+    if store is None:
+        from .registry import get_config
+        store = ArtifactStore.from_config(get_config())
+    return store.fetch(entry["sha256"])
+
+
+def migrate_submission(submission_dir: Path, store: ArtifactStore, keep: bool = False) -> dict:
+    """Move a submission's PDFs into the store and record them in its manifest."""
+    submission_dir = Path(submission_dir)
+    manifest = load_manifest(submission_dir)
+    files = manifest.setdefault("files", {})
+
+    for name in submission_pdfs(submission_dir):
+        local_path = submission_dir / name
+        if not local_path.exists():
+            continue
+        files[name] = store.put(local_path)
+        if not keep:
+            local_path.unlink()
+
+    save_manifest(submission_dir, manifest)
+    return manifest
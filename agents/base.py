@@ -3,33 +3,73 @@
 import os
 import yaml
 from abc import ABC, abstractmethod
-from anthropic import Anthropic
 from pathlib import Path
 
+from . import profiling, registry
+from .artifacts import resolve_pdf
+from .budget import estimate_tokens
+from .cascade import CascadePolicy
+from .figures import FigureExtractor
+from .hedging import HedgedCaller
+from .normalize import abbreviate_references
+from .thinking import ThinkingPolicy
+
 
 class BaseReviewer(ABC):
     """Base class for all review agents."""
 
     def __init__(self, config_path: str = "config.yaml"):
         self.config = self._load_config(config_path)
-        self.client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = self.config["review"]["model"]
-        self.max_tokens = self.config["review"]["max_tokens"]
-        self.temperature = self.config["review"]["temperature"]
+        self.settings = registry.ReviewSettings.from_config(self.config)
+        self._client = None
+        # Per-agent model override under review.agents.<name>
+        agent_settings = self.settings.agents.get(self.agent_type)
+        self.model = agent_settings.model if agent_settings else self.settings.model
+        self.max_tokens = self.settings.max_tokens
+        self.temperature = self.settings.temperature
 
         # Extended thinking configuration
         self.extended_thinking = self.config["review"].get("extended_thinking", {})
-        self.use_extended_thinking = self.extended_thinking.get("enabled", False)
-        self.thinking_budget = self.extended_thinking.get("budget_tokens", 10000)
+        self.use_extended_thinking = self.settings.thinking_enabled
+        self.thinking_policy = ThinkingPolicy(self.config)
+        # Per-agent overrides under review.agents.<name>
+        self.thinking_budget, self.max_tokens = self.thinking_policy.base_budget(self.agent_type)
+
+        # Cheap provisional pass before the full review
+        self.cascade = CascadePolicy(self.config)
+
+        # Figure and table images for agents that assess them
+        self.figures = FigureExtractor(self.config)
+
+        # Latency hedging and overload fallback, bounded per submission
+        self.hedging = HedgedCaller(self.config)
+        self.submission_id = None
+        self.last_call = {}
+
+        # Token usage of the most recent API call and of every call made by
+        # the current review, for the usage ledger
+        self.last_usage = {}
+        self.calls = []
+
+    @property
+    def client(self):
+        """Anthropic client, created on first use so importing agents stays light."""
+        if self._client is None:
+            from anthropic import Anthropic
+            self._client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+        return self._client
+
+    @client.setter
+    def client(self, client):
+        self._client = client
 
     def _load_config(self, path: str) -> dict:
-        with open(path) as f:
-            return yaml.safe_load(f)
+        return registry.get_config(path)
 
     def _load_prompt(self) -> str:
-        prompt_path = Path("prompts") / f"{self.agent_type}.md"
-        if prompt_path.exists():
-            return prompt_path.read_text()
+        prompt = registry.get_prompt(Path("prompts") / f"{self.agent_type}.md")
+        if prompt is not None:
+            return prompt
         return self._default_prompt()
 
     @property
@@ -49,11 +89,54 @@ class BaseReviewer(ABC):
         """Return default system prompt."""
         pass
 
-    def review(self, paper_content: str, metadata: dict) -> dict:
+    def review(self, paper_content: str, metadata: dict, submission_id: str = None) -> dict:
         """Execute review on paper content."""
-        system_prompt = self._load_prompt()
+        self.submission_id = submission_id
+        with profiling.stage("build_prompt"):
+            system_prompt = self._load_prompt()
+            paper_text, context = self._paper_sections(paper_content, metadata, submission_id)
+
+        user_prompt = self._user_prompt(paper_text, context, metadata)
+
+        self.calls = []
+        with profiling.stage("figures"):
+            images, figures = self._figure_blocks(submission_id)
+        if figures:
+            print(f"Attaching {figures['images']} figure/table images (~{figures['image_tokens']} tokens)")
+
+        cascade = None
+        if self.cascade.applies_to(self.agent_type):
+            provisional, cascade = self._pre_review(system_prompt, user_prompt, images)
+            print(f"Cascade: {'escalating' if cascade['escalated'] else 'accepted provisional review'} "
+                  f"({cascade['reason']})")
+            if not cascade["escalated"]:
+                provisional["review_metadata"] = {"cascade": cascade}
+                if figures:
+                    provisional["review_metadata"]["figures"] = figures
+                return provisional
+
+        thinking_budget, max_tokens = self.thinking_policy.budget(
+            self.agent_type,
+            paper_tokens=estimate_tokens(paper_content),
+            paper_type=metadata.get("paper_type"),
+        )
+        request_params = self._request_params(system_prompt, user_prompt, thinking_budget, max_tokens, images)
+
+        response_text = self._create(request_params)
+
+        with profiling.stage("parse_response"):
+            review = self._parse_response(response_text)
+        if isinstance(review, dict):
+            review["review_metadata"] = {"call": self.last_call}
+            if cascade:
+                review["review_metadata"]["cascade"] = cascade
+            if figures:
+                review["review_metadata"]["figures"] = figures
+        return review
 
-        user_prompt = f"""Please review the following paper submission.
+    def _user_prompt(self, paper_text: str, context: str, metadata: dict) -> str:
+        """Build the review request sent with the system prompt."""
+        return f"""Please review the following paper submission.
 
 ## Paper Metadata
 Title: {metadata.get('title', 'Untitled')}
@@ -62,43 +145,122 @@ Keywords: {', '.join(metadata.get('keywords', []))}
 
 ## Abstract
 {metadata.get('abstract', 'No abstract provided')}
-
+{context}
 ## Full Paper Content
-{paper_content}
+{paper_text}
 
 ---
 
 Please provide your review following the specified output format."""
 
-        # Build API request parameters
+    def _paper_sections(self, paper_content: str, metadata: dict, submission_id: str) -> tuple[str, str]:
+        """Return the paper text for the prompt and any extra context sections."""
+        if self.agent_type in self.config.get("extraction", {}).get("abbreviate_references", []):
+            paper_text, saved = abbreviate_references(str(paper_content))
+            if saved > 0:
+                print(f"Abbreviated the reference list to citation keys (~{saved} tokens saved)")
+                return paper_text, ""
+        return paper_content, ""
+
+    def _figure_blocks(self, submission_id: str) -> tuple[list, dict]:
+        """Return figure/table image blocks (and a summary) if this agent uses them."""
+        if not submission_id or not self.figures.applies_to(self.agent_type):
+            return [], None
+        try:
+            pdf_path = resolve_pdf(Path("submissions") / submission_id)
+        except FileNotFoundError:
+            return [], None
+        try:
+            return self.figures.content_blocks(pdf_path)
+        except Exception as e:
+            # Figures are an extra; a PDF the extractor chokes on is still reviewed from its text
+            error = f"{type(e).__name__}: {e}"
+            print(f"Figure extraction failed ({error}); reviewing text only")
+            return [], {"images": 0, "image_tokens": 0, "error": error}
+
+    def _pre_review(self, system_prompt: str, user_prompt: str, images: list = None) -> tuple[dict, dict]:
+        """Run the fast small-model pass with no thinking and decide on escalation."""
+        request_params = self._request_params(system_prompt, user_prompt, 0, self.cascade.max_tokens, images)
+        request_params["model"] = self.cascade.model
+
+        provisional = self._parse_response(self._create(request_params, stage="cascade"))
+        escalated, reason = self.cascade.should_escalate(provisional)
+        # calls[-1] is the hedge loser's copy when the call was hedged
+        self.last_usage["escalated"] = escalated
+
+        cascade = {
+            "model": self.cascade.model,
+            "escalated": escalated,
+            "reason": reason,
+        }
+        if isinstance(provisional, dict) and isinstance(provisional.get("scores"), dict):
+            cascade["provisional_overall"] = provisional["scores"].get("overall")
+            cascade["provisional_confidence"] = provisional.get("confidence")
+        return provisional, cascade
+
+    def _request_params(self, system_prompt: str, user_prompt: str,
+                        thinking_budget: int, max_tokens: int, images: list = None) -> dict:
+        """Build API request parameters for a thinking budget (0 disables thinking)."""
+        # Image blocks go before the text that refers to them
+        content = images + [{"type": "text", "text": user_prompt}] if images else user_prompt
         request_params = {
             "model": self.model,
-            "max_tokens": self.max_tokens,
+            "max_tokens": max_tokens,
             "system": system_prompt,
-            "messages": [{"role": "user", "content": user_prompt}]
+            "messages": [{"role": "user", "content": content}]
         }
 
         # Add extended thinking if enabled (for deeper analysis)
-        if self.use_extended_thinking:
+        if self.use_extended_thinking and thinking_budget:
             request_params["thinking"] = {
                 "type": "enabled",
-                "budget_tokens": self.thinking_budget
+                "budget_tokens": thinking_budget
             }
             # Extended thinking requires temperature=1
             request_params["temperature"] = 1
         else:
             request_params["temperature"] = self.temperature
 
-        response = self.client.messages.create(**request_params)
+        return request_params
+
+    def _create(self, request_params: dict, stage: str = "review") -> str:
+        """Call the API, record token usage and return the response text."""
+        with profiling.stage("api_call", network=True):
+            response, self.last_call = self.hedging.create(
+                self.client, request_params, self.agent_type, self.submission_id
+            )
 
         # Extract text response (may include thinking blocks)
         response_text = ""
         for block in response.content:
-            if hasattr(block, 'text'):
+            if getattr(block, "type", None) != "thinking" and hasattr(block, 'text') and not response_text:
                 response_text = block.text
-                break
 
-        return self._parse_response(response_text)
+        # Thinking bills as output tokens, but the returned thinking text is
+        # only a summary; the thinking share is billed output minus the
+        # visible text, used to tune the thinking policy.
+        usage = getattr(response, "usage", None)
+        output_tokens = getattr(usage, "output_tokens", 0) or 0
+        thinking_budget = request_params.get("thinking", {}).get("budget_tokens", 0)
+        self.last_usage = {
+            "model": self.last_call["model"],
+            "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+            "output_tokens": output_tokens,
+            "thinking_budget": thinking_budget,
+            "thinking_tokens": max(output_tokens - estimate_tokens(response_text), 0) if thinking_budget else 0,
+            "thinking_source": "billed",
+            "stage": stage,
+            "path": self.last_call["path"],
+            "latency_s": self.last_call["latency_s"],
+        }
+        self.calls.append(self.last_usage)
+
+        if self.last_call["hedged"]:
+            # The losing duplicate still bills; charge it at the winner's usage
+            self.calls.append(dict(self.last_usage, stage="hedge", path="loser",
+                                   latency_s=None, estimated=True))
+
+        return response_text
 
     def _parse_response(self, response_text: str) -> dict:
         """Parse agent response into structured format."""
@@ -131,7 +293,7 @@ Please provide your review following the specified output format."""
         review_dir.mkdir(parents=True, exist_ok=True)
 
         review_path = review_dir / f"{self.agent_type}.yaml"
-        with open(review_path, "w") as f:
+        with profiling.stage("save_review"), open(review_path, "w") as f:
             yaml.dump(review, f, default_flow_style=False, allow_unicode=True)
 
         return review_path
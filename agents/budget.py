@@ -0,0 +1,346 @@
+"""Token Budget Admission Control"""
+
+import json
+import os
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Rough conversion used for pre-flight estimates; actual spend comes from
+# the API usage fields recorded in the ledger.
+CHARS_PER_TOKEN = 4
+
+LEDGER_PATH = Path("output") / "metrics" / "usage.jsonl"
+
+# Branch that holds the ledger shared by every workflow run; PR branches
+# and checkouts are per-run, so spend recorded there is invisible to others
+LEDGER_BRANCH = "usage-ledger"
+
+# Prompt scaffolding around the paper (metadata header, abstract, instructions)
+PROMPT_OVERHEAD_TOKENS = 300
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a piece of text."""
+    if not text:
+        return 0
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def utc_today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+class CostModel:
+    """Estimates token usage and cost of a review before it runs."""
+
+    def __init__(self, config: dict):
+        review = config["review"]
+        self.model = review["model"]
+        self.agents = review.get("agents", {})
+        self.pricing = review.get("pricing", {})
+        cost_model = review.get("cost_model", {})
+        self.expected_output_tokens = cost_model.get("expected_output_tokens", 2500)
+        self.thinking_utilization = cost_model.get("thinking_utilization", 1.0)
+
+        from .cascade import CascadePolicy
+        from .figures import FigureExtractor
+        from .thinking import ThinkingPolicy
+        self.thinking_policy = ThinkingPolicy(config)
+        self.cascade = CascadePolicy(config)
+        self.figures = FigureExtractor(config)
+        self.ledger = UsageLedger(config.get("rate_limits", {}).get("ledger_path", LEDGER_PATH))
+        self._escalation_rates = None
+
+    def price(self, model: str) -> dict:
+        """Return USD per million tokens for a model."""
+        return self.pricing.get(model, self.pricing.get("default", {"input": 0.0, "output": 0.0}))
+
+    def cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        """Return the USD cost of a call (thinking tokens bill as output)."""
+        price = self.price(model)
+        return (input_tokens * price["input"] + output_tokens * price["output"]) / 1_000_000
+
+    def _system_prompt_tokens(self, agent: str) -> int:
+        from .registry import get_prompt
+        prompt = get_prompt(Path("prompts") / f"{agent}.md")
+        if prompt is not None:
+            return estimate_tokens(prompt)
+        return 1000
+
+    def estimate(self, agent: str, paper_content: str, metadata: dict) -> dict:
+        """Estimate input, output and thinking tokens for one agent review."""
+        input_tokens = (
+            self._system_prompt_tokens(agent)
+            + estimate_tokens(paper_content)
+            + estimate_tokens(metadata.get("abstract", ""))
+            + PROMPT_OVERHEAD_TOKENS
+        )
+        if self.figures.applies_to(agent):
+            # Figure images are capped at max_total_tokens per call
+            input_tokens += self.figures.max_total_tokens
+        thinking_budget, max_tokens = self.thinking_policy.budget(
+            agent,
+            paper_tokens=estimate_tokens(paper_content),
+            paper_type=metadata.get("paper_type"),
+        )
+        estimate = self._priced(agent, input_tokens, thinking_budget, max_tokens)
+
+        if self.cascade.applies_to(agent):
+            # Expected cost: the cheap pass always runs, the full review only
+            # at the recorded escalation rate (assume always until measured)
+            if self._escalation_rates is None:
+                from .cascade import escalation_rates
+                self._escalation_rates = escalation_rates(self.ledger)
+            rate = self._escalation_rates.get(agent, {}).get("rate", 1.0)
+            pre_output = min(self.expected_output_tokens, self.cascade.max_tokens)
+            estimate["input_tokens"] = int(input_tokens + rate * input_tokens)
+            estimate["output_tokens"] = int(pre_output + rate * estimate["output_tokens"])
+            estimate["thinking_tokens"] = int(rate * estimate["thinking_tokens"])
+            estimate["cost"] = round(
+                self.cost(self.cascade.model, input_tokens, pre_output) + rate * estimate["cost"], 4
+            )
+
+        return estimate
+
+    def estimate_meta(self, agent_estimates: list) -> dict:
+        """Estimate the meta-review, whose input is the agent reviews."""
+        input_tokens = (
+            self._system_prompt_tokens("meta")
+            + len(agent_estimates) * self.expected_output_tokens
+            + PROMPT_OVERHEAD_TOKENS
+        )
+        # Reviewer disagreement is unknown before the reviews exist: assume the worst
+        thinking_budget, max_tokens = self.thinking_policy.budget("meta", disagreement=1.0)
+        return self._priced("meta", input_tokens, thinking_budget, max_tokens)
+
+    def _priced(self, agent: str, input_tokens: int, thinking_budget: int, max_tokens: int) -> dict:
+        model = self.agents.get(agent, {}).get("model", self.model)
+        thinking_tokens = int(thinking_budget * self.thinking_utilization)
+        output_tokens = min(self.expected_output_tokens + thinking_tokens, max_tokens)
+
+        return {
+            "agent": agent,
+            "model": model,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "thinking_tokens": thinking_tokens,
+            "cost": round(self.cost(model, input_tokens, output_tokens), 4),
+        }
+
+
+class UsageLedger:
+    """Append-only JSONL record of actual API spend."""
+
+    def __init__(self, path: Path = LEDGER_PATH):
+        self.path = Path(path)
+
+    def record(self, entry: dict) -> dict:
+        """Append a usage entry, stamping it with the current time."""
+        entry = dict(entry)
+        entry.setdefault("timestamp", datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry, sort_keys=True) + "\n")
+        return entry
+
+    def entries(self, day: str = None) -> list:
+        """Return ledger entries, optionally restricted to one UTC day."""
+        if not self.path.exists():
+            return []
+        entries = []
+        with open(self.path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                if day is None or entry.get("timestamp", "").startswith(day):
+                    entries.append(entry)
+        return entries
+
+    def merge(self, paths: list) -> int:
+        """Append entries from other ledger files that this one lacks.
+
+        Used to fold the ledgers written by separate CI jobs back into one;
+        entries are matched on their exact serialized form, so merging the
+        same file twice adds nothing. Returns the number of entries added.
+        """
+        seen = {json.dumps(entry, sort_keys=True) for entry in self.entries()}
+        added = []
+        for path in paths:
+            for entry in UsageLedger(path).entries():
+                line = json.dumps(entry, sort_keys=True)
+                if line not in seen:
+                    seen.add(line)
+                    added.append(line)
+        if added:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.writelines(line + "\n" for line in added)
+        return len(added)
+
+    def spent(self, day: str = None) -> dict:
+        """Total tokens, cost and distinct submissions for a UTC day."""
+        day = day or utc_today()
+        tokens = 0
+        cost = 0.0
+        submissions = set()
+        for entry in self.entries(day):
+            tokens += entry.get("input_tokens", 0) + entry.get("output_tokens", 0)
+            cost += entry.get("cost", 0.0)
+            submissions.add(entry.get("submission_id"))
+        return {"tokens": tokens, "cost": round(cost, 4), "submissions": len(submissions)}
+
+
+class LedgerBranch:
+    """Syncs a local usage ledger with a dedicated git branch.
+
+    The branch holds a single ``usage.jsonl``. ``pull`` folds it into the
+    local ledger before admission; ``push`` writes the union of both back,
+    retrying when another run pushed first, so concurrent jobs never drop
+    each other's entries.
+    """
+
+    FILENAME = "usage.jsonl"
+
+    def __init__(self, ledger: UsageLedger, branch: str = LEDGER_BRANCH, remote: str = "origin",
+                 repo: Path = Path(".")):
+        self.ledger = ledger
+        self.branch = branch
+        self.remote = remote
+        self.repo = Path(repo)
+        self.tracking = f"refs/remotes/{remote}/{branch}"
+
+    def _git(self, *args, input: str = None, env: dict = None) -> subprocess.CompletedProcess:
+        return subprocess.run(["git", "-C", str(self.repo), *args], input=input, env=env,
+                              capture_output=True, text=True)
+
+    def _fetch(self) -> bool:
+        """Fetch the ledger branch; False if it does not exist yet."""
+        result = self._git("fetch", "--quiet", self.remote, f"+refs/heads/{self.branch}:{self.tracking}")
+        if result.returncode != 0:
+            self._git("update-ref", "-d", self.tracking)
+            return False
+        return True
+
+    def _remote_lines(self) -> list:
+        result = self._git("show", f"{self.tracking}:{self.FILENAME}")
+        if result.returncode != 0:
+            return []
+        return [line for line in result.stdout.splitlines() if line.strip()]
+
+    def pull(self) -> int:
+        """Merge the shared ledger into the local one; returns entries added."""
+        if not self._fetch():
+            return 0
+        partial = self.ledger.path.with_suffix(".shared.partial")
+        partial.parent.mkdir(parents=True, exist_ok=True)
+        partial.write_text("".join(line + "\n" for line in self._remote_lines()))
+        try:
+            return self.ledger.merge([partial])
+        finally:
+            partial.unlink(missing_ok=True)
+
+    def push(self, message: str = "Record review usage", attempts: int = 5) -> bool:
+        """Publish local entries the shared ledger lacks; False if every attempt lost the race."""
+        env = dict(os.environ)
+        env.setdefault("GIT_AUTHOR_NAME", "github-actions[bot]")
+        env.setdefault("GIT_AUTHOR_EMAIL", "41898282+github-actions[bot]@users.noreply.github.com")
+        env.setdefault("GIT_COMMITTER_NAME", env["GIT_AUTHOR_NAME"])
+        env.setdefault("GIT_COMMITTER_EMAIL", env["GIT_AUTHOR_EMAIL"])
+        local = [json.dumps(entry, sort_keys=True) for entry in self.ledger.entries()]
+
+        for attempt in range(attempts):
+            exists = self._fetch()
+            lines = self._remote_lines() if exists else []
+            seen = {json.dumps(json.loads(line), sort_keys=True) for line in lines}
+            new = [line for line in local if line not in seen]
+            if not new:
+                return True
+
+            blob = self._git("hash-object", "-w", "--stdin", input="".join(line + "\n" for line in lines + new))
+            tree = self._git("mktree", input=f"100644 blob {blob.stdout.strip()}\t{self.FILENAME}\n")
+            parents = ["-p", self.tracking] if exists else []
+            commit = self._git("commit-tree", tree.stdout.strip(), *parents, "-m", message, env=env)
+            if commit.returncode != 0:
+                raise RuntimeError(f"Could not commit usage ledger: {commit.stderr.strip()}")
+            pushed = self._git("push", "--quiet", self.remote, f"{commit.stdout.strip()}:refs/heads/{self.branch}")
+            if pushed.returncode == 0:
+                return True
+            time.sleep(2 ** attempt)
+        return False
+
+
+def record_usage(config: dict, submission_id: str, agent: str, usage: dict) -> dict:
+    """Price an API call's token usage and append it to the ledger."""
+    cost = CostModel(config).cost(usage["model"], usage["input_tokens"], usage["output_tokens"])
+    ledger = UsageLedger(config.get("rate_limits", {}).get("ledger_path", LEDGER_PATH))
+    return ledger.record({
+        "submission_id": submission_id,
+        "agent": agent,
+        **usage,
+        "cost": round(cost, 4),
+    })
+
+
+def record_error(config: dict, submission_id: str, agent: str, model: str, error: Exception,
+                 stage: str = "review") -> dict:
+    """Append a failed API call to the ledger so error rates can be tracked."""
+    ledger = UsageLedger(config.get("rate_limits", {}).get("ledger_path", LEDGER_PATH))
+    return ledger.record({
+        "submission_id": submission_id,
+        "agent": agent,
+        "model": model,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "stage": stage,
+        "path": "error",
+        "error": type(error).__name__,
+        "cost": 0.0,
+    })
+
+
+class AdmissionController:
+    """Admits review work against a daily token/dollar budget."""
+
+    def __init__(self, config: dict, ledger: UsageLedger = None):
+        limits = config.get("rate_limits", {})
+        self.daily_reviews = limits.get("daily_reviews")
+        self.daily_token_budget = limits.get("daily_token_budget")
+        self.daily_cost_budget = limits.get("daily_cost_budget")
+        self.ledger = ledger or UsageLedger(limits.get("ledger_path", LEDGER_PATH))
+
+    def admit(self, estimates: list, day: str = None, runs_today: int = None) -> tuple[bool, str]:
+        """Decide whether a submission's estimated reviews fit today's budget.
+
+        ``runs_today`` is an outside count of reviews already run today (e.g.
+        from the CI run history). Whenever it exceeds the submissions the
+        ledger saw, some runs' usage was never persisted, so the count is
+        checked against daily_reviews and missing entries cannot admit
+        unlimited work.
+        """
+        spent = self.ledger.spent(day)
+        if (runs_today is not None and self.daily_reviews is not None and runs_today > spent["submissions"]
+                and runs_today >= self.daily_reviews):
+            return False, (f"{runs_today}/{self.daily_reviews} review runs today "
+                           f"(ledger has usage for {spent['submissions']})")
+        tokens = sum(e["input_tokens"] + e["output_tokens"] for e in estimates)
+        cost = sum(e["cost"] for e in estimates)
+
+        if self.daily_token_budget is None and self.daily_cost_budget is None:
+            # No token budget configured: fall back to the flat review count
+            if self.daily_reviews is not None and spent["submissions"] >= self.daily_reviews:
+                return False, f"{spent['submissions']}/{self.daily_reviews} reviews today"
+            return True, f"{spent['submissions']}/{self.daily_reviews} reviews today"
+
+        if self.daily_token_budget is not None and spent["tokens"] + tokens > self.daily_token_budget:
+            return False, (f"token budget exceeded: {spent['tokens']} spent + {tokens} estimated "
+                           f"> {self.daily_token_budget}")
+        if self.daily_cost_budget is not None and spent["cost"] + cost > self.daily_cost_budget:
+            return False, (f"cost budget exceeded: ${spent['cost']:.2f} spent + ${cost:.2f} estimated "
+                           f"> ${self.daily_cost_budget:.2f}")
+
+        return True, (f"{spent['tokens'] + tokens} tokens, ${spent['cost'] + cost:.2f} "
+                      f"of today's budget after admission")
@@ -0,0 +1,347 @@
+"""Reviewer Calibration and Agreement Analytics"""
+
+import hashlib
+import json
+import warnings
+from pathlib import Path
+
+import yaml
+
+from .routing import REVIEW_AGENTS
+
+CACHE_DIR = Path("output") / "cache" / "calibration"
+REPORT_PATH = Path("output") / "metrics" / "calibration.json"
+
+DECISIONS = ["reject", "major_revision", "minor_revision", "accept"]
+
+try:
+    _Loader = yaml.CSafeLoader
+except AttributeError:  # PyYAML built without libyaml
+    _Loader = yaml.SafeLoader
+
+
+def score_cache_dir(reviews_dir: Path) -> Path:
+    """Cache location for the scores of one reviews directory."""
+    key = hashlib.sha256(str(Path(reviews_dir).resolve()).encode()).hexdigest()[:12]
+    return CACHE_DIR / key
+
+
+class ReviewScores:
+    """Every agent score as a (submission x agent x dimension) array.
+
+    Parsed scores are cached next to the file fingerprints they came from,
+    so an update only reads review files that are new or changed. Each
+    reviews directory gets its own cache. Missing scores are NaN.
+    """
+
+    def __init__(self, config: dict, reviews_dir: Path = Path("reviews"), cache_dir: Path = None):
+        import numpy as np
+
+        self.reviews_dir = Path(reviews_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir else score_cache_dir(self.reviews_dir)
+        agents = config["review"].get("agents", {})
+        self.agents = [agent for agent in REVIEW_AGENTS if agent in agents]
+        self.dimensions = ["overall"]
+        for agent in self.agents:
+            for dimension in agents[agent].get("dimensions", []):
+                if dimension not in self.dimensions:
+                    self.dimensions.append(dimension)
+
+        self.submissions = []
+        self.fingerprints = {}  # review file -> "mtime_ns:size"
+        self.decisions = {}  # submission -> meta-review decision
+        self.scores = np.full((0, len(self.agents), len(self.dimensions)), np.nan)
+        self._load()
+
+    def _load(self):
+        import numpy as np
+
+        index_path = self.cache_dir / "index.json"
+        if not index_path.exists():
+            return
+        with open(index_path) as f:
+            index = json.load(f)
+        # A changed agent or dimension layout invalidates the cache
+        if index.get("agents") != self.agents or index.get("dimensions") != self.dimensions:
+            return
+        self.scores = np.load(self.cache_dir / "scores.npy")
+        self.submissions = index["submissions"]
+        self.fingerprints = index["fingerprints"]
+        self.decisions = index["decisions"]
+
+    def _save(self):
+        import numpy as np
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        partial = self.cache_dir / "scores.partial.npy"
+        np.save(partial, self.scores)
+        partial.replace(self.cache_dir / "scores.npy")
+        with open(self.cache_dir / "index.json", "w") as f:
+            json.dump({
+                "agents": self.agents,
+                "dimensions": self.dimensions,
+                "submissions": self.submissions,
+                "fingerprints": self.fingerprints,
+                "decisions": self.decisions,
+            }, f)
+
+    def update(self) -> int:
+        """Read new or changed review files; return how many were read."""
+        import numpy as np
+
+        rows = {submission: row for row, submission in enumerate(self.submissions)}
+        seen, changed = set(), []
+        for path in self.reviews_dir.glob("*/*.yaml"):
+            key = f"{path.parent.name}/{path.name}"
+            seen.add(key)
+            stat = path.stat()
+            fingerprint = f"{stat.st_mtime_ns}:{stat.st_size}"
+            if self.fingerprints.get(key) != fingerprint:
+                changed.append((path, key, fingerprint))
+
+        removed = set(self.fingerprints) - seen
+        if not changed and not removed:
+            return 0
+
+        new = sorted({path.parent.name for path, _, _ in changed} - set(rows))
+        if new:
+            padding = np.full((len(new), len(self.agents), len(self.dimensions)), np.nan)
+            self.scores = np.concatenate([self.scores, padding])
+            for submission in new:
+                rows[submission] = len(self.submissions)
+                self.submissions.append(submission)
+
+        agent_index = {agent: i for i, agent in enumerate(self.agents)}
+        dimension_index = {dimension: i for i, dimension in enumerate(self.dimensions)}
+        for key in removed:
+            submission, name = key.split("/", 1)
+            agent = Path(name).stem
+            if agent in agent_index:
+                self.scores[rows[submission], agent_index[agent]] = np.nan
+            elif agent == "meta-review":
+                self.decisions.pop(submission, None)
+            del self.fingerprints[key]
+
+        for path, key, fingerprint in changed:
+            self.fingerprints[key] = fingerprint
+            agent, submission = path.stem, path.parent.name
+            if agent not in agent_index and agent != "meta-review":
+                continue
+            try:
+                with open(path) as f:
+                    review = yaml.load(f, Loader=_Loader) or {}
+            except yaml.YAMLError:
+                review = {}
+            if not isinstance(review, dict):
+                review = {}
+            if agent == "meta-review":
+                if review.get("decision") in DECISIONS:
+                    self.decisions[submission] = review["decision"]
+                continue
+            row = self.scores[rows[submission], agent_index[agent]]
+            row[:] = np.nan
+            for dimension, value in (review.get("scores") or {}).items():
+                if dimension in dimension_index and isinstance(value, (int, float)):
+                    row[dimension_index[dimension]] = float(value)
+
+        self._save()
+        return len(changed) + len(removed)
+
+    def overall(self):
+        """(submission x agent) overall scores."""
+        return self.scores[:, :, 0]
+
+
+def _weighted_average(overall, weights):
+    """Per-submission weighted mean over the agents that scored it."""
+    import numpy as np
+
+    present = ~np.isnan(overall)
+    total = (present * weights).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, np.nansum(overall * weights, axis=1) / total, np.nan)
+
+
+def _decisions(averages, thresholds: dict):
+    """Vectorized ``threshold_decision``: indexes into DECISIONS."""
+    import numpy as np
+
+    bins = [thresholds["major_revision"], thresholds["minor_revision"], thresholds["accept"]]
+    return np.digitize(averages, bins)
+
+
+class CalibrationReport:
+    """Per-agent bias and spread, inter-agent agreement, decision sensitivity
+    to the configured weights, and reliability-based suggested weights."""
+
+    def __init__(self, config: dict):
+        calibration = config.get("calibration", {})
+        self.config = config
+        self.min_submissions = calibration.get("min_submissions", 20)
+        self.prior_strength = calibration.get("prior_strength", 20)
+        self.weight_step = calibration.get("weight_step", 0.2)
+        self.thresholds = config["review"]["thresholds"]
+        agents = config["review"].get("agents", {})
+        self.configured = {agent: agents.get(agent, {}).get("weight", 1.0) for agent in REVIEW_AGENTS}
+
+    def compute(self, data: ReviewScores) -> dict:
+        import numpy as np
+
+        overall = data.overall()
+        present = ~np.isnan(overall)
+        counts = present.sum(axis=0)
+        weights = np.array([self.configured.get(agent, 1.0) for agent in data.agents])
+
+        # Bias: how far an agent sits from the mean of the other agents on the
+        # same submissions (leave-one-out consensus)
+        totals = np.nansum(overall, axis=1, keepdims=True)
+        others = present.sum(axis=1, keepdims=True) - present
+        # Agents with no reviews give all-NaN slices; they are left out below
+        with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            consensus = np.where(others > 0, (totals - np.nan_to_num(overall)) / others, np.nan)
+            residual = overall - consensus
+            bias = np.nanmean(residual, axis=0)
+            residual_var = np.nanvar(residual, axis=0)
+            means = np.nanmean(overall, axis=0)
+            variance = np.nanvar(overall, axis=0)
+            dimension_means = np.nanmean(data.scores, axis=0)
+
+        agents = {}
+        for i, agent in enumerate(data.agents):
+            if not counts[i]:
+                continue
+            agents[agent] = {
+                "reviews": int(counts[i]),
+                "mean": _round(means[i]),
+                "variance": _round(variance[i]),
+                "bias": _round(bias[i]),
+                "disagreement_variance": _round(residual_var[i]),
+                "dimension_means": {
+                    dimension: _round(dimension_means[i, d])
+                    for d, dimension in enumerate(data.dimensions[1:], 1)
+                    if not np.isnan(dimension_means[i, d])
+                },
+            }
+
+        return {
+            "submissions": int(present.any(axis=1).sum()),
+            "agents": agents,
+            "correlation": self._correlation(data.agents, overall, present),
+            "decisions": self._decision_stats(data, overall, weights),
+            "sensitivity": self._sensitivity(data.agents, overall, weights),
+            "suggested_weights": self._suggested_weights(data.agents, counts, residual_var),
+        }
+
+    def _correlation(self, agents: list, overall, present) -> dict:
+        """Pairwise Pearson correlation of overall scores on shared submissions."""
+        import numpy as np
+
+        correlation = {}
+        for i, first in enumerate(agents):
+            for j in range(i + 1, len(agents)):
+                both = present[:, i] & present[:, j]
+                if both.sum() < 3:
+                    continue
+                x, y = overall[both, i], overall[both, j]
+                if x.std() == 0 or y.std() == 0:
+                    continue
+                correlation[f"{first}:{agents[j]}"] = _round(np.corrcoef(x, y)[0, 1])
+        return correlation
+
+    def _decision_stats(self, data: ReviewScores, overall, weights) -> dict:
+        """Score-threshold decisions under current weights, and agreement with the meta-review."""
+        import numpy as np
+
+        averages = _weighted_average(overall, weights)
+        scored = ~np.isnan(averages)
+        decided = _decisions(averages[scored], self.thresholds)
+        distribution = {DECISIONS[d]: int((decided == d).sum()) for d in range(len(DECISIONS))}
+
+        final = np.array([DECISIONS.index(data.decisions[s]) if s in data.decisions else -1
+                          for s in data.submissions], dtype=int)[scored]
+        known = final >= 0
+        agreement = float((decided[known] == final[known]).mean()) if known.any() else None
+        return {
+            "threshold_distribution": distribution,
+            "meta_reviews": int(known.sum()),
+            "threshold_agrees_with_meta": _round(agreement),
+        }
+
+    def _sensitivity(self, agents: list, overall, weights) -> dict:
+        """Share of threshold decisions that flip when one agent's weight moves by +/- weight_step."""
+        import numpy as np
+
+        averages = _weighted_average(overall, weights)
+        scored = ~np.isnan(averages)
+        if not scored.any():
+            return {}
+        baseline = _decisions(averages[scored], self.thresholds)
+        sensitivity = {}
+        for i, agent in enumerate(agents):
+            flipped = np.zeros(int(scored.sum()), dtype=bool)
+            for step in (-self.weight_step, self.weight_step):
+                perturbed = weights.copy()
+                perturbed[i] = max(perturbed[i] + step, 0.0)
+                flipped |= _decisions(_weighted_average(overall, perturbed)[scored], self.thresholds) != baseline
+            sensitivity[agent] = _round(flipped.mean())
+        return sensitivity
+
+    def _suggested_weights(self, agents: list, counts, residual_var) -> dict:
+        """Inverse disagreement variance, shrunk toward the configured weight
+        until an agent has enough reviews, and scaled so the largest is 1.0."""
+        import numpy as np
+
+        suggested = {}
+        for i, agent in enumerate(agents):
+            configured = self.configured.get(agent, 1.0)
+            if counts[i] < self.min_submissions or np.isnan(residual_var[i]):
+                suggested[agent] = configured
+                continue
+            reliability = 1.0 / max(float(residual_var[i]), 0.05)
+            share = counts[i] / (counts[i] + self.prior_strength)
+            suggested[agent] = (share, reliability, configured)
+
+        measured = [value[1] for value in suggested.values() if isinstance(value, tuple)]
+        if not measured:
+            return {agent: round(weight, 2) for agent, weight in suggested.items()}
+        top = max(measured)
+        weights = {}
+        for agent, value in suggested.items():
+            if isinstance(value, tuple):
+                share, reliability, configured = value
+                value = share * (reliability / top) + (1 - share) * configured
+            weights[agent] = round(value, 2)
+        scale = max(weights.values()) or 1.0
+        return {agent: round(weight / scale, 2) for agent, weight in weights.items()}
+
+
+def _round(value, digits: int = 3):
+    if value is None:
+        return None
+    value = float(value)
+    return None if value != value else round(value, digits)
+
+
+def write_report(report: dict, path: Path = REPORT_PATH) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def calibrated_weights(config: dict, weights: dict, path: Path = REPORT_PATH) -> dict:
+    """Replace configured meta-review weights with the suggested ones when enabled.
+
+    Reads the saved report (no NumPy needed); agents without a suggestion
+    keep their configured weight.
+    """
+    if not config.get("calibration", {}).get("apply_weights", False):
+        return weights
+    path = Path(path)
+    if not path.exists():
+        return weights
+    with open(path) as f:
+        suggested = json.load(f).get("suggested_weights", {})
+    return {agent: suggested.get(agent, weight) for agent, weight in weights.items()}
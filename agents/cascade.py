@@ -0,0 +1,62 @@
+"""Tiered Model Cascade"""
+
+import math
+
+from .budget import LEDGER_PATH, UsageLedger
+
+CONFIDENCE_LEVELS = {"low": 0, "medium": 1, "high": 2}
+
+
+class CascadePolicy:
+    """Decides when a cheap provisional review must escalate to a full review."""
+
+    def __init__(self, config: dict):
+        review = config["review"]
+        cascade = review.get("cascade", {})
+        self.enabled = cascade.get("enabled", False)
+        self.model = cascade.get("model", review["model"])
+        self.max_tokens = cascade.get("max_tokens", 4000)
+        self.agents = cascade.get("agents", [])
+        self.boundary_margin = cascade.get("boundary_margin", 0.25)
+        self.min_confidence = cascade.get("min_confidence", "high")
+        self.thresholds = review["thresholds"]
+
+    def applies_to(self, agent: str) -> bool:
+        return self.enabled and agent in self.agents
+
+    def should_escalate(self, provisional: dict) -> tuple[bool, str]:
+        """Return (escalate, reason) for a parsed provisional review."""
+        if not isinstance(provisional, dict) or provisional.get("parse_error"):
+            return True, "unparseable provisional review"
+
+        scores = provisional.get("scores") or {}
+        if not isinstance(scores, dict):
+            return True, "malformed provisional scores"
+        overall = scores.get("overall")
+        if isinstance(overall, bool) or not isinstance(overall, (int, float)) or not math.isfinite(overall):
+            return True, "no provisional overall score"
+
+        confidence = str(provisional.get("confidence", "low")).lower()
+        if CONFIDENCE_LEVELS.get(confidence, 0) < CONFIDENCE_LEVELS[self.min_confidence]:
+            return True, f"{confidence} confidence"
+
+        for name, threshold in self.thresholds.items():
+            if abs(overall - threshold) < self.boundary_margin:
+                return True, f"score {overall} near {name} threshold {threshold}"
+
+        return False, f"score {overall} clear of thresholds with {confidence} confidence"
+
+
+def escalation_rates(ledger: UsageLedger = None) -> dict:
+    """Return per-agent escalation rate and sample count from the usage ledger."""
+    ledger = ledger or UsageLedger(LEDGER_PATH)
+    counts = {}
+    for entry in ledger.entries():
+        if entry.get("stage") != "cascade" or "escalated" not in entry:
+            continue
+        total, escalated = counts.get(entry.get("agent"), (0, 0))
+        counts[entry.get("agent")] = (total + 1, escalated + bool(entry["escalated"]))
+    return {
+        agent: {"rate": round(escalated / total, 3), "samples": total}
+        for agent, (total, escalated) in counts.items()
+    }
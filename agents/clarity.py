@@ -29,6 +29,8 @@ Your role is to evaluate presentation quality and accessibility.
    - Are explanations clear?
 
 2. **Figure Effectiveness** (Score 1-5)
+   - Figure and table images may be attached ahead of the text (downsampled;
+     judge design and labelling, not sharpness)
    - Do figures clearly communicate their message?
    - Are captions informative and self-contained?
    - Are axes labeled and legends clear?
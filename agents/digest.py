@@ -0,0 +1,204 @@
+"""Compact Review Digest for the Meta-Reviewer"""
+
+from .related_work import tokenize
+
+# Keys that hold the headline of a structured issue, in order of preference
+ISSUE_KEYS = ("issue", "concern", "risk", "problem", "description", "edit")
+SERIOUS = {"major", "critical", "high", "severe"}
+RECOMMENDATION_RANK = {"reject": 0, "major_revision": 1, "minor_revision": 2, "accept": 3}
+# Term overlap at which two points in a cluster are the same point reworded
+NEAR_DUPLICATE = 0.9
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(str(text).split())
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + "..."
+
+
+def _as_text(item) -> str:
+    if isinstance(item, dict):
+        return " ".join(str(value) for value in item.values() if isinstance(value, (str, int, float)))
+    return str(item)
+
+
+def _terms(text: str) -> set:
+    # Crude plural folding so "experiment" and "experiments" match
+    return {term[:-1] if term.endswith("s") and len(term) > 4 else term for term in tokenize(text)}
+
+
+def _serious_issues(node, found: list):
+    """Collect structured issues rated major or worse anywhere in a review."""
+    if isinstance(node, dict):
+        severity = str(node.get("severity", "")).lower()
+        if severity in SERIOUS:
+            headline = next((node[key] for key in ISSUE_KEYS if node.get(key)), None)
+            if headline:
+                location = f" ({node['location']})" if node.get("location") else ""
+                found.append(f"[{severity}] {headline}{location}")
+        for value in node.values():
+            _serious_issues(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            _serious_issues(value, found)
+
+
+class ReviewDigest:
+    """Turns agent reviews into a compact, normalized meta-review input.
+
+    Every agent contributes its scores, recommendation, confidence, a short
+    summary and its serious issues. Strengths and weaknesses are clustered
+    across agents so a point raised by three reviewers appears once; only
+    (near-)identical wording is collapsed, every distinct point in a cluster
+    is kept. Points past the merged lists' character budget are listed
+    under their reviewer instead. Fuller detail is included only for the
+    reviewers on either side of a disagreement.
+    """
+
+    def __init__(self, config: dict):
+        digest = config.get("meta_digest", {})
+        self.enabled = digest.get("enabled", True)
+        self.summary_chars = digest.get("summary_chars", 600)
+        self.item_chars = digest.get("item_chars", 200)
+        self.max_merged_chars = digest.get("max_merged_chars", 2400)
+        self.max_agent_chars = digest.get("max_agent_chars", 2000)
+        self.similarity = digest.get("similarity", 0.4)
+        self.disagreement = digest.get("disagreement", 1.0)
+        self.recommendation_gap = digest.get("recommendation_gap", 2)
+
+    def build(self, reviews: dict) -> str:
+        sections = [self._scores_table(reviews)]
+
+        merged, shown = [], set()
+        for label in ("strengths", "weaknesses"):
+            points = []
+            used = 0
+            for cluster in self._clustered(reviews, label):
+                lines = self._cluster_lines(cluster[2])
+                size = sum(len(line) + 1 for line in lines)
+                if points and used + size > self.max_merged_chars:
+                    # Left out points are listed under their reviewer
+                    continue
+                points.extend(lines)
+                used += size
+                shown.update((label, agent, text) for agent, text in cluster[2])
+            if points:
+                merged.append(f"### {label.capitalize()} (merged across reviewers)\n" + "\n".join(points))
+
+        disputed = self._disputed(reviews)
+        for agent, review in reviews.items():
+            sections.append(self._agent_section(agent, review or {}, agent in disputed, shown))
+        sections.extend(merged)
+
+        if disputed:
+            sections.append("### Disagreement\nReviewers diverge; fuller detail is included above for: "
+                            + ", ".join(sorted(disputed)))
+        return "\n\n".join(sections)
+
+    def _scores_table(self, reviews: dict) -> str:
+        lines = ["| agent | overall | recommendation | confidence | dimension scores |", "|---|---|---|---|---|"]
+        for agent, review in reviews.items():
+            review = review or {}
+            scores = review.get("scores", {}) or {}
+            dimensions = ", ".join(f"{name} {value}" for name, value in scores.items() if name != "overall")
+            lines.append(f"| {agent} | {scores.get('overall', '-')} | {review.get('recommendation', '-')} | "
+                         f"{review.get('confidence', '-')} | {dimensions or '-'} |")
+        return "### Scores\n" + "\n".join(lines)
+
+    def _disputed(self, reviews: dict) -> set:
+        """Agents at the extremes when overall scores or recommendations diverge."""
+        overall = {agent: ((review or {}).get("scores") or {}).get("overall") for agent, review in reviews.items()}
+        ranks = {agent: RECOMMENDATION_RANK.get((review or {}).get("recommendation"))
+                 for agent, review in reviews.items()}
+
+        disputed = set()
+        for values, threshold in ((overall, self.disagreement), (ranks, self.recommendation_gap)):
+            values = {agent: value for agent, value in values.items() if isinstance(value, (int, float))}
+            if len(values) >= 2 and max(values.values()) - min(values.values()) >= threshold:
+                high, low = max(values.values()), min(values.values())
+                disputed |= {agent for agent, value in values.items() if value in (high, low)}
+        return disputed
+
+    def _agent_section(self, agent: str, review: dict, detailed: bool, shown: set) -> str:
+        lines = [f"### {agent.upper()} REVIEWER"]
+        if review.get("parse_error"):
+            # Never forward a whole unparsed response
+            lines.append(f"(Review could not be parsed; excerpt) {_clip(review.get('raw_response', ''), self.summary_chars)}")
+            return "\n".join(lines)
+
+        for flag in ("ethics_hold", "expertise_level"):
+            if flag in review:
+                lines.append(f"{flag}: {review[flag]}")
+
+        evaluation = review.get("evaluation", {}) or {}
+        if evaluation.get("summary"):
+            lines.append(f"Summary: {_clip(evaluation['summary'], self.summary_chars * (2 if detailed else 1))}")
+
+        issues = []
+        _serious_issues(review, issues)
+        if issues:
+            lines.append("Serious issues:")
+            lines.extend(f"- {_clip(issue, self.item_chars)}" for issue in dict.fromkeys(issues))
+
+        if detailed:
+            # The meta-reviewer needs each side's reasoning to resolve a
+            # disagreement; skip points already in the merged lists
+            for key in ("weaknesses", "required_changes", "required_additions", "missing_experiments"):
+                items = [item for item in evaluation.get(key) or [] if (key, agent, _as_text(item)) not in shown]
+                if items:
+                    lines.append(f"{key.replace('_', ' ').capitalize()}:")
+                    lines.extend(f"- {_clip(_as_text(item), self.item_chars)}" for item in items)
+
+        for label in ("strengths",) if detailed else ("strengths", "weaknesses"):
+            # Points that did not fit in the merged lists
+            items = [item for item in evaluation.get(label) or [] if (label, agent, _as_text(item)) not in shown]
+            if items:
+                lines.append(f"Other {label}:")
+                lines.extend(f"- {_clip(_as_text(item), self.item_chars)}" for item in items)
+
+        section = "\n".join(lines)
+        if len(section) > self.max_agent_chars:
+            section = section[:self.max_agent_chars].rsplit("\n", 1)[0] + "\n- ... (truncated)"
+        return section
+
+    def _cluster_lines(self, members: list) -> list:
+        """One bullet per distinct point in a cluster, the most widely raised
+        first and the rest indented under it."""
+        distinct = []  # [text, terms, agents]
+        for agent, text in members:
+            terms = _terms(text)
+            for point in distinct:
+                union = terms | point[1]
+                if " ".join(text.lower().split()) == " ".join(point[0].lower().split()) \
+                        or (union and len(terms & point[1]) / len(union) >= NEAR_DUPLICATE):
+                    point[2].append(agent)
+                    break
+            else:
+                distinct.append([text, terms, [agent]])
+        distinct.sort(key=lambda point: -len(set(point[2])))
+        return [f"{'  ' if index else ''}- {_clip(text, self.item_chars)} ({', '.join(dict.fromkeys(agents))})"
+                for index, (text, _, agents) in enumerate(distinct)]
+
+    def _clustered(self, reviews: dict, label: str) -> list:
+        """Greedy clustering of points by term overlap, most widely raised first.
+
+        Each cluster is [terms, agents, (agent, text) members].
+        """
+        clusters = []
+        for agent, review in reviews.items():
+            evaluation = (review or {}).get("evaluation", {}) or {}
+            for item in evaluation.get(label) or []:
+                text = _as_text(item)
+                terms = _terms(text)
+                for cluster in clusters:
+                    union = terms | cluster[0]
+                    if union and len(terms & cluster[0]) / len(union) >= self.similarity:
+                        cluster[1].append(agent)
+                        cluster[2].append((agent, text))
+                        break
+                else:
+                    clusters.append([terms, [agent], [(agent, text)]])
+
+        clusters.sort(key=lambda cluster: -len(set(cluster[1])))
+        return clusters
@@ -1,11 +1,29 @@
 """Domain Reviewer Agent"""
 
 from .base import BaseReviewer
+from .related_work import get_index, split_references
 
 
 class DomainReviewer(BaseReviewer):
     """Evaluates novelty, significance, and contribution to the field."""
 
+    def _paper_sections(self, paper_content: str, metadata: dict, submission_id: str) -> tuple[str, str]:
+        """Swap the raw references section for a compact list plus retrieved related work."""
+        index = get_index(self.config)
+        if not index.applies_to(self.agent_type):
+            return paper_content, ""
+
+        index.refresh()
+        related = index.related(metadata, exclude={f"submissions/{submission_id}"})
+        body, references = split_references(str(paper_content))
+
+        context = ""
+        if related:
+            context += f"\n## Related Papers From This Journal (retrieved)\n{index.format_related(related)}\n"
+        if references:
+            context += f"\n## Cited References (condensed)\n{index.format_references(references)}\n"
+        return body, context
+
     @property
     def agent_type(self) -> str:
         return "domain"
@@ -36,6 +54,7 @@ Your role is to evaluate the paper's contribution to the field of AI/ML.
    - Is related work adequately surveyed?
    - Are important prior works missing?
    - Is the positioning relative to prior work accurate?
+   - Use any retrieved related papers and the condensed reference list provided
 
 4. **Evidence Quality** (Score 1-5)
    - Do the results actually support the claims?
@@ -0,0 +1,296 @@
+"""Prompt Variant Evaluation Harness"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+
+import yaml
+
+from .budget import CostModel, estimate_tokens
+from .meta import threshold_decision, weighted_scores
+from .simulator import percentiles
+
+CACHE_DIR = Path("output") / "cache" / "evaluation"
+RECOMMENDATIONS = ["reject", "major_revision", "minor_revision", "accept"]
+
+
+@dataclass(frozen=True)
+class Variant:
+    """One way of running an agent: its prompt, model and thinking budget.
+
+    Unset fields fall back to what the agent would use in production, so a
+    variant with only a name and agent is the current baseline.
+    """
+
+    name: str
+    agent: str
+    prompt: str = None  # Path to a system prompt file
+    model: str = None
+    thinking_budget: int = None  # 0 disables thinking
+    max_tokens: int = None
+
+    @classmethod
+    def from_dict(cls, spec: dict) -> "Variant":
+        fields = {key: spec[key] for key in cls.__dataclass_fields__ if key in spec}
+        fields.setdefault("name", f"{spec['agent']}-baseline")
+        return cls(**fields)
+
+
+def load_variants(specs) -> list:
+    """Variants from a list of dicts or a YAML file holding one."""
+    if isinstance(specs, (str, Path)):
+        with open(specs) as f:
+            specs = yaml.safe_load(f) or []
+        if isinstance(specs, dict):
+            specs = specs.get("variants", [])
+    variants = [Variant.from_dict(spec) for spec in specs]
+    names = [variant.name for variant in variants]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate variant names: {', '.join(sorted(duplicates))}")
+    return variants
+
+
+class FakeClient:
+    """Offline stand-in for the Anthropic client.
+
+    Returns a well-formed YAML review whose scores are a deterministic
+    function of the request, so different prompts or models give different
+    but repeatable results. Usage is estimated from the request text.
+    """
+
+    def __init__(self, latency_s: float = 0.0, parse_error_rate: float = 0.0):
+        self.latency_s = latency_s
+        self.parse_error_rate = parse_error_rate
+        self.messages = self
+
+    def create(self, **params):
+        request = json.dumps(params, sort_keys=True, default=str)
+        seed = int(hashlib.sha256(request.encode()).hexdigest()[:8], 16)
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+        if (seed % 1000) / 1000 < self.parse_error_rate:
+            text = "I could not produce a structured review for this paper."
+        else:
+            overall = round(1 + (seed % 41) / 10, 1)
+            recommendation = RECOMMENDATIONS[min(int(overall) - 1, 3)]
+            text = "```yaml\n" + yaml.safe_dump({
+                "scores": {"overall": overall},
+                "recommendation": recommendation,
+                "confidence": round(0.5 + (seed % 5) / 10, 1),
+                "evaluation": {"summary": "Offline evaluation review."},
+            }, sort_keys=False) + "```"
+
+        thinking = params.get("thinking", {}).get("budget_tokens", 0)
+        usage = SimpleNamespace(
+            input_tokens=estimate_tokens(request),
+            output_tokens=estimate_tokens(text) + thinking // 4,
+        )
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)], usage=usage)
+
+
+def _cache_key(client_name: str, request_params: dict) -> str:
+    request = json.dumps(request_params, sort_keys=True, default=str)
+    return hashlib.sha256(f"{client_name}\n{request}".encode()).hexdigest()
+
+
+class ResponseCache:
+    """Responses keyed by the exact request, so unchanged variants are free to re-run."""
+
+    def __init__(self, root: Path = CACHE_DIR / "responses"):
+        self.root = Path(root)
+
+    def get(self, key: str) -> dict:
+        path = self.root / key[:2] / f"{key}.json"
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def put(self, key: str, entry: dict):
+        path = self.root / key[:2] / f"{key}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(".partial")
+        with open(partial, "w") as f:
+            json.dump(entry, f)
+        partial.replace(path)
+
+
+class Evaluator:
+    """Runs prompt variants over past submissions and compares them with the
+    saved reviews.
+
+    Each (submission, variant) pair is one full-review request, built the way
+    the agent builds it but without the cascade pre-pass or figure images.
+    Paper text comes from the extraction cache and is loaded once per
+    submission; calls run concurrently and skip hedging and the usage
+    ledger, so evaluation spend never counts against the review budget.
+    """
+
+    def __init__(self, config: dict, client=None, client_name: str = "fake", concurrency: int = None,
+                 cache: ResponseCache = None):
+        evaluation = config.get("evaluation", {})
+        self.config = config
+        self.client = client if client is not None else FakeClient()
+        self.client_name = client_name
+        self.concurrency = concurrency or evaluation.get("concurrency", 4)
+        self.cache = cache or ResponseCache()
+        self.cost_model = CostModel(config)
+        self.thresholds = config["review"]["thresholds"]
+        self.weights = {agent: spec.get("weight", 1.0) for agent, spec in config["review"]["agents"].items()}
+        self._agents = {}
+        self._prompts = {}
+        self._lock = threading.Lock()
+
+    def _agent(self, variant: Variant):
+        """One configured agent instance per variant (used only to build requests)."""
+        with self._lock:
+            if variant.name not in self._agents:
+                from .runner import AGENT_CLASSES
+                agent = AGENT_CLASSES[variant.agent]()
+                if variant.model:
+                    agent.model = variant.model
+                if variant.thinking_budget is not None:
+                    agent.use_extended_thinking = variant.thinking_budget != 0
+                self._prompts[variant.name] = (Path(variant.prompt).read_text() if variant.prompt
+                                               else agent._load_prompt())
+                self._agents[variant.name] = agent
+            return self._agents[variant.name]
+
+    def request(self, variant: Variant, paper_content, metadata: dict, submission_id: str) -> dict:
+        agent = self._agent(variant)
+        system_prompt = self._prompts[variant.name]
+        paper_text, context = agent._paper_sections(paper_content, metadata, submission_id)
+        user_prompt = agent._user_prompt(paper_text, context, metadata)
+        thinking_budget, max_tokens = agent.thinking_policy.budget(
+            variant.agent, paper_tokens=estimate_tokens(paper_content), paper_type=metadata.get("paper_type"))
+        if variant.thinking_budget is not None:
+            thinking_budget, max_tokens = agent.thinking_policy.fit(agent.model, variant.thinking_budget, max_tokens)
+        if variant.max_tokens:
+            max_tokens = variant.max_tokens
+        return agent._request_params(system_prompt, user_prompt, thinking_budget, max_tokens)
+
+    def run_one(self, variant: Variant, submission_id: str, paper_content, metadata: dict) -> dict:
+        request_params = self.request(variant, paper_content, metadata, submission_id)
+        key = _cache_key(self.client_name, request_params)
+        cached = self.cache.get(key)
+        if cached is None:
+            started = time.monotonic()
+            try:
+                response = self.client.messages.create(**request_params)
+            except Exception as e:
+                return {"submission_id": submission_id, "variant": variant.name, "error": str(e)}
+            text = next((block.text for block in response.content
+                         if getattr(block, "type", None) == "text"), "")
+            usage = getattr(response, "usage", None)
+            cached = {
+                "text": text,
+                "model": request_params["model"],
+                "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+                "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+                "latency_s": round(time.monotonic() - started, 3),
+            }
+            self.cache.put(key, cached)
+            hit = False
+        else:
+            hit = True
+
+        review = self._agent(variant)._parse_response(cached["text"])
+        parsed = isinstance(review, dict) and not review.get("parse_error")
+        scores = review.get("scores") if parsed else None
+        overall = scores.get("overall") if isinstance(scores, dict) else None
+        usage = {key: value for key, value in cached.items() if key != "text"}
+        return dict(usage, submission_id=submission_id, variant=variant.name, cached=hit,
+                    parse_error=not isinstance(overall, (int, float)),
+                    overall=overall if isinstance(overall, (int, float)) else None,
+                    recommendation=review.get("recommendation") if parsed else None)
+
+    def run(self, variants: list, submission_ids: list) -> list:
+        """Run every variant on every submission; returns one result per pair."""
+        from .runner import load_submission
+
+        papers = {}
+        for submission_id in submission_ids:
+            try:
+                papers[submission_id] = load_submission(submission_id)
+            except FileNotFoundError as e:
+                print(f"Skipping {submission_id}: {e}")
+
+        jobs = [(variant, submission_id) for submission_id in papers for variant in variants]
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                return list(pool.map(lambda job: self.run_one(job[0], job[1], *papers[job[1]]), jobs))
+        finally:
+            for paper_content, _ in papers.values():
+                paper_content.close()
+
+    def _saved_reviews(self, submission_id: str) -> dict:
+        reviews = {}
+        for path in (Path("reviews") / submission_id).glob("*.yaml"):
+            if path.stem in self.weights:
+                with open(path) as f:
+                    reviews[path.stem] = yaml.safe_load(f) or {}
+        return reviews
+
+    def report(self, variants: list, results: list) -> dict:
+        """Per-variant comparison with the saved reviews of the same submissions."""
+        saved = {submission_id: self._saved_reviews(submission_id)
+                 for submission_id in {result["submission_id"] for result in results}}
+        report = {}
+        for variant in variants:
+            runs = [result for result in results if result["variant"] == variant.name]
+            ok = [result for result in runs if not result.get("error")]
+            deltas, recommendation_flips, decision_flips, compared = [], 0, 0, 0
+            for result in ok:
+                reviews = saved[result["submission_id"]]
+                baseline = reviews.get(variant.agent, {})
+                baseline_overall = (baseline.get("scores") or {}).get("overall")
+                if result["parse_error"] or not isinstance(baseline_overall, (int, float)):
+                    continue
+                compared += 1
+                deltas.append(result["overall"] - baseline_overall)
+                if result["recommendation"] != baseline.get("recommendation"):
+                    recommendation_flips += 1
+                # Would the score-threshold decision change with this review swapped in?
+                before, _ = weighted_scores(reviews, self.weights)
+                swapped = dict(reviews, **{variant.agent: {"scores": {"overall": result["overall"]}}})
+                after, _ = weighted_scores(swapped, self.weights)
+                if threshold_decision(before, self.thresholds) != threshold_decision(after, self.thresholds):
+                    decision_flips += 1
+
+            live = [result for result in ok if not result["cached"]]
+            input_tokens = sum(result["input_tokens"] for result in ok)
+            output_tokens = sum(result["output_tokens"] for result in ok)
+            report[variant.name] = {
+                "agent": variant.agent,
+                "runs": len(runs),
+                "errors": len(runs) - len(ok),
+                "cached": len(ok) - len(live),
+                "parse_failure_rate": round(sum(result["parse_error"] for result in ok) / len(ok), 3) if ok else None,
+                "compared": compared,
+                "score_delta": percentiles(deltas),
+                "mean_abs_delta": round(sum(abs(delta) for delta in deltas) / len(deltas), 3) if deltas else None,
+                "recommendation_flips": recommendation_flips,
+                "decision_flips": decision_flips,
+                "latency_s": percentiles([result["latency_s"] for result in ok]),
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "spent": round(sum(self.cost_model.cost(result["model"], result["input_tokens"], result["output_tokens"])
+                                  for result in live), 4),
+            }
+        return report
+
+
+def select_submissions(pattern: str = None, limit: int = None) -> list:
+    """Submissions with a saved meta-review, optionally matching a regex."""
+    ids = sorted(path.parent.name for path in Path("reviews").glob("*/meta-review.yaml"))
+    if pattern:
+        ids = [submission_id for submission_id in ids if re.search(pattern, submission_id)]
+    return ids[:limit] if limit else ids
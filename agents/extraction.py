@@ -0,0 +1,204 @@
+"""PDF Text Extraction"""
+
+import hashlib
+import json
+import mmap
+import os
+from pathlib import Path
+
+from . import profiling
+from .normalize import TextNormalizer
+
+TEXT_CACHE_DIR = Path("output") / "cache" / "text"
+
+# Part of the cache file name: bump it when normalization changes so cached
+# texts are extracted again
+TEXT_FORMAT = "n1"
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def text_cache_path(digest: str, cache_dir: Path = TEXT_CACHE_DIR) -> Path:
+    """Return the cache location for the text of the PDF with this digest."""
+    return Path(cache_dir) / f"{digest}.{TEXT_FORMAT}.txt"
+
+
+def cached_text_path(pdf_path: Path, cache_dir: Path = TEXT_CACHE_DIR) -> Path:
+    """Return the cache location for a PDF's extracted text."""
+    return text_cache_path(file_digest(pdf_path), cache_dir)
+
+
+def report_path(cache_path: Path) -> Path:
+    """Sidecar recording page count, skipped pages and normalization for a cached text."""
+    return Path(cache_path).with_suffix(".json")
+
+
+def load_report(cache_path: Path) -> dict:
+    path = report_path(cache_path)
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+class TextView:
+    """Read-only memory-mapped view of cached extracted text.
+
+    Formats as the full text (so it can be dropped into a prompt) while its
+    length and slices are served from the page cache without copying.
+    Length and slice offsets are in bytes of UTF-8, not characters; slice
+    ends are moved back to character boundaries so no character is split.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __len__(self) -> int:
+        """Size of the text in bytes."""
+        return len(self._map)
+
+    def _boundary(self, offset: int) -> int:
+        # UTF-8 continuation bytes are 0b10xxxxxx
+        while 0 < offset < len(self._map) and self._map[offset] & 0xC0 == 0x80:
+            offset -= 1
+        return offset
+
+    def __getitem__(self, key: slice) -> str:
+        """Decode a byte-offset slice, widened or narrowed to whole characters."""
+        start, stop, step = key.indices(len(self._map))
+        if step != 1:
+            raise ValueError("TextView slices must be contiguous")
+        return self._map[self._boundary(start):self._boundary(stop)].decode("utf-8")
+
+    def __str__(self) -> str:
+        return self[:]
+
+    def __format__(self, spec: str) -> str:
+        return format(str(self), spec)
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def page_count(pdf_path: Path) -> int:
+    """Return the number of pages in a PDF."""
+    try:
+        import pdfplumber
+    except ImportError:
+        from pypdf import PdfReader
+        return len(PdfReader(pdf_path).pages)
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def iter_page_text(pdf_path: Path, start: int = 0, on_error=None):
+    """Yield the text of each page, releasing parsed page objects as it goes.
+
+    Pages before ``start`` are skipped without being parsed. If ``on_error``
+    is given, a page that fails to extract is reported to it as
+    ``on_error(index, exception)`` and yields empty text instead of raising.
+    """
+    try:
+        import pdfplumber
+    except ImportError:
+        # Fallback: try pypdf
+        from pypdf import PdfReader
+        reader = PdfReader(pdf_path)
+        for index in range(start, len(reader.pages)):
+            try:
+                text = reader.pages[index].extract_text() or ""
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(index, e)
+                text = ""
+            yield text
+        return
+
+    with pdfplumber.open(pdf_path) as pdf:
+        for index in range(start, len(pdf.pages)):
+            page = pdf.pages[index]
+            try:
+                text = page.extract_text() or ""
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(index, e)
+                text = ""
+            finally:
+                # Drop the page's parsed layout objects before the next page
+                if hasattr(page, "close"):
+                    page.close()
+                else:
+                    page.flush_cache()
+            yield text
+
+
+def write_text_cache(cache_path: Path, pages) -> Path:
+    """Write page texts to the cache as they arrive, then move it into place."""
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = cache_path.with_suffix(".partial")
+    try:
+        with open(partial, "w", encoding="utf-8") as f:
+            separator = ""
+            for text in pages:
+                if text:
+                    f.write(separator + text)
+                    separator = "\n\n"
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    partial.replace(cache_path)
+    return cache_path
+
+
+def extract_to_cache(pdf_path: Path, cache_dir: Path = TEXT_CACHE_DIR, limits=None) -> Path:
+    """Extract a PDF's text page by page straight into the on-disk cache.
+
+    Pages are normalized on the way (see ``agents.normalize``). With
+    ``limits`` (an ``ExtractionLimits``) the parsing runs in a
+    resource-limited child process; see ``agents.sandbox``.
+    """
+    cache_path = cached_text_path(pdf_path, cache_dir)
+    if cache_path.exists():
+        return cache_path
+    with profiling.stage("extract_text"):
+        normalizer = TextNormalizer()
+        if limits is not None:
+            from .sandbox import sandboxed_extract
+            sandboxed_extract(pdf_path, cache_path, limits, normalizer)
+            return cache_path
+        write_text_cache(cache_path, normalizer.pages(iter_page_text(pdf_path)))
+        with open(report_path(cache_path), "w") as f:
+            json.dump({"normalization": normalizer.summary()}, f, indent=2)
+        return cache_path
+
+
+def open_text(pdf_path: Path, cache_dir: Path = TEXT_CACHE_DIR, limits=None) -> TextView:
+    """Return a memory-mapped view of a PDF's extracted text."""
+    return TextView(extract_to_cache(pdf_path, cache_dir, limits))
+
+
+def extract_text(pdf_path: Path, cache_dir: Path = TEXT_CACHE_DIR, limits=None) -> str:
+    """Extract text from a PDF, reusing the on-disk cache when present."""
+    return extract_to_cache(pdf_path, cache_dir, limits).read_text(encoding="utf-8")
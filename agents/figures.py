@@ -0,0 +1,190 @@
+"""Figure and Table Extraction"""
+
+import base64
+import hashlib
+import json
+import math
+from pathlib import Path
+
+from .extraction import file_digest
+from .sandbox import ExtractionLimits, run_limited
+
+FIGURE_CACHE_DIR = Path("output") / "cache" / "figures"
+
+# The API bills an image at about (width * height) / 750 tokens and
+# downscales anything with a long edge over 1568 pixels, so no image block
+# bills more than about 1600 tokens
+PIXELS_PER_TOKEN = 750
+MAX_LONG_EDGE = 1568
+MAX_IMAGE_TOKENS = 1600
+
+
+def image_tokens(width: int, height: int) -> int:
+    return math.ceil(width * height / PIXELS_PER_TOKEN)
+
+
+def average_hash(image) -> int:
+    """64-bit perceptual hash: near-identical images differ in few bits."""
+    small = image.convert("L").resize((8, 8))
+    pixels = list(small.getdata())
+    mean = sum(pixels) / len(pixels)
+    bits = 0
+    for pixel in pixels:
+        bits = (bits << 1) | (pixel > mean)
+    return bits
+
+
+class FigureExtractor:
+    """Crops figures and tables out of a PDF as token-bounded image blocks."""
+
+    def __init__(self, config: dict, cache_dir: Path = FIGURE_CACHE_DIR):
+        figures = config.get("figures", {})
+        self.enabled = figures.get("enabled", False)
+        self.agents = set(figures.get("agents", []))
+        self.max_images = figures.get("max_images", 8)
+        self.max_image_tokens = figures.get("max_image_tokens", 1200)
+        self.min_image_tokens = figures.get("min_image_tokens", 300)
+        self.max_total_tokens = figures.get("max_total_tokens", 6000)
+        self.min_area_fraction = figures.get("min_area_fraction", 0.02)
+        self.dedup_distance = figures.get("dedup_distance", 4)
+        self.max_dpi = figures.get("max_dpi", 150)
+        self.jpeg_quality = figures.get("jpeg_quality", 80)
+        self.cache_dir = Path(cache_dir)
+        # Rendering and table detection parse the PDF like text extraction
+        # does, so they run under the same limits
+        self.limits = ExtractionLimits.from_config(config)
+
+    def applies_to(self, agent: str) -> bool:
+        return self.enabled and agent in self.agents
+
+    def _settings_key(self) -> str:
+        settings = [self.max_images, self.max_image_tokens, self.min_image_tokens, self.max_total_tokens,
+                    self.min_area_fraction, self.dedup_distance, self.max_dpi, self.jpeg_quality]
+        return hashlib.sha256(json.dumps(settings).encode()).hexdigest()[:8]
+
+    def figure_dir(self, pdf_path: Path) -> Path:
+        return self.cache_dir / f"{file_digest(pdf_path)}-{self._settings_key()}"
+
+    def extract(self, pdf_path: Path, figure_dir: Path = None) -> list:
+        """Return figure records for a PDF, cached by PDF hash and settings.
+
+        Raises ExtractionError if the sandboxed extractor fails or times out.
+        """
+        figure_dir = figure_dir or self.figure_dir(pdf_path)
+        index_path = figure_dir / "figures.json"
+        if index_path.exists():
+            with open(index_path) as f:
+                return json.load(f)
+        if self.limits:
+            return run_limited(self._extract, (Path(pdf_path), figure_dir), self.limits)
+        return self._extract(pdf_path, figure_dir)
+
+    def _extract(self, pdf_path: Path, figure_dir: Path) -> list:
+        index_path = figure_dir / "figures.json"
+        try:
+            import pdfplumber
+        except ImportError:
+            return []  # Figures are optional; reviews fall back to text only
+
+        figure_dir.mkdir(parents=True, exist_ok=True)
+        records = []
+        with pdfplumber.open(pdf_path) as pdf:
+            candidates = self._candidates(pdf)
+            # Shrink every image when there are many candidates so the total
+            # stays bounded; below the floor, send fewer images instead
+            count = min(len(candidates), self.max_images, self.max_total_tokens // self.min_image_tokens)
+            per_image = min(self.max_image_tokens, self.max_total_tokens // count) if count else 0
+
+            hashes = []
+            for page_number, kind, bbox in candidates:
+                if len(records) >= count:
+                    break
+                page = pdf.pages[page_number - 1]
+                try:
+                    image = self._render(page, bbox, per_image)
+                except Exception as e:
+                    print(f"Skipping {kind} on page {page_number}: {e}")
+                    continue
+                finally:
+                    page.flush_cache()
+
+                fingerprint = average_hash(image)
+                if any(bin(fingerprint ^ seen).count("1") <= self.dedup_distance for seen in hashes):
+                    continue
+                hashes.append(fingerprint)
+
+                records.append(self._save(figure_dir, len(records) + 1, page_number, kind, bbox, image))
+
+        partial = index_path.with_suffix(".partial")
+        with open(partial, "w") as f:
+            json.dump(records, f, indent=2)
+        partial.replace(index_path)
+        return records
+
+    def _candidates(self, pdf) -> list:
+        """(page number, kind, bbox) for embedded images and detected tables."""
+        candidates = []
+        for page_number, page in enumerate(pdf.pages, 1):
+            min_area = self.min_area_fraction * float(page.width) * float(page.height)
+            boxes = [("figure", (img["x0"], img["top"], img["x1"], img["bottom"])) for img in page.images]
+            try:
+                boxes += [("table", table.bbox) for table in page.find_tables()]
+            except Exception:
+                pass
+            for kind, (x0, top, x1, bottom) in boxes:
+                # Clip to the page; skip icons, logos and rules
+                x0, top = max(x0, 0), max(top, 0)
+                x1, bottom = min(x1, float(page.width)), min(bottom, float(page.height))
+                if (x1 - x0) * (bottom - top) >= min_area:
+                    candidates.append((page_number, kind, (x0, top, x1, bottom)))
+            page.flush_cache()
+        return candidates
+
+    def _render(self, page, bbox: tuple, max_tokens: int):
+        """Render a page region at the resolution that fits the token budget."""
+        x0, top, x1, bottom = bbox
+        target_pixels = max_tokens * PIXELS_PER_TOKEN
+        # At 72 dpi one PDF point is one pixel
+        resolution = min(self.max_dpi, 72 * math.sqrt(target_pixels / ((x1 - x0) * (bottom - top))))
+        image = page.crop(bbox, strict=False).to_image(resolution=resolution).original.convert("RGB")
+
+        scale = min(1.0, math.sqrt(target_pixels / (image.width * image.height)),
+                    MAX_LONG_EDGE / max(image.width, image.height))
+        if scale < 1.0:
+            image = image.resize((max(1, int(image.width * scale)), max(1, int(image.height * scale))))
+        return image
+
+    def _save(self, figure_dir: Path, number: int, page_number: int, kind: str, bbox: tuple, image) -> dict:
+        # Tables are text: keep them lossless so they stay legible
+        media_type, extension = ("image/png", "png") if kind == "table" else ("image/jpeg", "jpg")
+        path = figure_dir / f"{kind}-{number:02d}.{extension}"
+        if extension == "png":
+            image.save(path, format="PNG", optimize=True)
+        else:
+            image.save(path, format="JPEG", quality=self.jpeg_quality, optimize=True)
+        return {
+            "file": path.name,
+            "page": page_number,
+            "kind": kind,
+            "bbox": [round(float(v), 1) for v in bbox],
+            "width": image.width,
+            "height": image.height,
+            "tokens": image_tokens(image.width, image.height),
+            "media_type": media_type,
+        }
+
+    def content_blocks(self, pdf_path: Path) -> tuple[list, dict]:
+        """Return labelled image content blocks and a usage summary."""
+        figure_dir = self.figure_dir(pdf_path)
+        records = self.extract(pdf_path, figure_dir)
+        blocks = []
+        for number, record in enumerate(records, 1):
+            with open(figure_dir / record["file"], "rb") as f:
+                data = base64.standard_b64encode(f.read()).decode()
+            blocks.append({"type": "text", "text": f"Extracted {record['kind']} {number} (page {record['page']}):"})
+            blocks.append({
+                "type": "image",
+                "source": {"type": "base64", "media_type": record["media_type"], "data": data},
+            })
+        summary = {"images": len(records), "image_tokens": sum(r["tokens"] for r in records)}
+        return blocks, summary
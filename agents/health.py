@@ -0,0 +1,366 @@
+"""Pipeline Health Metrics"""
+
+import json
+import math
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import yaml
+
+from .budget import LEDGER_PATH
+from .pipeline import CHECKPOINT_DIR
+from .profiling import profile_dir
+
+STATE_PATH = Path("output") / "metrics" / "health-state.json"
+STATUS_PATH = Path("output") / "status" / "journal-health.json"
+
+QUANTILES = {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+
+# Latencies below this (seconds) share a single zero bucket
+MIN_VALUE = 1e-3
+
+
+def parse_timestamp(timestamp: str) -> float:
+    """Return epoch seconds for a ledger timestamp (YYYY-MM-DDTHH:MM:SSZ)."""
+    return datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+
+
+class QuantileSketch:
+    """Streaming quantile sketch with log-spaced buckets (DDSketch-style).
+
+    Memory grows with the log of the value range, not the sample count, and
+    every quantile is within the configured relative accuracy of the truth.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if value < MIN_VALUE:
+            self.zeros += 1
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def quantile(self, q: float):
+        """Return the approximate q-quantile, or None when empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # Midpoint of the bucket (gamma^(k-1), gamma^k]
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def summary(self) -> dict:
+        summary = {"count": self.count, "mean": round(self.total / self.count, 3) if self.count else None}
+        for name, q in QUANTILES.items():
+            value = self.quantile(q)
+            summary[name] = round(value, 3) if value is not None else None
+        return summary
+
+    def to_dict(self) -> dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(key): count for key, count in sorted(self.buckets.items())},
+            "zeros": self.zeros,
+            "count": self.count,
+            "total": self.total,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(data.get("relative_accuracy", 0.01))
+        sketch.buckets = {int(key): count for key, count in data.get("buckets", {}).items()}
+        sketch.zeros = data.get("zeros", 0)
+        sketch.count = data.get("count", 0)
+        sketch.total = data.get("total", 0.0)
+        return sketch
+
+
+class WindowedCounts:
+    """Event counts in fixed time buckets, kept only as long as the widest window."""
+
+    def __init__(self, bucket_seconds: int, horizon_seconds: int, buckets: dict = None):
+        self.bucket_seconds = bucket_seconds
+        self.horizon_seconds = horizon_seconds
+        self.buckets = {int(start): counts for start, counts in (buckets or {}).items()}
+
+    def add(self, timestamp: float, **counts):
+        start = int(timestamp // self.bucket_seconds * self.bucket_seconds)
+        bucket = self.buckets.setdefault(start, {})
+        for name, value in counts.items():
+            bucket[name] = bucket.get(name, 0) + value
+
+    def prune(self, now: float):
+        cutoff = now - self.horizon_seconds - self.bucket_seconds
+        self.buckets = {start: counts for start, counts in self.buckets.items() if start >= cutoff}
+
+    def totals(self, window_seconds: int, now: float) -> dict:
+        """Sum the counts of buckets overlapping the last window_seconds."""
+        cutoff = now - window_seconds - self.bucket_seconds
+        totals = {}
+        for start, counts in self.buckets.items():
+            if start > cutoff:
+                for name, value in counts.items():
+                    totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def to_dict(self) -> dict:
+        return {str(start): counts for start, counts in sorted(self.buckets.items())}
+
+
+class HealthCollector:
+    """Builds the journal health report from the usage ledger, stage timings
+    and review records.
+
+    The ledger is read from a saved byte offset and folded into persisted
+    sketches and windowed counters, so each run only pays for new entries.
+    Pipeline checkpoints and profiles are remembered by run start and file
+    mtime, so each stage timing is counted once.
+    """
+
+    def __init__(self, config: dict, state_path: Path = STATE_PATH):
+        health = config.get("health", {})
+        self.relative_accuracy = health.get("relative_accuracy", 0.01)
+        self.bucket_seconds = health.get("bucket_minutes", 15) * 60
+        self.windows = health.get("windows_hours", [1, 24, 168])
+        self.degraded_error_rate = health.get("degraded_error_rate", 0.05)
+        self.critical_error_rate = health.get("critical_error_rate", 0.2)
+        self.queue_depth_alert = health.get("queue_depth_alert", 10)
+        self.queue_age_alert_hours = health.get("queue_age_alert_hours", 48)
+
+        self.ledger_path = Path(config.get("rate_limits", {}).get("ledger_path", LEDGER_PATH))
+        self.state_path = Path(state_path)
+        self._load_state()
+
+    def _load_state(self):
+        state = {}
+        if self.state_path.exists():
+            with open(self.state_path) as f:
+                state = json.load(f)
+        self.offset = state.get("ledger_offset", 0)
+        self.latency = {
+            key: QuantileSketch.from_dict(data) for key, data in state.get("latency", {}).items()
+        }
+        self.turnaround = QuantileSketch.from_dict(state.get("turnaround", {"relative_accuracy": self.relative_accuracy}))
+        self.calls = WindowedCounts(self.bucket_seconds, max(self.windows) * 3600, state.get("calls"))
+        self.queue = state.get("queue", {})
+        self.timing_sources = state.get("timing_sources", {})
+
+    def save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            "ledger_offset": self.offset,
+            "latency": {key: sketch.to_dict() for key, sketch in sorted(self.latency.items())},
+            "turnaround": self.turnaround.to_dict(),
+            "calls": self.calls.to_dict(),
+            "queue": self.queue,
+            "timing_sources": self.timing_sources,
+        }
+        partial = self.state_path.with_suffix(".partial")
+        with open(partial, "w") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        partial.replace(self.state_path)
+
+    def _sketch(self, key: str) -> QuantileSketch:
+        if key not in self.latency:
+            self.latency[key] = QuantileSketch(self.relative_accuracy)
+        return self.latency[key]
+
+    def ingest_ledger(self) -> int:
+        """Fold ledger entries appended since the last run; return how many were read."""
+        if not self.ledger_path.exists():
+            return 0
+        if self.ledger_path.stat().st_size < self.offset:
+            # Ledger was truncated or replaced: start over rather than skip entries
+            self.offset = 0
+            self.latency = {}
+            self.calls.buckets = {}
+
+        count = 0
+        with open(self.ledger_path, "rb") as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Partially written entry; pick it up next run
+                self.offset += len(line)
+                line = line.strip()
+                if line:
+                    self._ingest(json.loads(line))
+                    count += 1
+        return count
+
+    def _ingest(self, entry: dict):
+        # Cancelled hedge losers are estimated, not observed calls
+        if entry.get("path") == "loser" or entry.get("estimated"):
+            return
+        timestamp = parse_timestamp(entry["timestamp"]) if entry.get("timestamp") else time.time()
+        self.calls.add(
+            timestamp,
+            calls=1,
+            errors=int(entry.get("path") == "error"),
+            overloads=int(entry.get("path") == "fallback"),
+        )
+        if entry.get("latency_s") is not None:
+            self._sketch(f"agent:{entry.get('agent')}").add(entry["latency_s"])
+            self._sketch(f"stage:{entry.get('stage', 'review')}").add(entry["latency_s"])
+
+    def ingest_stage_timings(self, checkpoint_dir: Path = CHECKPOINT_DIR,
+                             reviews_dir: Path = Path("reviews")) -> int:
+        """Fold stage durations from pipeline checkpoints and profiles into
+        the stage sketches; return how many durations were added."""
+        sources = {}
+        count = 0
+        for path in sorted(Path(checkpoint_dir).glob("*/checkpoint.json")):
+            with open(path) as f:
+                checkpoint = json.load(f)
+            for name, record in checkpoint.items():
+                if record.get("status") != "done" or record.get("duration_s") is None:
+                    continue
+                key = f"{path.parent.name}/{name}"
+                sources[key] = record.get("started_at")
+                if self.timing_sources.get(key) != sources[key]:
+                    self._sketch(f"stage:{name}").add(record["duration_s"])
+                    count += 1
+
+        profiles = [*Path(reviews_dir).glob("*/profile/*-stages.json"), *profile_dir().glob("*-stages.json")]
+        for path in sorted(profiles):
+            key = str(path)
+            sources[key] = path.stat().st_mtime_ns
+            if self.timing_sources.get(key) == sources[key]:
+                continue
+            with open(path) as f:
+                stages = json.load(f).get("stages", {})
+            # A profile keeps per-stage totals; each call counts at the mean
+            for name, totals in stages.items():
+                calls = int(totals.get("calls", 0))
+                for _ in range(calls):
+                    self._sketch(f"stage:{name}").add(totals["wall_s"] / calls)
+                count += calls
+
+        # Forget sources that were deleted so the state does not grow without bound
+        self.timing_sources = sources
+        return count
+
+    def update_queue(self, submissions_dir: Path = Path("submissions"),
+                     reviews_dir: Path = Path("reviews"), now: float = None) -> dict:
+        """Track submissions awaiting a meta-review and time the ones that finished."""
+        now = now or time.time()
+        pending = {}
+        completed = 0
+        for submission_dir in sorted(Path(submissions_dir).iterdir()):
+            if (not submission_dir.is_dir() or submission_dir.name.startswith('.')
+                    or submission_dir.name == 'SUBMISSION_TEMPLATE'):
+                continue
+            submission_id = submission_dir.name
+            if (Path(reviews_dir) / submission_id / "meta-review.yaml").exists():
+                completed += 1
+                first_seen = self.queue.get(submission_id)
+                if first_seen is not None:
+                    self.turnaround.add((now - first_seen) / 60)
+                continue
+            pending[submission_id] = self.queue.get(submission_id) or self._submitted_at(submission_dir, now)
+
+        self.queue = pending
+        ages = [(now - first_seen) / 3600 for first_seen in pending.values()]
+        return {
+            "pending_submissions": len(pending),
+            "oldest_pending_hours": round(max(ages), 1) if ages else 0,
+            "total_reviews": completed,
+        }
+
+    @staticmethod
+    def _submitted_at(submission_dir: Path, now: float) -> float:
+        """Submission time from metadata when recorded, else when first observed."""
+        metadata_path = submission_dir / "metadata.yaml"
+        if metadata_path.exists():
+            with open(metadata_path) as f:
+                submitted_at = (yaml.safe_load(f) or {}).get("submitted_at")
+            if submitted_at:
+                try:
+                    return parse_timestamp(str(submitted_at))
+                except ValueError:
+                    pass
+        return now
+
+    def error_rates(self, now: float = None) -> dict:
+        """API error and overload rates over each sliding window."""
+        now = now or time.time()
+        self.calls.prune(now)
+        rates = {}
+        for hours in self.windows:
+            totals = self.calls.totals(hours * 3600, now)
+            calls = totals.get("calls", 0)
+            rates[f"{hours}h"] = {
+                "calls": calls,
+                "errors": totals.get("errors", 0),
+                "overloads": totals.get("overloads", 0),
+                "error_rate": round(totals.get("errors", 0) / calls, 4) if calls else 0.0,
+            }
+        return rates
+
+    def report(self, workflow_runs: dict = None, now: float = None) -> dict:
+        """Update all metrics and return the journal health report."""
+        now = now or time.time()
+        self.ingest_ledger()
+        self.ingest_stage_timings()
+        queue = self.update_queue(now=now)
+        errors = self.error_rates(now)
+
+        latency = {"agents": {}, "stages": {}}
+        for key, sketch in sorted(self.latency.items()):
+            kind, _, name = key.partition(":")
+            latency["agents" if kind == "agent" else "stages"][name] = sketch.summary()
+
+        # The shortest window reacts fastest; an empty one falls back to the next
+        window = next((window for window, rates in errors.items() if rates["calls"]), None)
+        recent = dict(errors[window], window=window) if window else {"window": None, "error_rate": 0.0}
+        workflow_runs = workflow_runs or {}
+        success_rate = workflow_runs.get("success_rate", 100)
+        if recent["error_rate"] >= self.critical_error_rate or success_rate < 50:
+            status = "critical"
+        elif recent["error_rate"] >= self.degraded_error_rate or success_rate < 80:
+            status = "degraded"
+        else:
+            status = "healthy"
+
+        queue_alert = (
+            queue["pending_submissions"] > self.queue_depth_alert
+            or queue["oldest_pending_hours"] > self.queue_age_alert_hours
+        )
+
+        return {
+            "timestamp": datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "status": status,
+            "queue_alert": "high" if queue_alert else "normal",
+            "workflow_runs_24h": workflow_runs,
+            **queue,
+            "turnaround_minutes": self.turnaround.summary(),
+            "latency_seconds": latency,
+            "api_errors": errors,
+            "recent_api_errors": recent,  # The window the status was judged on
+        }
+
+
+def write_status(report: dict, path: Path = STATUS_PATH) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    return path
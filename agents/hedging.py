@@ -0,0 +1,155 @@
+"""Hedged Requests and Overload Fallback"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+from .budget import LEDGER_PATH, UsageLedger, estimate_tokens
+from .figures import MAX_IMAGE_TOKENS
+
+# Anthropic's status code for an overloaded API
+OVERLOADED_STATUS = 529
+
+
+def is_overloaded(error: Exception) -> bool:
+    """Whether an API error means the model is overloaded."""
+    return (
+        getattr(error, "status_code", None) == OVERLOADED_STATUS
+        or type(error).__name__ == "OverloadedError"
+    )
+
+
+def request_tokens(request_params: dict) -> int:
+    """Worst-case tokens a request can bill: estimated input plus max_tokens."""
+    text = request_params.get("system", "")
+    images = 0
+    for message in request_params.get("messages", []):
+        content = message.get("content", "")
+        if isinstance(content, str):
+            text += content
+        else:
+            text += "".join(block.get("text", "") for block in content if isinstance(block, dict))
+            images += sum(1 for block in content if isinstance(block, dict) and block.get("type") == "image")
+    return estimate_tokens(text) + images * MAX_IMAGE_TOKENS + request_params.get("max_tokens", 0)
+
+
+def _start(call) -> Future:
+    """Run a call on a daemon thread so a losing hedge never blocks process exit."""
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(call())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+class LatencyTracker:
+    """Observed per-agent, per-model call latency from the usage ledger."""
+
+    def __init__(self, ledger: UsageLedger, quantile: float = 0.95,
+                 min_samples: int = 20, window: int = 200):
+        self.ledger = ledger
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.window = window
+        self._samples = None
+
+    def threshold(self, agent: str, model: str):
+        """Return the latency quantile in seconds, or None without enough samples."""
+        if self._samples is None:
+            self._samples = {}
+            for entry in self.ledger.entries():
+                if entry.get("latency_s") is not None and entry.get("stage", "review") == "review":
+                    key = (entry.get("agent"), entry.get("model"))
+                    self._samples.setdefault(key, []).append(entry["latency_s"])
+        samples = self._samples.get((agent, model), [])[-self.window:]
+        if len(samples) < self.min_samples:
+            return None
+        return sorted(samples)[int(self.quantile * (len(samples) - 1))]
+
+
+class HedgedCaller:
+    """Issues API calls with optional latency hedging and overload fallback."""
+
+    def __init__(self, config: dict, ledger: UsageLedger = None):
+        hedging = config["review"].get("hedging", {})
+        self.enabled = hedging.get("enabled", False)
+        self.fallback_model = hedging.get("fallback_model")
+        self.default_delay = hedging.get("default_delay_seconds")
+        self.submission_token_budget = hedging.get("submission_token_budget")
+
+        self.ledger = ledger or UsageLedger(config.get("rate_limits", {}).get("ledger_path", LEDGER_PATH))
+        self.latency = LatencyTracker(
+            self.ledger,
+            quantile=hedging.get("quantile", 0.95),
+            min_samples=hedging.get("min_samples", 20),
+        )
+        self._reserved = {}
+
+    def hedge_delay(self, agent: str, model: str):
+        """Seconds to wait before hedging, or None to never hedge."""
+        threshold = self.latency.threshold(agent, model)
+        return threshold if threshold is not None else self.default_delay
+
+    def _reserve(self, submission_id: str, request_params: dict) -> bool:
+        """Reserve budget for an extra request; False if it would exceed the budget."""
+        if self.submission_token_budget is None:
+            return True
+        if submission_id is None:
+            return False
+        spent = sum(
+            entry.get("input_tokens", 0) + entry.get("output_tokens", 0)
+            for entry in self.ledger.entries()
+            if entry.get("submission_id") == submission_id
+        )
+        extra = request_tokens(request_params)
+        reserved = self._reserved.get(submission_id, 0)
+        if spent + reserved + extra > self.submission_token_budget:
+            return False
+        self._reserved[submission_id] = reserved + extra
+        return True
+
+    def create(self, client, request_params: dict, agent: str, submission_id: str = None) -> tuple:
+        """Return (response, call info) where call info records which path won."""
+        started = time.monotonic()
+        futures = {_start(lambda: client.messages.create(**request_params)): "primary"}
+
+        delay = self.hedge_delay(agent, request_params["model"]) if self.enabled else None
+        if delay is not None:
+            done, _ = wait(list(futures), timeout=delay)
+            if not done and self._reserve(submission_id, request_params):
+                print(f"Hedging {agent} request after {delay:.1f}s")
+                futures[_start(lambda: client.messages.create(**request_params))] = "hedge"
+
+        errors = []
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result(), {
+                        "path": futures[future],
+                        "model": request_params["model"],
+                        "hedged": len(futures) > 1,
+                        "latency_s": round(time.monotonic() - started, 3),
+                    }
+                errors.append(future.exception())
+
+        error = errors[0]
+        if (self.enabled and self.fallback_model and is_overloaded(error)
+                and self._reserve(submission_id, request_params)):
+            print(f"{request_params['model']} overloaded; falling back to {self.fallback_model}")
+            response = client.messages.create(**dict(request_params, model=self.fallback_model))
+            return response, {
+                "path": "fallback",
+                "model": self.fallback_model,
+                "hedged": len(futures) > 1,
+                "latency_s": round(time.monotonic() - started, 3),
+            }
+        raise error
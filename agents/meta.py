@@ -2,7 +2,37 @@
 
 import yaml
 from pathlib import Path
+from . import profiling
 from .base import BaseReviewer
+from .budget import estimate_tokens
+from .digest import ReviewDigest
+from .routing import ReviewRouter, load_metadata
+from .thinking import score_disagreement
+
+
+def threshold_decision(score: float, thresholds: dict) -> str:
+    """Map a weighted score onto a decision using review.thresholds."""
+    if score >= thresholds["accept"]:
+        return "accept"
+    if score >= thresholds["minor_revision"]:
+        return "minor_revision"
+    if score >= thresholds["major_revision"]:
+        return "major_revision"
+    return "reject"
+
+
+def weighted_scores(reviews: dict, weights: dict) -> tuple[float, dict]:
+    """Return (weighted average, per-agent overall scores) for parsed reviews."""
+    breakdown = {}
+    for agent, review in reviews.items():
+        overall = ((review or {}).get("scores") or {}).get("overall")
+        if isinstance(overall, (int, float)) and not isinstance(overall, bool):
+            breakdown[agent] = float(overall)
+    total_weight = sum(weights.get(agent, 1.0) for agent in breakdown)
+    if not total_weight:
+        return 0.0, breakdown
+    average = sum(score * weights.get(agent, 1.0) for agent, score in breakdown.items()) / total_weight
+    return round(average, 2), breakdown
 
 
 class MetaReviewer(BaseReviewer):
@@ -88,16 +118,23 @@ author_action_items:
 - Provide actionable feedback
 - Be clear about what's required vs recommended for revision"""
 
-    def review(self, paper_content: str, metadata: dict) -> dict:
+    def review(self, paper_content: str, metadata: dict, submission_id: str = None) -> dict:
         """Override to take agent reviews as input instead of paper."""
         raise NotImplementedError("Use synthesize() instead")
 
-    def synthesize(self, submission_id: str, reviews: dict) -> dict:
+    def synthesize(self, submission_id: str, reviews: dict, weights: dict = None) -> dict:
         """Synthesize multiple agent reviews into final decision."""
+        self.submission_id = submission_id
+        self.calls = []
         system_prompt = self._load_prompt()
 
         # Format reviews for the prompt
-        reviews_text = self._format_reviews(reviews)
+        with profiling.stage("build_prompt"):
+            reviews_text = self._format_reviews(reviews)
+
+        if weights is None:
+            weights = ReviewRouter(self.config).weights_for(load_metadata(submission_id))
+        weights_text = "\n".join(f"- {agent}: {weight:.0%}" for agent, weight in weights.items())
 
         user_prompt = f"""Please synthesize the following agent reviews and provide a final decision.
 
@@ -108,38 +145,61 @@ author_action_items:
 
 {reviews_text}
 
+## Reviewer Weights
+These weights from the journal configuration replace the default weighting.
+{weights_text}
+
 ---
 
 Please provide your meta-review and final decision following the specified output format."""
 
-        # Build API request parameters
-        request_params = {
-            "model": self.model,
-            "max_tokens": self.max_tokens,
-            "system": system_prompt,
-            "messages": [{"role": "user", "content": user_prompt}]
-        }
-
-        # Add extended thinking if enabled (for deeper synthesis)
-        if self.use_extended_thinking:
-            request_params["thinking"] = {
-                "type": "enabled",
-                "budget_tokens": self.thinking_budget
+        thinking_budget, max_tokens = self.thinking_policy.budget(
+            self.agent_type,
+            disagreement=score_disagreement(reviews),
+        )
+        request_params = self._request_params(system_prompt, user_prompt, thinking_budget, max_tokens)
+
+        response_text = self._create(request_params)
+
+        with profiling.stage("parse_response"):
+            meta_review = self._parse_response(response_text)
+        if isinstance(meta_review, dict):
+            meta_review["review_metadata"] = {"call": self.last_call}
+        return meta_review
+
+    def decide_by_threshold(self, reviews: dict, weights: dict) -> dict:
+        """Decide from weighted scores alone, without an API call (screening review type).
+
+        With no scored review (the screening call failed or could not be
+        parsed) there is nothing to threshold: the result is ``escalate``
+        for an editor rather than a reject.
+        """
+        average, breakdown = weighted_scores(reviews, weights)
+        self.last_usage = {}
+        if not breakdown:
+            missing = ", ".join(sorted(reviews)) or "none loaded"
+            return {
+                "synthesis": {"score_breakdown": {}},
+                "decision": "escalate",
+                "rationale": (f"No agent review has a usable overall score (reviews: {missing}), so no "
+                              "decision was made from the thresholds. An editor must decide or re-run the review.\n"),
             }
-            request_params["temperature"] = 1
-        else:
-            request_params["temperature"] = self.temperature
-
-        response = self.client.messages.create(**request_params)
-
-        # Extract text response
-        response_text = ""
-        for block in response.content:
-            if hasattr(block, 'text'):
-                response_text = block.text
-                break
-
-        return self._parse_response(response_text)
+        decision = threshold_decision(average, self.config["review"]["thresholds"])
+
+        rationale = [f"Decision from the weighted score {average:.2f} against the configured thresholds."]
+        for review in reviews.values():
+            summary = (review or {}).get("evaluation", {}).get("summary")
+            if summary:
+                rationale.append(summary.strip())
+
+        return {
+            "synthesis": {
+                "weighted_average": average,
+                "score_breakdown": breakdown,
+            },
+            "decision": decision,
+            "rationale": "\n\n".join(rationale) + "\n",
+        }
 
     def _format_reviews(self, reviews: dict) -> str:
         """Format reviews dict into readable text."""
@@ -148,14 +208,21 @@ Please provide your meta-review and final decision following the specified outpu
             formatted.append(f"### {agent.upper()} REVIEWER\n")
             formatted.append(yaml.dump(review, default_flow_style=False))
             formatted.append("\n---\n")
-        return "\n".join(formatted)
+        full = "\n".join(formatted)
+
+        digest = ReviewDigest(self.config)
+        if not digest.enabled:
+            return full
+        compact = digest.build(reviews)
+        print(f"Review digest: ~{estimate_tokens(compact)} tokens instead of ~{estimate_tokens(full)}")
+        return compact
 
     def load_reviews(self, submission_id: str) -> dict:
-        """Load all agent reviews for a submission."""
+        """Load the routed agent reviews for a submission."""
         review_dir = Path("reviews") / submission_id
         reviews = {}
 
-        for agent in ["technical", "domain", "ethics", "clarity"]:
+        for agent in ReviewRouter(self.config).agents_for(load_metadata(submission_id)):
             review_path = review_dir / f"{agent}.yaml"
             if review_path.exists():
                 with open(review_path) as f:
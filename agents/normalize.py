@@ -0,0 +1,214 @@
+"""Extracted Text Normalization"""
+
+import re
+from collections import Counter
+
+from .budget import estimate_tokens
+
+# Presentation forms and invisible characters that PDF text layers leak
+CHARACTER_FIXES = str.maketrans({
+    "ﬀ": "ff", "ﬁ": "fi", "ﬂ": "fl", "ﬃ": "ffi", "ﬄ": "ffl",
+    "ﬅ": "st", "ﬆ": "st",
+    "­": None,  # Soft hyphen
+    "​": None, "‌": None, "‍": None, "﻿": None,
+    " ": " ", " ": " ", " ": " ",
+    "‐": "-", "‑": "-",
+})
+LIGATURES = frozenset("ﬀﬁﬂﬃﬄﬅﬆ")
+
+# Arabic or lowercase roman page numbers, not words made of roman letters
+PAGE_NUMBER = re.compile(r"^\s*(?:(?:[Pp]age|PAGE)\s+)?(?:(\d{1,4})|([ivxlc]{1,7}))(?:\s*(?:of|/)\s*\d+)?\s*$")
+ROMAN_NUMERAL = re.compile(r"^c{0,3}(?:xc|xl|l?x{0,3})(?:ix|iv|v?i{0,3})$")
+ROMAN_VALUES = {"i": 1, "v": 5, "x": 10, "l": 50, "c": 100}
+# "compu-\ntation" -> "computation"; capitalized continuations are left alone
+# since they are usually real compounds ("Hartree-\nFock")
+HYPHENATED = re.compile(r"(-?)\b([A-Za-z]{2,})-\n\s*([a-z]{2,})")
+# Left parts that make a hyphenated compound when split at the line end
+# ("self-\nsupervised" -> "self-supervised")
+COMPOUND_PREFIXES = frozenset({"self", "non", "quasi", "pseudo", "well", "half", "cross"})
+# Fake-bold text layers draw every glyph twice: "TThhee" -> "The"; digits
+# are left alone since "1122" is more often data than a doubled glyph
+DOUBLED = re.compile(r"\b(?:([A-Za-z])\1){3,}\b")
+SPACES = re.compile(r"[ \t\f\v]+")
+BLANK_LINES = re.compile(r"\n{3,}")
+
+YEAR = re.compile(r"\b(?:19|20)\d{2}[a-z]?\b")
+SURNAME = re.compile(r"\b([A-Z][A-Za-z'À-ſ-]+)\b")
+REFERENCE_NUMBER = re.compile(r"^\s*(\[\d+\]|\d{1,3}\.?)\s")
+
+
+def _line_key(line: str) -> str:
+    """Running headers differ only in page numbers; compare them without digits."""
+    return re.sub(r"\d+", "#", " ".join(line.lower().split()))
+
+
+def _roman_value(numeral: str) -> int:
+    if not ROMAN_NUMERAL.match(numeral):
+        return None
+    values = [ROMAN_VALUES[char] for char in numeral]
+    return sum(-value if value < following else value
+               for value, following in zip(values, values[1:] + [0]))
+
+
+def _is_page_number(line: str, position: int) -> bool:
+    """Arabic numbers always count; a roman numeral only when it matches the
+    page's position, so a lone "xi" or "civil" at a page edge is kept."""
+    match = PAGE_NUMBER.match(line)
+    if not match:
+        return False
+    return bool(match.group(1)) or _roman_value(match.group(2)) == position
+
+
+def _join_hyphenated(match) -> str:
+    compound, left, right = match.groups()
+    # Already a compound ("state-of-the-\nart") or a compound prefix: keep the hyphen
+    if compound or left.lower() in COMPOUND_PREFIXES:
+        return f"{compound}{left}-{right}\n"
+    return f"{left}{right}\n"
+
+
+class PageMarker(str):
+    """Text standing in for a page that could not be extracted.
+
+    Normalizers pass it through unchanged: it keeps its page's position but
+    is not counted or learned from as page text.
+    """
+
+
+class TextNormalizer:
+    """Streams page texts through cleanup, counting what it removed.
+
+    Running headers and footers are lines near the top or bottom of a page
+    that repeat across pages; they are learned from the first ``window``
+    pages, which are the only ones held in memory.
+    """
+
+    def __init__(self, window: int = 8, edge_lines: int = 3, min_repeats: int = 3, repeat_fraction: float = 0.5):
+        self.window = window
+        self.edge_lines = edge_lines
+        self.min_repeats = min_repeats
+        self.repeat_fraction = repeat_fraction
+        self.boilerplate = set()
+        self.stats = Counter()
+        self._position = 0
+
+    def pages(self, pages):
+        """Yield normalized page texts."""
+        buffered = []
+        for text in pages:
+            if len(buffered) < self.window:
+                buffered.append(text)
+                if len(buffered) == self.window:
+                    self.boilerplate = self._learn(buffered)
+                    yield from (self.page(page) for page in buffered)
+                continue
+            yield self.page(text)
+        if len(buffered) < self.window:
+            self.boilerplate = self._learn(buffered)
+            yield from (self.page(page) for page in buffered)
+
+    def _edges(self, lines: list) -> list:
+        """Indexes of the first and last few non-blank lines (only the very first
+        and last on short pages, so a sparse page keeps its body)."""
+        indexes = [index for index, line in enumerate(lines) if line.strip()]
+        if len(indexes) <= 2 * self.edge_lines:
+            return indexes[:1] + indexes[-1:] if len(indexes) > 2 else []
+        return indexes[:self.edge_lines] + indexes[-self.edge_lines:]
+
+    def _learn(self, pages: list) -> set:
+        # Learn only from full pages: on a page of a few lines every line is
+        # near an edge
+        counts = Counter()
+        # Learn from the same form page() compares against
+        full = [lines for lines in ((text or "").translate(CHARACTER_FIXES).splitlines() for text in pages
+                                    if not isinstance(text, PageMarker))
+                if sum(1 for line in lines if line.strip()) > 2 * self.edge_lines]
+        for lines in full:
+            counts.update({_line_key(lines[index]) for index in self._edges(lines)})
+        threshold = max(self.min_repeats, self.repeat_fraction * len(full))
+        return {key for key, count in counts.items() if count >= threshold and key}
+
+    def page(self, text: str) -> str:
+        """Normalize one page's text."""
+        self._position += 1
+        if not text or isinstance(text, PageMarker):
+            return text
+        self.stats["pages"] += 1
+        self.stats["raw_chars"] += len(text)
+        self.stats["raw_tokens"] += estimate_tokens(text)
+        self.stats["ligatures"] += sum(1 for char in text if char in LIGATURES)
+        text = text.translate(CHARACTER_FIXES)
+
+        lines = text.splitlines()
+        edges = set(self._edges(lines))
+        kept, previous = [], None
+        for index, line in enumerate(lines):
+            if index in edges:
+                if _line_key(line) in self.boilerplate:
+                    self.stats["boilerplate_lines"] += 1
+                    continue
+                if _is_page_number(line, self._position):
+                    self.stats["page_numbers"] += 1
+                    continue
+            stripped = line.strip()
+            if stripped and stripped == previous and len(stripped) > 20:
+                # Overlapping text layers repeat whole lines
+                self.stats["duplicate_lines"] += 1
+                continue
+            if stripped:
+                previous = stripped
+            kept.append(line)
+        text = "\n".join(kept)
+
+        text, count = HYPHENATED.subn(_join_hyphenated, text)
+        self.stats["hyphenations"] += count
+        text, count = DOUBLED.subn(lambda match: match.group(0)[::2], text)
+        self.stats["doubled_words"] += count
+        text = SPACES.sub(" ", text)
+        text = "\n".join(line.strip() for line in text.split("\n"))
+        text = BLANK_LINES.sub("\n\n", text).strip()
+
+        self.stats["chars"] += len(text)
+        self.stats["tokens"] += estimate_tokens(text)
+        return text
+
+    def summary(self) -> dict:
+        """Counts of what was removed and the estimated tokens saved."""
+        summary = dict(self.stats)
+        summary["tokens_saved"] = self.stats["raw_tokens"] - self.stats["tokens"]
+        return summary
+
+
+def citation_key(entry: str) -> str:
+    """Compact key for a reference entry, e.g. "[12] Kapoor 2024"."""
+    match = REFERENCE_NUMBER.match(entry)
+    number = match.group(1) if match else ""
+    rest = entry[match.end():] if match else entry
+    # The first author is "Surname, I.", "I. Surname" or "Given Surname"
+    surname = None
+    for segment in re.split(r"\.\s+", re.split(r",| and ", rest, maxsplit=1)[0]):
+        names = SURNAME.findall(segment)
+        if names:
+            surname = names[-1]
+            break
+    year = YEAR.search(rest)
+    parts = [part for part in (number, surname, year and year.group(0)) if part]
+    return " ".join(parts)
+
+
+def abbreviate_references(text: str) -> tuple[str, int]:
+    """Replace the reference list with compact citation keys; return (text, tokens saved)."""
+    from .related_work import find_references, parse_references
+
+    span = find_references(text)
+    if span is None or not text[span[1]:span[2]].strip():
+        return text, 0
+    start, list_start, list_end = span
+    entries = parse_references(text[list_start:list_end], max_references=None)
+    keys = "\n".join(citation_key(entry) for entry in entries)
+    # Appendices after the reference list are kept in place
+    rest = text[list_end:].strip()
+    abbreviated = f"{text[:start].rstrip()}\n\nReferences (abbreviated to citation keys)\n{keys}"
+    if rest:
+        abbreviated += f"\n\n{rest}"
+    return abbreviated, estimate_tokens(text) - estimate_tokens(abbreviated)
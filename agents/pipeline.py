@@ -0,0 +1,199 @@
+"""Checkpointed Review Pipeline"""
+
+import hashlib
+import json
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from .extraction import file_digest
+
+CHECKPOINT_DIR = Path("output") / "pipeline"
+
+
+class StageError(RuntimeError):
+    """Raised by a stage to fail with a message rather than a traceback."""
+
+
+@dataclass
+class Stage:
+    """One pipeline step.
+
+    ``run(context)`` returns a JSON-serializable dict of outputs, which later
+    stages read from ``context[stage name]``. ``inputs(context)`` lists the
+    files and values the stage depends on; ``outputs(context)`` lists files
+    that must still exist for a checkpoint to count.
+    """
+    name: str
+    run: Callable[[dict], dict]
+    deps: tuple = ()
+    inputs: Callable[[dict], list] = lambda context: []
+    outputs: Callable[[dict], list] = lambda context: []
+
+
+def _fingerprint_value(value) -> str:
+    if isinstance(value, Path):
+        if value.is_file():
+            return f"{value}:{file_digest(value)}"
+        return f"{value}:missing"
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+@dataclass
+class Pipeline:
+    """Runs stages as a DAG, checkpointing each one to disk.
+
+    A stage is skipped when its checkpoint records success with the same
+    input fingerprint (its own inputs plus its dependencies' fingerprints)
+    and its output files still exist. Stages whose dependencies are done
+    run concurrently.
+    """
+    run_id: str
+    stages: list
+    context: dict = field(default_factory=dict)
+    checkpoint_dir: Path = CHECKPOINT_DIR
+    max_workers: int = 4
+
+    def __post_init__(self):
+        self.by_name = {stage.name: stage for stage in self.stages}
+        for stage in self.stages:
+            missing = [dep for dep in stage.deps if dep not in self.by_name]
+            if missing:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages {missing}")
+        self.path = Path(self.checkpoint_dir) / self.run_id / "checkpoint.json"
+        self.checkpoint = self._load()
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if not self.path.exists():
+            return {}
+        with open(self.path) as f:
+            return json.load(f)
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_suffix(".partial")
+        with open(partial, "w") as f:
+            json.dump(self.checkpoint, f, indent=2, sort_keys=True)
+        partial.replace(self.path)
+
+    def _record(self, name: str, record: dict):
+        with self._lock:
+            self.checkpoint[name] = record
+            self._save()
+
+    def fingerprint(self, stage: Stage) -> str:
+        digest = hashlib.sha256()
+        for dep in stage.deps:
+            # Re-run when a dependency re-ran, even with identical inputs
+            # (reviews are not deterministic)
+            record = self.checkpoint.get(dep, {})
+            digest.update(record.get("fingerprint", "").encode())
+            digest.update(json.dumps(record.get("outputs", {}), sort_keys=True).encode())
+            digest.update(str(record.get("started_at", "")).encode())
+        for value in stage.inputs(self.context):
+            digest.update(_fingerprint_value(value).encode())
+        return digest.hexdigest()
+
+    def is_current(self, stage: Stage, fingerprint: str = None) -> bool:
+        """Whether a stage's checkpoint is done, up to date and its outputs exist."""
+        record = self.checkpoint.get(stage.name, {})
+        if record.get("status") != "done":
+            return False
+        if record.get("fingerprint") != (fingerprint or self.fingerprint(stage)):
+            return False
+        return all(Path(path).exists() for path in stage.outputs(self.context))
+
+    def order(self) -> list:
+        """Stage names in dependency order."""
+        ordered, seen = [], set()
+
+        def visit(name, path=()):
+            if name in seen:
+                return
+            if name in path:
+                raise ValueError(f"Dependency cycle through {name}")
+            for dep in self.by_name[name].deps:
+                visit(dep, path + (name,))
+            seen.add(name)
+            ordered.append(name)
+
+        for stage in self.stages:
+            visit(stage.name)
+        return ordered
+
+    def first_incomplete(self):
+        """The first stage (in dependency order) that would run, or None."""
+        for name in self.order():
+            stage = self.by_name[name]
+            if not self.is_current(stage):
+                return name
+            self.context[name] = self.checkpoint[name].get("outputs", {})
+        return None
+
+    def _execute(self, stage: Stage, fingerprint: str) -> dict:
+        started = time.time()
+        self._record(stage.name, {"status": "running", "fingerprint": fingerprint, "started_at": started})
+        outputs = stage.run(self.context) or {}
+        return {
+            "status": "done",
+            "fingerprint": fingerprint,
+            "outputs": outputs,
+            "started_at": started,
+            "duration_s": round(time.time() - started, 3),
+        }
+
+    def run(self, force: bool = False) -> dict:
+        """Run every stage that is not up to date; return {stage: status}."""
+        status = {}
+        pending = list(self.order())
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for name in list(pending):
+                    stage = self.by_name[name]
+                    dep_status = [status.get(dep) for dep in stage.deps]
+                    if any(s in ("failed", "blocked") for s in dep_status):
+                        status[name] = "blocked"
+                        pending.remove(name)
+                        print(f"[{name}] blocked by a failed dependency")
+                        continue
+                    if not all(s in ("done", "skipped") for s in dep_status):
+                        continue
+
+                    pending.remove(name)
+                    fingerprint = self.fingerprint(stage)
+                    if not force and self.is_current(stage, fingerprint):
+                        self.context[name] = self.checkpoint[name].get("outputs", {})
+                        status[name] = "skipped"
+                        print(f"[{name}] up to date, skipping")
+                        continue
+                    print(f"[{name}] running")
+                    running[executor.submit(self._execute, stage, fingerprint)] = (name, fingerprint)
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name, fingerprint = running.pop(future)
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        if not isinstance(e, StageError):
+                            traceback.print_exc()
+                        self._record(name, {"status": "failed", "fingerprint": fingerprint,
+                                            "error": f"{type(e).__name__}: {e}", "failed_at": time.time()})
+                        status[name] = "failed"
+                        print(f"[{name}] failed: {e}")
+                        continue
+                    self.context[name] = record["outputs"]
+                    self._record(name, record)
+                    status[name] = "done"
+                    print(f"[{name}] done in {record['duration_s']}s")
+
+        return status
@@ -0,0 +1,205 @@
+"""Opt-In CPU and Memory Profiling"""
+
+import atexit
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+PROFILE_ENV = "REVIEW_PROFILE"
+
+_active = None
+
+
+class _NullStage:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+# Leave the profiler's own bookkeeping out of the allocation reports
+_OWN_FILES = {tracemalloc.__file__, __file__}
+
+
+def stage(name: str, network: bool = False):
+    """Time a block as a named stage; a shared no-op when profiling is off.
+
+    ``network`` marks time spent waiting on a remote service, so it is
+    reported separately from local CPU.
+    """
+    if _active is None:
+        return _NULL_STAGE
+    return _active.stage(name, network)
+
+
+def requested(flag: bool = False) -> bool:
+    """Whether profiling was asked for by ``--profile`` or the environment."""
+    return flag or "--profile" in sys.argv[1:] or os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def profile_dir(submission_id: str = None) -> Path:
+    """Profiles go next to the submission's reviews."""
+    if submission_id:
+        return Path("reviews") / submission_id / "profile"
+    return Path("output") / "profiles"
+
+
+def enable(script: str, submission_id: str = None, flag: bool = False):
+    """Start profiling the rest of the process if requested; artifacts are written at exit."""
+    global _active
+    if _active is not None or not requested(flag):
+        return None
+    profiler = Profiler(script, profile_dir(submission_id))
+    profiler.start()
+    atexit.register(profiler.stop)
+    return profiler
+
+
+class _Sampler(threading.Thread):
+    """Samples every thread's stack, including threads blocked on the network."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == self.ident:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                frames.append(names.get(ident, "thread"))
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+def _own_stats(stats: list) -> list:
+    return [stat for stat in stats if stat.traceback[0].filename not in _OWN_FILES]
+
+
+class Profiler:
+    """cProfile for the main thread, a stack sampler for flamegraphs, and
+    tracemalloc snapshots diffed at the end of each stage."""
+
+    def __init__(self, script: str, output_dir: Path, interval: float = 0.005, top: int = 15):
+        self.script = script
+        self.output_dir = Path(output_dir)
+        self.top = top
+        self.stages = defaultdict(lambda: {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "wait_s": 0.0,
+                                           "network_s": 0.0, "alloc_kb": 0.0})
+        self.allocations = []
+        self._lock = threading.Lock()
+        self._sampler = _Sampler(interval)
+        self._cpu = cProfile.Profile()
+        self._stopped = False
+
+    def start(self):
+        global _active
+        tracemalloc.start(25)
+        self._started = time.perf_counter()
+        self._started_cpu = time.process_time()
+        self._sampler.start()
+        self._cpu.enable()
+        _active = self
+
+    @contextmanager
+    def stage(self, name: str, network: bool = False):
+        # Thread CPU time: the API call runs on its own thread, so process
+        # time would count other stages' work against it
+        snapshot = None if network else tracemalloc.take_snapshot()
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            diff = []
+            if snapshot is not None:
+                diff = _own_stats(tracemalloc.take_snapshot().compare_to(snapshot, "lineno"))
+            with self._lock:
+                totals = self.stages[name]
+                totals["calls"] += 1
+                totals["wall_s"] += wall
+                totals["cpu_s"] += cpu
+                totals["wait_s"] += max(wall - cpu, 0.0)
+                if network:
+                    totals["network_s"] += wall
+                if diff:
+                    totals["alloc_kb"] += sum(stat.size_diff for stat in diff) / 1024
+                    self.allocations.append((name, diff[:self.top]))
+
+    def stop(self) -> Path:
+        """Stop profiling and write the artifacts; returns the output directory."""
+        global _active
+        if self._stopped:
+            return self.output_dir
+        self._stopped = True
+        self._cpu.disable()
+        self._sampler.stop()
+        _active = None
+        wall = time.perf_counter() - self._started
+        cpu = time.process_time() - self._started_cpu
+        current, peak = tracemalloc.get_traced_memory()
+        final = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        prefix = self.output_dir / self.script
+
+        self._cpu.dump_stats(f"{prefix}.pstats")
+
+        with open(f"{prefix}.collapsed", "w") as f:
+            for stack, count in sorted(self._sampler.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+        with open(f"{prefix}-alloc.txt", "w") as f:
+            f.write(f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB\n\n")
+            f.write("Largest live allocation sites at exit:\n")
+            for stat in _own_stats(final.statistics("lineno"))[:self.top]:
+                f.write(f"  {stat}\n")
+            for name, diff in self.allocations:
+                f.write(f"\nStage {name}:\n")
+                for stat in diff:
+                    f.write(f"  {stat}\n")
+
+        stream = io.StringIO()
+        pstats.Stats(self._cpu, stream=stream).sort_stats("cumulative").print_stats(self.top)
+        summary = {
+            "script": self.script,
+            "wall_s": round(wall, 3),
+            "cpu_s": round(cpu, 3),
+            "network_s": round(sum(s["network_s"] for s in self.stages.values()), 3),
+            "peak_memory_mb": round(peak / 1024 / 1024, 1),
+            "stages": {name: {key: round(value, 3) for key, value in totals.items()}
+                       for name, totals in self.stages.items()},
+        }
+        with open(f"{prefix}-stages.json", "w") as f:
+            json.dump(summary, f, indent=2)
+        with open(f"{prefix}-top.txt", "w") as f:
+            f.write(stream.getvalue())
+
+        print(f"Profile: {wall:.1f}s wall, {cpu:.1f}s CPU, {summary['network_s']:.1f}s waiting on the network, "
+              f"{summary['peak_memory_mb']} MiB peak; written to {self.output_dir}/")
+        return self.output_dir
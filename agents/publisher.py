@@ -0,0 +1,344 @@
+"""Static Publication Builder"""
+
+import hashlib
+import json
+import re
+import subprocess
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+import yaml
+
+from .artifacts import load_manifest, submission_pdfs
+from .routing import REVIEW_AGENTS
+
+# Bump when the rendered page format changes so every paper is rebuilt
+FORMAT_VERSION = 1
+MANIFEST_PATH = Path("_data") / "publications.json"
+# Display names, as in _config.yml
+PAPER_TYPE_NAMES = {
+    "research": "Research Paper",
+    "technical": "Technical Report",
+    "survey": "Survey Article",
+    "preprint": "Preprint",
+}
+
+
+def slugify(title: str, limit: int = 60) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+    return slug[:limit].rstrip("-") or "paper"
+
+
+def _front_matter(fields: dict, body: str = "") -> str:
+    header = yaml.safe_dump(fields, default_flow_style=False, sort_keys=False, allow_unicode=True, width=1000)
+    return f"---\n{header}---\n{body}"
+
+
+def _as_text(item) -> str:
+    if isinstance(item, dict):
+        return " ".join(str(value) for value in item.values() if isinstance(value, (str, int, float)))
+    return str(item)
+
+
+def _bullets(items) -> str:
+    return "\n".join(f"- {_as_text(item).strip()}" for item in items or [])
+
+
+class Publisher:
+    """Renders accepted submissions into the Jekyll tree.
+
+    Each submission's source files (metadata, PDF manifest, reviews,
+    meta-review) are hashed; the hashes are kept in ``_data/publications.json``
+    with each published paper's listing entry, so a build only re-reads
+    submissions whose sources changed and only rewrites the index pages that
+    list them. Writes are
+    collected in ``written`` so they can be committed together.
+    """
+
+    def __init__(self, config: dict, root: Path = Path(".")):
+        publishing = config.get("publishing", {})
+        self.root = Path(root)
+        self.include_reviews = publishing.get("include_reviews", True)
+        self.license = publishing.get("license", "CC-BY-4.0")
+        self.latest = publishing.get("latest_papers", 20)
+        self.submissions_dir = self.root / "submissions"
+        self.reviews_dir = self.root / "reviews"
+        self.manifest = self._load_manifest()
+        self.written = []
+        self.removed = []
+
+    def _load_manifest(self) -> dict:
+        path = self.root / MANIFEST_PATH
+        if path.exists():
+            with open(path) as f:
+                manifest = json.load(f)
+            if manifest.get("format") == FORMAT_VERSION:
+                return manifest
+            # Keep publication dates across a format change
+            return {"format": FORMAT_VERSION, "checked": {}, "papers": {
+                submission_id: {"date": paper["date"]}
+                for submission_id, paper in manifest.get("papers", {}).items()
+            }}
+        return {"format": FORMAT_VERSION, "checked": {}, "papers": {}}
+
+    def _sources(self, submission_id: str) -> list:
+        submission_dir = self.submissions_dir / submission_id
+        review_dir = self.reviews_dir / submission_id
+        paths = [submission_dir / "metadata.yaml", submission_dir / "manifest.yaml", review_dir / "meta-review.yaml"]
+        paths += [review_dir / f"{agent}.yaml" for agent in REVIEW_AGENTS]
+        return [path for path in paths if path.exists()]
+
+    def source_hash(self, submission_id: str) -> str:
+        digest = hashlib.sha256(f"format:{FORMAT_VERSION}".encode())
+        for path in self._sources(submission_id):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+    def decision(self, submission_id: str) -> str:
+        path = self.reviews_dir / submission_id / "meta-review.yaml"
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return (yaml.safe_load(f) or {}).get("decision")
+
+    def build(self, submission_ids: list = None, rebuild: bool = False) -> dict:
+        """Publish accepted papers; ``submission_ids`` limits which are checked
+        and ``rebuild`` re-renders them even if their sources are unchanged.
+
+        Returns counts of papers rendered, unchanged and withdrawn.
+        """
+        papers = self.manifest["papers"]
+        if submission_ids is None:
+            submission_ids = sorted({path.parent.name for path in self.reviews_dir.glob("*/meta-review.yaml")}
+                                    | set(papers))
+        checked = self.manifest["checked"]
+        stats = Counter()
+        touched_years = set()
+        for submission_id in submission_ids:
+            source_hash = self.source_hash(submission_id)
+            if not rebuild and checked.get(submission_id) == source_hash:
+                stats["unchanged"] += 1
+                continue
+            checked[submission_id] = source_hash
+
+            previous = papers.get(submission_id)
+            if self.decision(submission_id) != "accept":
+                if previous and previous.get("path"):
+                    # No longer accepted: take the page down
+                    self._remove(previous["path"])
+                    touched_years.add(previous["date"][:4])
+                    del papers[submission_id]
+                    stats["withdrawn"] += 1
+                continue
+
+            published = (previous or {}).get("date") or date.today().isoformat()
+            entry = self._render_paper(submission_id, published)
+            if previous and previous.get("path") and previous["path"] != entry["path"]:
+                self._remove(previous["path"])
+            papers[submission_id] = entry
+            touched_years.add(published[:4])
+            stats["rendered"] += 1
+
+        if stats["rendered"] or stats["withdrawn"]:
+            for year in sorted(touched_years):
+                self._render_year(year)
+            self._render_index()
+            self._render_feed()
+            self._write(MANIFEST_PATH, json.dumps(self.manifest, indent=1, sort_keys=True) + "\n")
+        stats["pages_written"] = len(self.written)
+        return dict(stats)
+
+    def _write(self, relative: Path, content: str) -> bool:
+        """Write a file if its content changed."""
+        path = self.root / relative
+        if path.exists() and path.read_text() == content:
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + ".partial")
+        partial.write_text(content)
+        partial.replace(path)
+        self.written.append(Path(relative))
+        return True
+
+    def _remove(self, relative: str):
+        path = self.root / relative
+        if path.exists():
+            path.unlink()
+            self.removed.append(Path(relative))
+
+    def _render_paper(self, submission_id: str, published: str) -> dict:
+        with open(self.submissions_dir / submission_id / "metadata.yaml") as f:
+            metadata = yaml.safe_load(f) or {}
+        with open(self.reviews_dir / submission_id / "meta-review.yaml") as f:
+            meta_review = yaml.safe_load(f) or {}
+
+        title = metadata.get("title", submission_id)
+        slug = slugify(title)
+        fields = {
+            "layout": "paper",
+            "title": title,
+            "date": published,
+            "submission_id": submission_id,
+            "paper_type": PAPER_TYPE_NAMES.get(metadata.get("paper_type"), metadata.get("paper_type")),
+            # Emails stay private
+            "authors": [{key: author[key] for key in ("name", "affiliation") if author.get(key)}
+                        for author in metadata.get("authors", [])],
+            "abstract": " ".join(str(metadata.get("abstract", "")).split()),
+            "keywords": metadata.get("keywords", []),
+            "license": self.license,
+        }
+        pdf = self._pdf_link(submission_id)
+        if pdf:
+            fields["pdf"] = pdf
+        for key in ("code_url", "data_url", "doi"):
+            if metadata.get(key):
+                fields[key] = metadata[key]
+
+        scores = {}
+        if self.include_reviews:
+            fields["reviews"] = []
+            for agent in REVIEW_AGENTS:
+                path = self.reviews_dir / submission_id / f"{agent}.yaml"
+                if not path.exists():
+                    continue
+                with open(path) as f:
+                    review = yaml.safe_load(f) or {}
+                if review.get("parse_error"):
+                    continue
+                evaluation = review.get("evaluation", {}) or {}
+                score = (review.get("scores") or {}).get("overall")
+                scores[agent] = score
+                fields["reviews"].append({
+                    "agent": agent,
+                    "score": score,
+                    "strengths": "; ".join(_as_text(item) for item in evaluation.get("strengths") or []),
+                    "weaknesses": "; ".join(_as_text(item) for item in evaluation.get("weaknesses") or []),
+                    "recommendation": review.get("recommendation", ""),
+                })
+
+        body = ["## Editorial Decision", "", f"**Decision:** {meta_review.get('decision', 'accept')}"]
+        weighted = (meta_review.get("synthesis") or {}).get("weighted_average")
+        if weighted is not None:
+            body.append(f"**Weighted review score:** {weighted}/5")
+        if meta_review.get("rationale"):
+            body += ["", str(meta_review["rationale"]).strip()]
+        synthesis = meta_review.get("synthesis") or {}
+        if synthesis.get("consensus_strengths"):
+            body += ["", "### Reviewer Consensus: Strengths", "", _bullets(synthesis["consensus_strengths"])]
+        if synthesis.get("consensus_concerns"):
+            body += ["", "### Reviewer Consensus: Concerns", "", _bullets(synthesis["consensus_concerns"])]
+
+        path = Path("_posts") / f"{published}-{slug}.md"
+        self._write(path, _front_matter(fields, "\n".join(body) + "\n"))
+        return {
+            "title": title,
+            "date": published,
+            "path": str(path),
+            "url": f"/papers/{published[:4]}/{slug}/",
+            "authors": [author["name"] for author in fields["authors"] if author.get("name")],
+            "paper_type": metadata.get("paper_type"),
+            "abstract": fields["abstract"][:300],
+            "score": weighted,
+        }
+
+    def _pdf_link(self, submission_id: str) -> str:
+        """Link the latest PDF version by its content address."""
+        submission_dir = self.submissions_dir / submission_id
+        pdfs = submission_pdfs(submission_dir)
+        if not pdfs:
+            return None
+        entry = load_manifest(submission_dir).get("files", {}).get(pdfs[-1])
+        if entry:
+            digest = entry["sha256"]
+            return f"/artifacts/sha256/{digest[:2]}/{digest}"
+        return f"/submissions/{submission_id}/{pdfs[-1]}"
+
+    def _listed(self, year: str = None) -> list:
+        papers = [paper for paper in self.manifest["papers"].values()
+                  if paper.get("path") and (year is None or paper["date"].startswith(year))]
+        return sorted(papers, key=lambda paper: (paper["date"], paper["title"]), reverse=True)
+
+    def _listing(self, papers: list) -> str:
+        lines = []
+        for paper in papers:
+            authors = ", ".join(paper["authors"][:3]) + (" et al." if len(paper["authors"]) > 3 else "")
+            lines.append(f"- [{paper['title']}]({{{{ '{paper['url']}' | relative_url }}}}) — "
+                         f"{authors} ({paper['date']})")
+        return "\n".join(lines)
+
+    def _render_year(self, year: str):
+        papers = self._listed(year)
+        path = Path("papers") / year / "index.md"
+        if not papers:
+            self._remove(str(path))
+            return
+        body = f"\nPapers published in {year}: {len(papers)}\n\n{self._listing(papers)}\n"
+        self._write(path, _front_matter({"layout": "page", "title": f"Papers from {year}"}, body))
+
+    def _render_index(self):
+        papers = self._listed()
+        decided = sum(1 for _ in self.reviews_dir.glob("*/meta-review.yaml"))
+        under_review = sum(1 for path in self.submissions_dir.iterdir()
+                           if path.is_dir() and path.name != "SUBMISSION_TEMPLATE"
+                           and not (self.reviews_dir / path.name / "meta-review.yaml").exists())
+        rate = f"{len(papers) / decided:.0%}" if decided else "N/A"
+        by_type = Counter(paper.get("paper_type") or "other" for paper in papers)
+        years = Counter(paper["date"][:4] for paper in papers)
+
+        body = [
+            "",
+            "## Accepted Publications",
+            "",
+            "All papers have completed our multi-agent review process. Full reviews are published alongside "
+            "each paper for transparency.",
+            "",
+            "| Status | Count |",
+            "|--------|-------|",
+            f"| Published | {len(papers)} |",
+            f"| Under Review | {under_review} |",
+            f"| Acceptance Rate | {rate} |",
+            "",
+            "---",
+            "",
+            "## Latest Papers",
+            "",
+            self._listing(papers[:self.latest]) or "*Accepted papers will appear here.*",
+        ]
+        if years:
+            body += ["", "## Archive", "", "| Year | Papers |", "|------|--------|"]
+            body += [f"| [{year}]({{{{ '/papers/{year}/' | relative_url }}}}) | {count} |"
+                     for year, count in sorted(years.items(), reverse=True)]
+        if by_type:
+            body += ["", "## By Paper Type", "", "| Type | Papers |", "|------|--------|"]
+            body += [f"| {PAPER_TYPE_NAMES.get(paper_type, paper_type)} | {count} |"
+                     for paper_type, count in sorted(by_type.items())]
+        body += ["", "---", "", "## Submit Your Research", "",
+                 "We welcome submissions across AI/ML research domains.", "",
+                 "[Submit a Paper →](/agentic-journal/submit/)", ""]
+        fields = {"layout": "page", "title": "Published Papers",
+                  "subtitle": "Peer-reviewed research with full agentic reviews"}
+        self._write(Path("papers") / "index.md", _front_matter(fields, "\n".join(body)))
+
+    def _render_feed(self):
+        """JSON Feed of the latest papers (jekyll-feed covers Atom from _posts)."""
+        items = [{
+            "id": paper["url"],
+            "url": paper["url"],
+            "title": paper["title"],
+            "summary": paper["abstract"],
+            "date_published": paper["date"],
+            "authors": [{"name": name} for name in paper["authors"]],
+        } for paper in self._listed()[:self.latest]]
+        feed = {"version": "https://jsonfeed.org/version/1.1", "title": "Agentic Journal", "items": items}
+        self._write(Path("papers") / "feed.json", json.dumps(feed, indent=2, ensure_ascii=False) + "\n")
+
+    def commit(self, message: str) -> bool:
+        """Commit every written and removed file in one commit."""
+        paths = [str(path) for path in self.written + self.removed]
+        if not paths:
+            return False
+        subprocess.run(["git", "add", "-A", "--", *paths], cwd=self.root, check=True)
+        subprocess.run(["git", "commit", "-q", "-m", message], cwd=self.root, check=True)
+        return True
@@ -0,0 +1,193 @@
+"""Shared Config and Prompt Registry"""
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+# Structural schema for config.yaml; keys not listed here are free-form
+CONFIG_SCHEMA = {
+    "type": "object",
+    "required": ["journal", "rate_limits", "review", "screening", "paper_types"],
+    "properties": {
+        "journal": {
+            "type": "object",
+            "required": ["name", "submission_prefix", "year"],
+        },
+        "rate_limits": {
+            "type": "object",
+            "properties": {
+                "daily_reviews": {"type": "integer", "minimum": 0},
+                "daily_token_budget": {"type": "integer", "minimum": 0},
+                "daily_cost_budget": {"type": "number", "minimum": 0},
+            },
+        },
+        "review": {
+            "type": "object",
+            "required": ["model", "max_tokens", "temperature", "thresholds"],
+            "properties": {
+                "model": {"type": "string"},
+                "max_tokens": {"type": "integer", "minimum": 1},
+                "temperature": {"type": "number", "minimum": 0, "maximum": 1},
+                "extended_thinking": {"type": "object"},
+                "agents": {
+                    "type": "object",
+                    "additionalProperties": {
+                        "type": "object",
+                        "properties": {
+                            "enabled": {"type": "boolean"},
+                            "weight": {"type": "number", "minimum": 0},
+                            "model": {"type": "string"},
+                            "budget_tokens": {"type": "integer", "minimum": 0},
+                            "max_tokens": {"type": "integer", "minimum": 1},
+                        },
+                    },
+                },
+                "thresholds": {
+                    "type": "object",
+                    "required": ["accept", "minor_revision", "major_revision"],
+                    "additionalProperties": {"type": "number"},
+                },
+            },
+        },
+        "screening": {
+            "type": "object",
+            "required": ["min_pages", "max_pages", "min_abstract_words", "max_abstract_words"],
+        },
+        "paper_types": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "object",
+                "required": ["review_type"],
+            },
+        },
+    },
+}
+
+
+class ConfigError(ValueError):
+    """Raised when config.yaml does not match the schema."""
+
+
+@dataclass(frozen=True)
+class AgentSettings:
+    name: str
+    enabled: bool
+    weight: float
+    model: str
+    budget_tokens: int
+    max_tokens: int
+    dimensions: list = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class ReviewSettings:
+    model: str
+    max_tokens: int
+    temperature: float
+    thinking_enabled: bool
+    thinking_budget: int
+    thresholds: dict
+    agents: dict
+
+    @classmethod
+    def from_config(cls, config: dict) -> "ReviewSettings":
+        review = config["review"]
+        thinking = review.get("extended_thinking", {})
+        agents = {
+            name: AgentSettings(
+                name=name,
+                enabled=agent.get("enabled", True),
+                weight=agent.get("weight", 1.0),
+                model=agent.get("model", review["model"]),
+                budget_tokens=agent.get("budget_tokens", thinking.get("budget_tokens", 10000)),
+                max_tokens=agent.get("max_tokens", review["max_tokens"]),
+                dimensions=agent.get("dimensions", []),
+            )
+            for name, agent in review.get("agents", {}).items()
+        }
+        return cls(
+            model=review["model"],
+            max_tokens=review["max_tokens"],
+            temperature=review["temperature"],
+            thinking_enabled=thinking.get("enabled", False),
+            thinking_budget=thinking.get("budget_tokens", 10000),
+            thresholds=review["thresholds"],
+            agents=agents,
+        )
+
+
+_lock = threading.Lock()
+_configs = {}  # resolved path -> (mtime, config)
+_prompts = {}  # resolved path -> (mtime, text)
+
+
+def validate_config(config: dict):
+    """Validate a parsed config against CONFIG_SCHEMA."""
+    try:
+        import jsonschema
+    except ImportError:
+        # Fallback: check required top-level and review keys only
+        if not isinstance(config, dict):
+            raise ConfigError("config must be a mapping")
+        for key in CONFIG_SCHEMA["required"]:
+            if key not in config:
+                raise ConfigError(f"missing required section: {key}")
+        for key in CONFIG_SCHEMA["properties"]["review"]["required"]:
+            if key not in config["review"]:
+                raise ConfigError(f"missing required key: review.{key}")
+        return
+
+    try:
+        jsonschema.validate(config, CONFIG_SCHEMA)
+    except jsonschema.ValidationError as e:
+        location = ".".join(str(part) for part in e.absolute_path) or "config"
+        raise ConfigError(f"{location}: {e.message}") from None
+
+
+def get_config(path: str = "config.yaml") -> dict:
+    """Return the parsed, validated config, re-parsing only when the file changes.
+
+    The returned dict is shared across the process and must not be mutated.
+    """
+    resolved = Path(path).resolve()
+    mtime = resolved.stat().st_mtime_ns
+    with _lock:
+        cached = _configs.get(resolved)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with open(resolved) as f:
+            config = yaml.safe_load(f)
+        validate_config(config)
+        _configs[resolved] = (mtime, config)
+        return config
+
+
+def get_settings(path: str = "config.yaml") -> ReviewSettings:
+    """Return typed review settings for a config file."""
+    return ReviewSettings.from_config(get_config(path))
+
+
+def get_prompt(path: Path):
+    """Return a prompt file's text, cached by mtime, or None if it does not exist."""
+    resolved = Path(path).resolve()
+    try:
+        mtime = resolved.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    with _lock:
+        cached = _prompts.get(resolved)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        text = resolved.read_text()
+        _prompts[resolved] = (mtime, text)
+        return text
+
+
+def clear():
+    """Drop all cached configs and prompts."""
+    with _lock:
+        _configs.clear()
+        _prompts.clear()
@@ -0,0 +1,446 @@
+"""Related-Work Retrieval Index"""
+
+import heapq
+import json
+import math
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import yaml
+
+from .artifacts import MANIFEST_NAME, load_manifest, resolve_pdf, submission_pdfs
+from .extraction import extract_text, file_digest, text_cache_path
+from .registry import get_config
+from .sandbox import ExtractionError, ExtractionLimits
+
+INDEX_PATH = Path("output") / "cache" / "related-work" / "index.json"
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9]+")
+STOPWORDS = frozenset("""
+    a about above after again against all also an and any are as at be because been before being
+    below between both but by can could did do does doing down during each few for from further had
+    has have having here how however if in into is it its itself just more most no nor not of off on
+    once only or other our out over own same should so some such than that the their them then there
+    these they this those through to too under until up using very was we were what when where which
+    while who whom why will with would you your et al paper work results show use used
+""".split())
+
+REFERENCES_HEADING = re.compile(r"^\s*(?:\d+\.?\s*)?(references|bibliography|works cited)\s*$",
+                                re.IGNORECASE | re.MULTILINE)
+# "[12] ...", "12. ..." or "12 ..." at the start of a line opens a reference entry
+REFERENCE_START = re.compile(r"^\s*(?:\[\d+\]|\d{1,3}\.?\s)")
+REFERENCE_YEAR = re.compile(r"\b(?:19|20)\d{2}[a-z]?\b")
+# Sections that follow the reference list: "Appendix A", "Supplementary
+# Material", or lettered headings such as "A Proofs" / "B.2 Ablations"
+APPENDIX_HEADING = re.compile(r"^\s*(?:appendix|appendices|supplementary|supplemental)\b", re.IGNORECASE)
+LETTERED_HEADING = re.compile(r"^\s*[A-H](?:\.\d+)*\.?\s+[A-Z][^,]{2,60}$")
+
+
+def tokenize(text: str) -> list:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _is_appendix_heading(line: str) -> bool:
+    if APPENDIX_HEADING.match(line):
+        return True
+    return bool(LETTERED_HEADING.match(line)) and not REFERENCE_YEAR.search(line)
+
+
+def _references_length(section: str) -> int:
+    """Length of the reference list at the start of ``section``.
+
+    The list ends at an appendix heading, or at a paragraph with neither an
+    entry number nor a year in it, so appendices after the references are
+    not mistaken for entries.
+    """
+    lines = section.splitlines(keepends=True)
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+
+    index = 0
+    while index < len(lines):
+        if not lines[index].strip():
+            index += 1
+            continue
+        end = index
+        while end < len(lines) and lines[end].strip():
+            if _is_appendix_heading(lines[end]):
+                return offsets[end]
+            end += 1
+        paragraph = lines[index:end]
+        if not any(REFERENCE_START.match(line) for line in paragraph) \
+                and not REFERENCE_YEAR.search(" ".join(paragraph)):
+            return offsets[index]
+        index = end
+    return len(section)
+
+
+def find_references(text: str):
+    """Return (heading start, list start, list end) offsets of the reference
+    list, or None if the text has no references heading."""
+    matches = list(REFERENCES_HEADING.finditer(text))
+    if not matches:
+        return None
+    heading = matches[-1]
+    return heading.start(), heading.end(), heading.end() + _references_length(text[heading.end():])
+
+
+def split_references(text: str) -> tuple[str, str]:
+    """Split paper text into (body, references section); the latter may be empty.
+
+    Anything after the reference list (appendices) stays in the body.
+    """
+    span = find_references(text)
+    if span is None:
+        return text, ""
+    start, list_start, list_end = span
+    body, rest = text[:start].rstrip(), text[list_end:].strip()
+    return (f"{body}\n\n{rest}" if rest else body), text[list_start:list_end].strip()
+
+
+def parse_references(section: str, max_references: int = 80) -> list:
+    """Split a references section into one string per entry."""
+    entries = []
+    current = []
+    for line in section.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if REFERENCE_START.match(line) and current:
+            entries.append(" ".join(current))
+            current = []
+        current.append(line)
+    if current:
+        entries.append(" ".join(current))
+    if len(entries) <= 1:
+        # Unnumbered style: fall back to one entry per line
+        entries = [line.strip() for line in section.splitlines() if line.strip()]
+    return entries[:max_references]
+
+
+def _first_sentences(text: str, limit: int) -> str:
+    text = " ".join((text or "").split())
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(". ", 0, limit)
+    return text[:cut + 1] if cut > limit // 2 else text[:limit].rstrip() + "..."
+
+
+class RelatedWorkIndex:
+    """Incremental BM25 inverted index over the journal's own papers.
+
+    Each paper is indexed from its title, keywords, abstract, the start of
+    its extracted text and its parsed reference list. Papers are re-read
+    only when their metadata, manifest or PDF files change on disk.
+    """
+
+    def __init__(self, config: dict, path: Path = None):
+        related_work = config.get("related_work", {})
+        self.enabled = related_work.get("enabled", False)
+        self.agents = set(related_work.get("agents", ["domain"]))
+        self.roots = [Path(root) for root in related_work.get("roots", ["submissions", "publications", "preprints"])]
+        self.top_k = related_work.get("top_k", 5)
+        self.max_query_terms = related_work.get("max_query_terms", 32)
+        self.k1 = related_work.get("k1", 1.5)
+        self.b = related_work.get("b", 0.75)
+        self.title_weight = related_work.get("title_weight", 3)
+        self.max_body_terms = related_work.get("max_body_terms", 3000)
+        self.max_doc_terms = related_work.get("max_doc_terms", 400)
+        self.max_references = related_work.get("max_references", 80)
+        self.reference_chars = related_work.get("reference_chars", 160)
+        self.summary_chars = related_work.get("summary_chars", 300)
+        self.refresh_seconds = related_work.get("refresh_seconds", 300)
+        self.path = Path(path or related_work.get("index_path", INDEX_PATH))
+
+        self.docs = {}
+        self.postings = {}
+        self.total_length = 0
+        self.mtime = None
+        self.refreshed_at = None
+        self._lock = threading.RLock()
+        self.load()
+
+    def applies_to(self, agent: str) -> bool:
+        return self.enabled and agent in self.agents
+
+    def load(self):
+        if not self.path.exists():
+            return
+        self.mtime = self.path.stat().st_mtime_ns
+        # A freshly (re)built index file counts as a refresh
+        self.refreshed_at = self.mtime / 1e9
+        with open(self.path) as f:
+            self.docs = json.load(f).get("docs", {})
+        # Postings are derived from per-document term counts on load
+        for doc_id, doc in self.docs.items():
+            self._post(doc_id, doc)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_suffix(".partial")
+        with open(partial, "w") as f:
+            json.dump({"docs": self.docs}, f, separators=(",", ":"))
+        partial.replace(self.path)
+        self.mtime = self.path.stat().st_mtime_ns
+
+    def _post(self, doc_id: str, doc: dict):
+        for term, count in doc["terms"].items():
+            self.postings.setdefault(term, {})[doc_id] = count
+        self.total_length += doc["length"]
+
+    def _unpost(self, doc_id: str):
+        doc = self.docs.pop(doc_id)
+        for term in doc["terms"]:
+            postings = self.postings.get(term, {})
+            postings.pop(doc_id, None)
+            if not postings:
+                self.postings.pop(term, None)
+        self.total_length -= doc["length"]
+
+    def add(self, doc_id: str, fingerprint: str, metadata: dict, text: str = "", digest: str = None):
+        """Index (or re-index) one paper; ``digest`` names its PDF in the text cache."""
+        if doc_id in self.docs:
+            self._unpost(doc_id)
+
+        body, references_section = split_references(text or "")
+        references = parse_references(references_section, self.max_references)
+        terms = Counter()
+        for _ in range(self.title_weight):
+            terms.update(tokenize(metadata.get("title", "")))
+        terms.update(tokenize(" ".join(metadata.get("keywords", []) or [])))
+        terms.update(tokenize(metadata.get("abstract", "") or ""))
+        terms.update(tokenize(body)[:self.max_body_terms])
+        terms.update(tokenize(" ".join(references)))
+
+        # Keep each paper's most frequent terms: the long tail of single
+        # mentions adds little to ranking but dominates index size
+        length = sum(terms.values())
+        terms = dict(terms.most_common(self.max_doc_terms))
+
+        authors = metadata.get("authors", []) or []
+        doc = {
+            "fingerprint": fingerprint,
+            "digest": digest,
+            "has_text": bool(text),
+            "title": metadata.get("title", "Untitled"),
+            "authors": [a.get("name", "") if isinstance(a, dict) else str(a) for a in authors],
+            "year": metadata.get("year"),
+            "summary": _first_sentences(metadata.get("abstract", "") or body, self.summary_chars),
+            "length": length,
+            "terms": terms,
+        }
+        self.docs[doc_id] = doc
+        self._post(doc_id, doc)
+
+    def update(self, extract: bool = False) -> dict:
+        """Bring the index up to date with the corpus roots.
+
+        Unchanged papers are skipped from a cheap fingerprint. Text comes from
+        the extraction cache; with ``extract`` missing text is extracted too.
+        """
+        with self._lock:
+            return self._update(extract)
+
+    def refresh(self):
+        """Update the index unless it was built or updated within
+        ``refresh_seconds``; returns the update stats or None if skipped."""
+        with self._lock:
+            if self.refreshed_at is not None and time.time() - self.refreshed_at < self.refresh_seconds:
+                return None
+            return self._update(False)
+
+    def _update(self, extract: bool) -> dict:
+        seen = set()
+        added = 0
+        for doc_id, fingerprint, loader in self._sources():
+            seen.add(doc_id)
+            if self.docs.get(doc_id, {}).get("fingerprint") == fingerprint and not self._text_arrived(doc_id, extract):
+                continue
+            metadata, text, digest = loader(extract)
+            self.add(doc_id, fingerprint, metadata, text, digest)
+            added += 1
+
+        removed = [doc_id for doc_id in self.docs if doc_id not in seen]
+        for doc_id in removed:
+            self._unpost(doc_id)
+        if added or removed:
+            self.save()
+        self.refreshed_at = time.time()
+        return {"documents": len(self.docs), "added": added, "removed": len(removed)}
+
+    def _text_arrived(self, doc_id: str, extract: bool) -> bool:
+        """Whether a paper indexed without text can now be indexed with it."""
+        doc = self.docs[doc_id]
+        if doc["has_text"] or not doc.get("digest"):
+            return False
+        return extract or text_cache_path(doc["digest"]).exists()
+
+    def _sources(self):
+        """Yield (doc id, fingerprint, loader) for every paper under the roots."""
+        for root in self.roots:
+            if not root.is_dir():
+                continue
+            for entry in sorted(root.iterdir()):
+                if entry.name.startswith('.') or entry.name == 'SUBMISSION_TEMPLATE':
+                    continue
+                metadata_path = entry / "metadata.yaml"
+                if entry.is_dir() and metadata_path.exists():
+                    yield str(entry), self._fingerprint(metadata_path, entry), self._paper_loader(entry)
+                elif entry.suffix == ".md" and entry.stem != "index":
+                    yield str(entry), self._fingerprint(entry), self._markdown_loader(entry)
+
+    @staticmethod
+    def _fingerprint(path: Path, paper_dir: Path = None) -> str:
+        """Sizes and mtimes of the files a paper is indexed from.
+
+        Only stat calls: manifests are parsed when a paper is (re)loaded,
+        not to decide whether it changed.
+        """
+        files = [path]
+        if paper_dir is not None:
+            files += [paper_dir / MANIFEST_NAME, *paper_dir.glob("*.pdf"), *paper_dir.glob("revisions/*.pdf")]
+        parts = []
+        for file in files:
+            if file.exists():
+                stat = file.stat()
+                parts.append(f"{file.name}:{stat.st_mtime_ns}:{stat.st_size}")
+        return "|".join(parts)
+
+    def _paper_loader(self, paper_dir: Path):
+        def load(extract: bool):
+            with open(paper_dir / "metadata.yaml") as f:
+                metadata = yaml.safe_load(f) or {}
+            return (metadata, *self._paper_text(paper_dir, extract))
+        return load
+
+    @staticmethod
+    def _paper_text(paper_dir: Path, extract: bool) -> tuple[str, str]:
+        """Return (text, PDF digest) for the latest PDF, from the text cache if possible."""
+        pdfs = submission_pdfs(paper_dir)
+        if not pdfs:
+            return "", None
+        entry = load_manifest(paper_dir).get("files", {}).get(pdfs[-1])
+        if entry is not None:
+            digest = entry["sha256"]
+        elif (paper_dir / pdfs[-1]).exists():
+            digest = file_digest(paper_dir / pdfs[-1])
+        else:
+            return "", None
+        cache_path = text_cache_path(digest)
+        if cache_path.exists():
+            return cache_path.read_text(encoding="utf-8"), digest
+        if not extract:
+            return "", digest
+        try:
+            text = extract_text(resolve_pdf(paper_dir), limits=ExtractionLimits.from_config(get_config()))
+            return text, digest
+        except (ImportError, ExtractionError, FileNotFoundError) as e:
+            print(f"Indexing {paper_dir} without text: {e}")
+            return "", digest
+
+    @staticmethod
+    def _markdown_loader(path: Path):
+        def load(extract: bool):
+            text = path.read_text(encoding="utf-8")
+            metadata = {}
+            if text.startswith("---"):
+                # Unterminated or malformed front matter: index the file as plain text
+                parts = text.split("---", 2)
+                try:
+                    front_matter = yaml.safe_load(parts[1]) if len(parts) == 3 else None
+                except yaml.YAMLError:
+                    front_matter = None
+                if isinstance(front_matter, dict):
+                    metadata, text = front_matter, parts[2]
+                else:
+                    print(f"Indexing {path} without front matter")
+            metadata.setdefault("title", path.stem)
+            return metadata, text, None
+        return load
+
+    def search(self, query: str, k: int = None, exclude: set = ()) -> list:
+        """Return the top-k (doc id, BM25 score) pairs for a query."""
+        k = k or self.top_k
+        with self._lock:
+            return self._search(query, k, exclude)
+
+    def _search(self, query: str, k: int, exclude: set) -> list:
+        if not self.docs:
+            return []
+        n = len(self.docs)
+        average_length = self.total_length / n or 1
+        # Only the rarest query terms are scored: common terms carry little
+        # weight but have the longest postings lists
+        terms = [term for term in set(tokenize(query)) if term in self.postings]
+        terms = sorted(terms, key=lambda term: len(self.postings[term]))[:self.max_query_terms]
+        scores = {}
+        for term in terms:
+            postings = self.postings[term]
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                length = self.docs[doc_id]["length"]
+                norm = tf + self.k1 * (1 - self.b + self.b * length / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+        candidates = ((score, doc_id) for doc_id, score in scores.items() if doc_id not in exclude)
+        return [(doc_id, round(score, 3)) for score, doc_id in heapq.nlargest(k, candidates)]
+
+    def related(self, metadata: dict, exclude: set = ()) -> list:
+        """Top-k related papers for a submission, as compact records."""
+        query = " ".join([
+            metadata.get("title", ""),
+            " ".join(metadata.get("keywords", []) or []),
+            metadata.get("abstract", "") or "",
+        ])
+        results = []
+        for doc_id, score in self.search(query, exclude=exclude):
+            doc = self.docs[doc_id]
+            results.append({
+                "id": doc_id,
+                "title": doc["title"],
+                "authors": doc["authors"],
+                "year": doc["year"],
+                "summary": doc["summary"],
+                "score": score,
+            })
+        return results
+
+    def format_related(self, related: list) -> str:
+        """Render related papers as a compact prompt section."""
+        lines = []
+        for number, paper in enumerate(related, 1):
+            authors = ", ".join(paper["authors"][:3]) + (" et al." if len(paper["authors"]) > 3 else "")
+            year = f", {paper['year']}" if paper.get("year") else ""
+            lines.append(f"{number}. {paper['title']} ({authors or 'unknown authors'}{year}) "
+                         f"[{paper['id']}]\n   {paper['summary']}")
+        return "\n".join(lines)
+
+    def format_references(self, references_section: str) -> str:
+        """Render a paper's own reference list compactly, one truncated line each."""
+        lines = []
+        for entry in parse_references(references_section, self.max_references):
+            entry = " ".join(entry.split())
+            if len(entry) > self.reference_chars:
+                entry = entry[:self.reference_chars].rstrip() + "..."
+            lines.append(f"- {entry}")
+        return "\n".join(lines)
+
+
+_lock = threading.Lock()
+_indexes = {}  # resolved index path -> index
+
+
+def get_index(config: dict) -> RelatedWorkIndex:
+    """Return a shared index, reloaded only when the index file changes."""
+    path = Path(config.get("related_work", {}).get("index_path", INDEX_PATH)).resolve()
+    mtime = path.stat().st_mtime_ns if path.exists() else None
+    with _lock:
+        index = _indexes.get(path)
+        # The index's own saves keep its mtime current, so only outside
+        # rebuilds trigger a reload
+        if index is None or index.mtime != mtime:
+            index = _indexes[path] = RelatedWorkIndex(config, path)
+        return index
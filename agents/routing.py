@@ -0,0 +1,51 @@
+"""Paper-Type Review Routing"""
+
+from pathlib import Path
+
+import yaml
+
+# Agents that review the paper itself (the meta-reviewer synthesizes them)
+REVIEW_AGENTS = ["technical", "domain", "ethics", "clarity", "screening"]
+
+DEFAULT_REVIEW_TYPE = "full"
+
+
+class ReviewRouter:
+    """Builds the agent set and meta-review weights for a submission from config."""
+
+    def __init__(self, config: dict):
+        self.paper_types = config.get("paper_types", {})
+        self.review_types = config.get("review_types", {})
+        self.agents = config["review"].get("agents", {})
+
+    def review_type(self, metadata: dict) -> str:
+        """Return the review type configured for a submission's paper type."""
+        paper_type = self.paper_types.get(metadata.get("paper_type", "research"), {})
+        return paper_type.get("review_type", DEFAULT_REVIEW_TYPE)
+
+    def agents_for(self, metadata: dict) -> list:
+        """Return the enabled agents that should review a submission, in order."""
+        review_type = self.review_types.get(self.review_type(metadata), {})
+        candidates = review_type.get("agents", ["technical", "domain", "ethics", "clarity"])
+        return [
+            agent for agent in candidates
+            if agent in REVIEW_AGENTS and self.agents.get(agent, {}).get("enabled", True)
+        ]
+
+    def weights_for(self, metadata: dict) -> dict:
+        """Return meta-review weights for the agents routed to a submission."""
+        return {agent: self.agents.get(agent, {}).get("weight", 1.0) for agent in self.agents_for(metadata)}
+
+    def needs_meta_review(self, metadata: dict) -> bool:
+        """Whether the decision needs an LLM meta-review rather than a score threshold."""
+        review_type = self.review_types.get(self.review_type(metadata), {})
+        return review_type.get("meta_review", True)
+
+
+def load_metadata(submission_id: str) -> dict:
+    """Load a submission's metadata.yaml (empty if missing)."""
+    metadata_path = Path("submissions") / submission_id / "metadata.yaml"
+    if not metadata_path.exists():
+        return {}
+    with open(metadata_path) as f:
+        return yaml.safe_load(f) or {}
@@ -0,0 +1,143 @@
+"""Review Runner"""
+
+from pathlib import Path
+
+import yaml
+
+from . import profiling
+from .artifacts import resolve_pdf
+from .budget import LEDGER_PATH, UsageLedger, record_error, record_usage
+from .calibration import calibrated_weights
+from .cascade import escalation_rates
+from .clarity import ClarityReviewer
+from .domain import DomainReviewer
+from .ethics import EthicsReviewer
+from .extraction import TextView, load_report, open_text
+from .meta import MetaReviewer
+from .registry import get_config
+from .routing import ReviewRouter, load_metadata
+from .sandbox import ExtractionLimits
+from .screening import ScreeningReviewer
+from .technical import TechnicalReviewer
+
+AGENT_CLASSES = {
+    "technical": TechnicalReviewer,
+    "domain": DomainReviewer,
+    "ethics": EthicsReviewer,
+    "clarity": ClarityReviewer,
+    "screening": ScreeningReviewer
+}
+
+
+def load_submission(submission_id: str) -> tuple[TextView, dict]:
+    """Load paper content and metadata."""
+    submission_dir = Path("submissions") / submission_id
+
+    # Load metadata
+    metadata_path = submission_dir / "metadata.yaml"
+    with profiling.stage("load_metadata"), open(metadata_path) as f:
+        metadata = yaml.safe_load(f)
+
+    # Load the latest PDF version (newest revision, else paper.pdf),
+    # fetching it from the artifact store if it has been migrated
+    pdf_path = resolve_pdf(submission_dir)
+
+    # Extract text from PDF page by page into the cache (keyed by content
+    # hash), in a resource-limited child process if configured, and map it
+    # rather than holding a copy in memory
+    paper_content = open_text(pdf_path, limits=ExtractionLimits.from_config(get_config()))
+    normalization = load_report(paper_content.path).get("normalization")
+    if normalization:
+        print(f"Text normalization saved ~{normalization['tokens_saved']} of {normalization['raw_tokens']} tokens")
+
+    return paper_content, metadata
+
+
+def run_agent_review(agent_name: str, submission_id: str, paper_content: str = None,
+                     metadata: dict = None, client=None) -> dict:
+    """Run one agent review, save it and record its spend."""
+    if paper_content is None:
+        paper_content, metadata = load_submission(submission_id)
+        with paper_content:
+            return run_agent_review(agent_name, submission_id, paper_content, metadata, client)
+
+    agent = AGENT_CLASSES[agent_name]()
+    if client is not None:
+        agent.client = client
+
+    print(f"Running {agent_name} review...")
+    try:
+        review = agent.review(paper_content, metadata, submission_id=submission_id)
+    except Exception as e:
+        record_error(agent.config, submission_id, agent_name, agent.model, e)
+        raise
+
+    # Save review
+    review_path = agent.save_review(submission_id, review)
+    print(f"Review saved to: {review_path}")
+
+    # Record actual spend (the cascade pre-review is a separate call)
+    for usage in agent.calls:
+        entry = record_usage(agent.config, submission_id, agent_name, usage)
+        print(f"Tokens used ({entry['stage']}, {entry['path']} path): {entry['input_tokens']} in / "
+              f"{entry['output_tokens']} out (${entry['cost']:.4f})")
+        print(f"Thinking: {entry['thinking_tokens']} of {entry['thinking_budget']} budget tokens")
+
+    if agent.cascade.applies_to(agent_name):
+        rates = escalation_rates(UsageLedger(agent.config["rate_limits"].get("ledger_path", LEDGER_PATH)))
+        rate = rates.get(agent_name)
+        if rate:
+            print(f"Cascade escalation rate for {agent_name}: {rate['rate']:.0%} of {rate['samples']} reviews")
+
+    # Print summary
+    if "scores" in review:
+        print(f"Overall score: {review['scores'].get('overall', 'N/A')}")
+    if "recommendation" in review:
+        print(f"Recommendation: {review['recommendation']}")
+
+    return review
+
+
+def run_meta_review(submission_id: str, client=None) -> dict:
+    """Synthesize the routed agent reviews into a saved meta-review."""
+    meta_reviewer = MetaReviewer()
+    if client is not None:
+        meta_reviewer.client = client
+
+    # Load the reviews routed to this submission
+    with profiling.stage("load_reviews"):
+        reviews = meta_reviewer.load_reviews(submission_id)
+    router = ReviewRouter(meta_reviewer.config)
+    metadata = load_metadata(submission_id)
+    weights = calibrated_weights(get_config(), router.weights_for(metadata))
+
+    print(f"Loaded {len(reviews)} agent reviews")
+    for agent, review in reviews.items():
+        score = review.get("scores", {}).get("overall", "N/A")
+        rec = review.get("recommendation", "N/A")
+        print(f"  - {agent}: score={score}, recommendation={rec}")
+
+    if router.needs_meta_review(metadata):
+        # Run meta-review
+        print("Running meta-review synthesis...")
+        try:
+            meta_review = meta_reviewer.synthesize(submission_id, reviews, weights)
+        except Exception as e:
+            record_error(meta_reviewer.config, submission_id, "meta", meta_reviewer.model, e)
+            raise
+
+        # Record actual spend
+        for usage in meta_reviewer.calls:
+            entry = record_usage(meta_reviewer.config, submission_id, "meta", usage)
+            print(f"Tokens used ({entry['stage']}, {entry['path']} path): {entry['input_tokens']} in / "
+                  f"{entry['output_tokens']} out (${entry['cost']:.4f})")
+            print(f"Thinking: {entry['thinking_tokens']} of {entry['thinking_budget']} budget tokens")
+    else:
+        print(f"Deciding from scores ({router.review_type(metadata)} review, no meta-review call)...")
+        meta_review = meta_reviewer.decide_by_threshold(reviews, weights)
+
+    # Save meta-review
+    review_path = meta_reviewer.save_review(submission_id, meta_review)
+    print(f"Meta-review saved to: {review_path}")
+
+    return meta_review
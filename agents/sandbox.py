@@ -0,0 +1,236 @@
+"""Resource-Limited PDF Extraction"""
+
+import importlib.util
+import json
+import multiprocessing
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .extraction import iter_page_text, page_count, report_path, write_text_cache
+from .normalize import PageMarker
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+# Children start fresh instead of forking a parent that may hold threads
+# and open PDFs (the warm worker)
+START_METHOD = "spawn"
+
+
+class ExtractionError(RuntimeError):
+    """Raised when a PDF's text cannot be extracted within the limits."""
+
+
+class ExtractionTimeout(ExtractionError):
+    """Raised when extraction exceeds its total wall-clock limit."""
+
+
+@dataclass(frozen=True)
+class ExtractionLimits:
+    wall_seconds: float = 300
+    page_seconds: float = 30
+    cpu_seconds: int = 120
+    memory_mb: int = 2048
+    max_skipped_fraction: float = 0.2
+
+    @classmethod
+    def from_config(cls, config: dict):
+        """Return the configured limits, or None when the sandbox is disabled."""
+        extraction = config.get("extraction", {})
+        if not extraction.get("sandbox", False):
+            return None
+        return cls(**extraction.get("limits", {}))
+
+
+def _describe(error: Exception) -> str:
+    return f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+
+
+def _skipped(report: dict, page: int, reason: str) -> PageMarker:
+    """Record a skipped page and return the marker that replaces its text."""
+    report["skipped"].append({"page": page, "reason": reason})
+    return PageMarker(f"[Page {page} could not be extracted: {reason}]")
+
+
+def _apply_limits(cpu_seconds: int, memory_mb: int):
+    if resource is None:
+        return
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 5))
+    memory = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+
+
+def _extract_pages(pdf_path: str, start: int, conn, cpu_seconds: int, memory_mb: int):
+    """Child process: stream ("pages", n), ("page", i, text), ("error", i, msg), ("done",)."""
+    _apply_limits(cpu_seconds, memory_mb)
+    try:
+        if start == 0:
+            conn.send(("pages", page_count(pdf_path)))
+
+        def on_error(index, error):
+            conn.send(("error", index, _describe(error)))
+
+        for index, text in enumerate(iter_page_text(pdf_path, start, on_error), start):
+            conn.send(("page", index, text))
+        conn.send(("done",))
+    except Exception as e:
+        conn.send(("failed", _describe(e)))
+    finally:
+        conn.close()
+
+
+def _call_limited(conn, function, args: tuple, cpu_seconds: int, memory_mb: int):
+    """Child process: send ("done", result) or ("failed", msg)."""
+    _apply_limits(cpu_seconds, memory_mb)
+    try:
+        conn.send(("done", function(*args)))
+    except Exception as e:
+        conn.send(("failed", _describe(e)))
+    finally:
+        conn.close()
+
+
+def run_limited(function, args: tuple, limits: ExtractionLimits):
+    """Run a picklable function in a limited child process and return its result.
+
+    The whole call gets ``wall_seconds``; a timeout raises ExtractionTimeout
+    and a child that fails or is killed by its limits raises ExtractionError.
+    """
+    context = multiprocessing.get_context(START_METHOD)
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_call_limited,
+        args=(sender, function, args, limits.cpu_seconds, limits.memory_mb),
+        daemon=True,
+    )
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(limits.wall_seconds):
+            raise ExtractionTimeout(f"Extraction timed out after {limits.wall_seconds:g}s")
+        try:
+            message = receiver.recv()
+        except EOFError:
+            process.join(1)
+            raise ExtractionError(f"extractor died (exit code {process.exitcode})")
+        if message[0] == "failed":
+            raise ExtractionError(message[1])
+        return message[1]
+    finally:
+        receiver.close()
+        if process.is_alive():
+            process.kill()
+        process.join()
+
+
+def iter_sandboxed_pages(pdf_path: Path, limits: ExtractionLimits, report: dict):
+    """Yield page texts extracted in a limited child process, page by page.
+
+    A page that fails, hangs past ``page_seconds`` or takes the child down
+    (CPU or memory limit) is recorded in ``report["skipped"]`` and yielded as
+    a ``PageMarker`` in its place; after a hang or crash extraction resumes
+    in a fresh child from the next page.
+    """
+    if not any(importlib.util.find_spec(name) for name in ("pdfplumber", "pypdf")):
+        raise ImportError("pdfplumber or pypdf is required for PDF extraction")
+
+    context = multiprocessing.get_context(START_METHOD)
+    deadline = time.monotonic() + limits.wall_seconds
+    report.setdefault("skipped", [])
+    start = 0
+
+    while True:
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_extract_pages,
+            args=(str(pdf_path), start, sender, limits.cpu_seconds, limits.memory_mb),
+            daemon=True,
+        )
+        process.start()
+        sender.close()
+
+        next_index = start
+        failed = {}  # page index -> error reported by the child
+        finished = False
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ExtractionTimeout(
+                        f"PDF extraction timed out after {limits.wall_seconds:g}s "
+                        f"(stopped at page {next_index + 1})"
+                    )
+                if not receiver.poll(min(limits.page_seconds, remaining)):
+                    if remaining <= limits.page_seconds:
+                        continue  # Report the overall timeout above
+                    reason = f"timed out after {limits.page_seconds:g}s"
+                    break
+                try:
+                    message = receiver.recv()
+                except EOFError:
+                    process.join(1)
+                    reason = f"extractor died (exit code {process.exitcode})"
+                    break
+
+                kind = message[0]
+                if kind == "pages":
+                    report["pages"] = message[1]
+                elif kind == "page":
+                    next_index = message[1] + 1
+                    if message[1] in failed:
+                        yield _skipped(report, next_index, failed.pop(message[1]))
+                    else:
+                        yield message[2]
+                elif kind == "error":
+                    failed[message[1]] = message[2]
+                elif kind == "failed":
+                    raise ExtractionError(f"Could not read PDF: {message[1]}")
+                else:
+                    finished = True
+                    break
+        finally:
+            receiver.close()
+            if process.is_alive():
+                process.kill()
+            process.join()
+
+        if finished:
+            return
+        if "pages" not in report:
+            raise ExtractionError(f"Could not open PDF: {reason}")
+
+        yield _skipped(report, next_index + 1, reason)
+        start = next_index + 1
+        if start >= report["pages"]:
+            return
+
+
+def sandboxed_extract(pdf_path: Path, cache_path: Path, limits: ExtractionLimits, normalizer=None) -> dict:
+    """Extract a PDF into the text cache under resource limits and return the report.
+
+    Skipped pages are marked in the text so reviewers know content is missing;
+    too many skipped pages fail the whole extraction.
+    """
+    report = {}
+    pages = iter_sandboxed_pages(pdf_path, limits, report)
+    partial = Path(cache_path).with_suffix(".incomplete")
+    write_text_cache(partial, normalizer.pages(pages) if normalizer else pages)
+
+    skipped = len(report["skipped"])
+    if report.get("pages") and skipped / report["pages"] > limits.max_skipped_fraction:
+        partial.unlink()
+        raise ExtractionError(
+            f"{skipped} of {report['pages']} pages could not be extracted "
+            f"(max {limits.max_skipped_fraction:.0%})"
+        )
+
+    if normalizer:
+        report["normalization"] = normalizer.summary()
+    with open(report_path(cache_path), "w") as f:
+        json.dump(report, f, indent=2)
+    partial.replace(cache_path)
+    return report
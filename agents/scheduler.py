@@ -0,0 +1,266 @@
+"""Fair Review Scheduling Across Journals"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+from .budget import LEDGER_PATH, AdmissionController, UsageLedger
+from .registry import get_config
+from .routing import ReviewRouter
+
+CODE_ROOT = Path(__file__).resolve().parent.parent
+LOG_DIR = Path("output") / "scheduler"
+
+
+@dataclass
+class Journal:
+    """One journal instance: a directory with its own config.yaml, submissions,
+    reviews, prompts and output."""
+
+    root: Path
+    weight: float = 1.0
+    max_concurrency: int = None
+    config: dict = field(default=None, repr=False)
+
+    @classmethod
+    def load(cls, root, weight: float = 1.0, max_concurrency: int = None) -> "Journal":
+        root = Path(root).resolve()
+        return cls(root, weight, max_concurrency, get_config(str(root / "config.yaml")))
+
+    @property
+    def name(self) -> str:
+        journal = self.config.get("journal", {})
+        return journal.get("submission_prefix") or journal.get("name") or self.root.name
+
+    def ledger(self) -> UsageLedger:
+        path = Path(self.config.get("rate_limits", {}).get("ledger_path", LEDGER_PATH))
+        return UsageLedger(path if path.is_absolute() else self.root / path)
+
+
+@dataclass
+class Job:
+    journal: Journal
+    submission_id: str
+    agent: str  # "meta" for the meta-review
+    estimate: dict  # {"input_tokens", "output_tokens", "cost"}, for fairness and budgets
+
+    @property
+    def tokens(self) -> int:
+        return self.estimate["input_tokens"] + self.estimate["output_tokens"]
+
+    def command(self) -> list:
+        if self.agent == "meta":
+            return [sys.executable, str(CODE_ROOT / "scripts" / "synthesize_reviews.py"),
+                    "--submission-id", self.submission_id]
+        return [sys.executable, str(CODE_ROOT / "scripts" / "run_review.py"),
+                "--agent", self.agent, "--submission-id", self.submission_id]
+
+
+def recorded_estimates(ledger: UsageLedger, default_tokens: int) -> dict:
+    """Mean recorded usage per agent review (all calls for one submission and
+    agent), with a flat default for agents not yet seen."""
+    totals = defaultdict(lambda: defaultdict(lambda: [0, 0, 0.0]))
+    for entry in ledger.entries():
+        if entry.get("path") == "error":
+            continue
+        usage = totals[entry.get("agent")][entry.get("submission_id")]
+        usage[0] += entry.get("input_tokens", 0)
+        usage[1] += entry.get("output_tokens", 0)
+        usage[2] += entry.get("cost", 0.0)
+
+    estimates = defaultdict(lambda: {"input_tokens": default_tokens, "output_tokens": 0, "cost": 0.0})
+    for agent, reviews in totals.items():
+        count = len(reviews)
+        estimates[agent] = {
+            "input_tokens": sum(usage[0] for usage in reviews.values()) // count,
+            "output_tokens": sum(usage[1] for usage in reviews.values()) // count,
+            "cost": round(sum(usage[2] for usage in reviews.values()) / count, 4),
+        }
+    return estimates
+
+
+def pending_jobs(journal: Journal, default_tokens: int) -> tuple[list, dict]:
+    """Return (agent review jobs, meta-review jobs by submission) still to run."""
+    router = ReviewRouter(journal.config)
+    estimates = recorded_estimates(journal.ledger(), default_tokens)
+    submissions_dir = journal.root / "submissions"
+    reviews_dir = journal.root / "reviews"
+
+    jobs, meta = [], {}
+    for submission_dir in sorted(submissions_dir.iterdir()) if submissions_dir.exists() else []:
+        if not submission_dir.is_dir() or submission_dir.name.startswith(".") \
+                or submission_dir.name == "SUBMISSION_TEMPLATE":
+            continue
+        metadata_path = submission_dir / "metadata.yaml"
+        if not metadata_path.exists():
+            continue
+        with open(metadata_path) as f:
+            metadata = yaml.safe_load(f) or {}
+
+        submission_id = submission_dir.name
+        review_dir = reviews_dir / submission_id
+        for agent in router.agents_for(metadata):
+            if not (review_dir / f"{agent}.yaml").exists():
+                jobs.append(Job(journal, submission_id, agent, estimates[agent]))
+        if router.needs_meta_review(metadata) and not (review_dir / "meta-review.yaml").exists():
+            meta[submission_id] = Job(journal, submission_id, "meta", estimates["meta"])
+    return jobs, meta
+
+
+def run_subprocess(job: Job) -> bool:
+    """Run a job's script in its journal's root, logging to the journal's output."""
+    log_dir = job.journal.root / LOG_DIR
+    log_dir.mkdir(parents=True, exist_ok=True)
+    with open(log_dir / f"{job.submission_id}-{job.agent}.log", "w") as log:
+        result = subprocess.run(job.command(), cwd=job.journal.root, stdout=log, stderr=subprocess.STDOUT,
+                                env=dict(os.environ, PYTHONUNBUFFERED="1"))
+    return result.returncode == 0
+
+
+class FairScheduler:
+    """Weighted fair queuing of review jobs from several journals over one
+    shared pool of concurrent API jobs.
+
+    Start-time fair queuing: each journal's next job gets a virtual start
+    tag of max(virtual time, the journal's last finish tag) and a finish tag
+    of start + estimated tokens / weight; the lowest start tag runs next.
+    A backlogged journal therefore gets a token share proportional to its
+    weight, and an idle journal's share goes to the others rather than
+    waiting. A journal whose daily budget would be exceeded (counting its
+    running jobs) is skipped until the next run.
+    """
+
+    def __init__(self, journals: list, concurrency: int = 8, run_job=None):
+        self.journals = journals
+        self.concurrency = concurrency
+        self.run_job = run_job or run_subprocess
+        self.queues = {journal.name: deque() for journal in journals}
+        self.meta = {}  # (journal, submission) -> meta job waiting on agent reviews
+        self.outstanding = defaultdict(int)  # (journal, submission) -> agent jobs not yet done
+        self.failed = set()  # (journal, submission) with a failed agent review
+        self.finish = {journal.name: 0.0 for journal in journals}
+        self.virtual_time = 0.0
+        self.running = defaultdict(list)  # journal -> running jobs
+        self.admission = {journal.name: AdmissionController(journal.config, journal.ledger())
+                          for journal in journals}
+        self.blocked = {}  # journal -> budget reason
+        self.stats = {journal.name: defaultdict(int) for journal in journals}
+        self._condition = threading.Condition()
+
+    def add(self, jobs: list, meta: dict):
+        for job in jobs:
+            self.queues[job.journal.name].append(job)
+            self.outstanding[(job.journal.name, job.submission_id)] += 1
+        for submission_id, job in meta.items():
+            key = (job.journal.name, submission_id)
+            if self.outstanding[key]:
+                self.meta[key] = job
+            else:
+                self.queues[job.journal.name].append(job)
+
+    def _eligible(self, journal: Journal) -> bool:
+        name = journal.name
+        if not self.queues[name] or name in self.blocked:
+            return False
+        if journal.max_concurrency and len(self.running[name]) >= journal.max_concurrency:
+            return False
+        estimates = [job.estimate for job in self.running[name]] + [self.queues[name][0].estimate]
+        allowed, reason = self.admission[name].admit(estimates)
+        if not allowed:
+            self.blocked[name] = reason
+            print(f"{name}: deferring {len(self.queues[name])} queued jobs ({reason})")
+        return allowed
+
+    def _next(self):
+        """Pop the job with the lowest virtual start tag among eligible journals."""
+        candidates = [journal for journal in self.journals if self._eligible(journal)]
+        if not candidates:
+            return None
+        journal = min(candidates, key=lambda j: (max(self.virtual_time, self.finish[j.name]), j.name))
+        job = self.queues[journal.name].popleft()
+        start = max(self.virtual_time, self.finish[journal.name])
+        self.virtual_time = start
+        self.finish[journal.name] = start + max(job.tokens, 1) / journal.weight
+        return job
+
+    def _run(self, job: Job):
+        started = time.monotonic()
+        try:
+            ok = self.run_job(job)
+        except Exception as e:
+            print(f"{job.journal.name} {job.submission_id} {job.agent}: {type(e).__name__}: {e}")
+            ok = False
+        with self._condition:
+            name, key = job.journal.name, (job.journal.name, job.submission_id)
+            self.running[name].remove(job)
+            stats = self.stats[name]
+            stats["done" if ok else "failed"] += 1
+            stats["busy_s"] += time.monotonic() - started
+            print(f"{name} {job.submission_id} {job.agent}: {'done' if ok else 'failed'} "
+                  f"({time.monotonic() - started:.1f}s)")
+            if job.agent != "meta":
+                if not ok:
+                    self.failed.add(key)
+                self.outstanding[key] -= 1
+                if not self.outstanding[key] and key in self.meta:
+                    meta_job = self.meta.pop(key)
+                    if key in self.failed:
+                        stats["skipped"] += 1
+                    else:
+                        self.queues[name].append(meta_job)
+            self._condition.notify_all()
+
+    def run(self) -> dict:
+        """Run queued jobs until every journal is drained or blocked; returns per-journal stats."""
+        with self._condition:
+            while True:
+                while sum(len(jobs) for jobs in self.running.values()) < self.concurrency:
+                    job = self._next()
+                    if job is None:
+                        break
+                    self.running[job.journal.name].append(job)
+                    self.stats[job.journal.name]["dispatched"] += 1
+                    self.stats[job.journal.name]["tokens"] += job.tokens
+                    threading.Thread(target=self._run, args=(job,), daemon=True).start()
+                if not any(self.running.values()):
+                    break
+                self._condition.wait()
+        return self.report()
+
+    def report(self) -> dict:
+        report = {}
+        for journal in self.journals:
+            name = journal.name
+            report[name] = dict(self.stats[name], weight=journal.weight, root=str(journal.root),
+                                deferred=len(self.queues[name]) + sum(1 for key in self.meta if key[0] == name))
+            if name in self.blocked:
+                report[name]["blocked"] = self.blocked[name]
+        return report
+
+
+def load_journals(specs: list) -> list:
+    """Journals from ``scheduler.journals`` entries ({root, weight, max_concurrency}).
+
+    A weight of 0 disables a journal; negative weights are rejected.
+    """
+    journals = []
+    for spec in specs:
+        weight = spec.get("weight", 1.0)
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight < 0:
+            raise ValueError(f"Journal {spec['root']}: weight must be a non-negative number, got {weight!r}")
+        if weight == 0:
+            print(f"Skipping journal {spec['root']} (weight 0)")
+            continue
+        journals.append(Journal.load(spec["root"], weight, spec.get("max_concurrency")))
+    names = [journal.name for journal in journals]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Journals must have distinct submission prefixes: {', '.join(sorted(duplicates))}")
+    return journals
@@ -0,0 +1,410 @@
+"""Review Queue Capacity Simulator"""
+
+import heapq
+import math
+import random
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+from .budget import CHARS_PER_TOKEN, PROMPT_OVERHEAD_TOKENS, AdmissionController, CostModel, UsageLedger
+from .health import parse_timestamp
+from .routing import ReviewRouter
+
+SECONDS_PER_DAY = 86400
+
+# Admission estimates are memoized per paper length bucket
+ESTIMATE_BUCKET_TOKENS = 500
+
+
+@dataclass
+class SimulatedSubmission:
+    id: int
+    arrival: float  # Days since the start of the simulation
+    paper_type: str
+    paper_tokens: int
+    admitted: float = None
+    completed: float = None
+    remaining: int = 0
+    meta_latency: float = None
+    size: int = 0  # Estimated tokens, for admission
+    tokens: int = 0
+    cost: float = 0.0
+    estimates: list = field(default=None, repr=False)
+
+
+class SimulatedLedger:
+    """In-memory stand-in for ``UsageLedger.spent`` keyed by simulated day."""
+
+    def __init__(self):
+        self.days = defaultdict(lambda: {"tokens": 0, "cost": 0.0, "submissions": set()})
+
+    def record(self, day: int, submission_id: int, tokens: int, cost: float):
+        spent = self.days[day]
+        spent["tokens"] += tokens
+        spent["cost"] += cost
+        spent["submissions"].add(submission_id)
+
+    def spent(self, day: int = None) -> dict:
+        spent = self.days.get(day)
+        if spent is None:
+            return {"tokens": 0, "cost": 0.0, "submissions": 0}
+        return {"tokens": spent["tokens"], "cost": spent["cost"], "submissions": len(spent["submissions"])}
+
+
+def percentiles(values: list) -> dict:
+    if not values:
+        return {}
+    values = sorted(values)
+
+    def at(q):
+        return round(values[min(len(values) - 1, int(q * len(values)))], 3)
+
+    return {"mean": round(sum(values) / len(values), 3), "p50": at(0.5), "p90": at(0.9),
+            "p99": at(0.99), "max": round(values[-1], 3)}
+
+
+class UsageModel:
+    """Samples what one agent review actually costs and how long it takes.
+
+    Each recorded review (all ledger calls for one submission and agent:
+    cascade pass, full review, billed hedge losers) is one sample; its input
+    tokens are rescaled to the simulated paper length. Agents with no
+    history fall back to the cost model's estimate and a lognormal latency.
+    """
+
+    def __init__(self, cost_model: CostModel, samples: dict = None, median_latency_s: float = 90):
+        self.cost_model = cost_model
+        self.samples = samples or {}
+        self.median_latency_s = median_latency_s
+
+    def _overhead(self, agent: str) -> int:
+        return self.cost_model._system_prompt_tokens(agent) + PROMPT_OVERHEAD_TOKENS
+
+    @classmethod
+    def from_ledger(cls, cost_model: CostModel, ledger: UsageLedger, median_latency_s: float = 90):
+        model = cls(cost_model, median_latency_s=median_latency_s)
+        reviews = defaultdict(list)
+        for entry in ledger.entries():
+            if entry.get("path") == "error":
+                continue
+            reviews[(entry.get("submission_id"), entry.get("agent"))].append(entry)
+
+        samples = defaultdict(list)
+        for (submission_id, agent), entries in reviews.items():
+            calls = [(e.get("model"), e.get("input_tokens", 0), e.get("output_tokens", 0),
+                      None if e.get("estimated") else e.get("latency_s")) for e in entries]
+            # The first call's input is the system prompt, scaffolding and paper
+            paper_tokens = max(calls[0][1] - model._overhead(agent), 1)
+            samples[agent].append({"submission_id": submission_id, "paper_tokens": paper_tokens, "calls": calls})
+        model.samples = dict(samples)
+        return model
+
+    def paper_tokens(self) -> list:
+        """Recorded paper lengths, from the reviews that saw the paper."""
+        return [sample["paper_tokens"] for agent, samples in self.samples.items() if agent != "meta"
+                for sample in samples]
+
+    def sample(self, rng: random.Random, agent: str, estimate: dict, paper_tokens: int) -> tuple:
+        """Return (tokens, cost, latency seconds) for one simulated review."""
+        samples = self.samples.get(agent)
+        if not samples:
+            latency = self.median_latency_s * rng.lognormvariate(0, 0.5)
+            return estimate["input_tokens"] + estimate["output_tokens"], estimate["cost"], latency
+
+        sample = rng.choice(samples)
+        overhead = self._overhead(agent)
+        scale = 1.0 if agent == "meta" else (overhead + paper_tokens) / (overhead + sample["paper_tokens"])
+        tokens, cost, latency = 0, 0.0, 0.0
+        for model, input_tokens, output_tokens, latency_s in sample["calls"]:
+            input_tokens = int(input_tokens * scale)
+            tokens += input_tokens + output_tokens
+            cost += self.cost_model.cost(model, input_tokens, output_tokens)
+            latency += latency_s or 0.0
+        return tokens, cost, latency or self.median_latency_s
+
+
+class CapacitySimulator:
+    """Discrete-event simulation of the review queue under a config.
+
+    Submissions arrive, are admitted in arrival order through the same
+    ``AdmissionController`` rules as production (a refused submission waits
+    for the next UTC day's budget), and their routed agent reviews then run
+    on a pool of ``concurrency`` workers, followed by the meta-review where
+    the review type needs one. Spend is charged to the day of admission.
+    """
+
+    def __init__(self, config: dict, usage: UsageModel = None, concurrency: int = None, seed: int = None):
+        simulation = config.get("simulation", {})
+        self.config = config
+        self.router = ReviewRouter(config)
+        self.cost_model = CostModel(config)
+        self.ledger = SimulatedLedger()
+        self.admission = AdmissionController(config, ledger=self.ledger)
+        self.usage = usage or UsageModel(self.cost_model, median_latency_s=simulation.get("median_latency_s", 90))
+        self.concurrency = concurrency or config.get("worker", {}).get("concurrency", 4)
+        self.paper_type_mix = simulation.get("paper_type_mix") or {t: 1.0 for t in config.get("paper_types", {})}
+        self.median_paper_tokens = simulation.get("median_paper_tokens", 15000)
+        self.paper_tokens_sigma = simulation.get("paper_tokens_sigma", 0.5)
+        self.rng = random.Random(simulation.get("seed", 0) if seed is None else seed)
+        self._estimates = {}
+
+    # Arrivals
+
+    def synthetic_arrivals(self, days: int, arrivals_per_day: float) -> list:
+        """Poisson arrivals with paper types from the configured mix and lognormal lengths."""
+        types, weights = zip(*self.paper_type_mix.items())
+        recorded = self.usage.paper_tokens()
+        arrivals, now = [], 0.0
+        while True:
+            now += self.rng.expovariate(arrivals_per_day)
+            if now >= days:
+                return arrivals
+            if recorded:
+                paper_tokens = self.rng.choice(recorded)
+            else:
+                paper_tokens = int(self.median_paper_tokens * self.rng.lognormvariate(0, self.paper_tokens_sigma))
+            arrivals.append((now, self.rng.choices(types, weights)[0], paper_tokens))
+
+    def replay_arrivals(self, history: list, days: int) -> list:
+        """Repeat recorded (epoch seconds, paper type, paper tokens) arrivals to fill ``days``."""
+        if not history:
+            return []
+        history = sorted(history)
+        start = history[0][0]
+        span = max(math.ceil((history[-1][0] - start) / SECONDS_PER_DAY), 1)
+        arrivals = []
+        for offset in range(0, days, span):
+            for timestamp, paper_type, paper_tokens in history:
+                now = offset + (timestamp - start) / SECONDS_PER_DAY
+                if now < days:
+                    arrivals.append((now, paper_type, paper_tokens))
+        return arrivals
+
+    # Admission
+
+    def _estimate(self, agent: str, paper_type: str, paper_tokens: int) -> dict:
+        bucket = max(round(paper_tokens / ESTIMATE_BUCKET_TOKENS), 1) * ESTIMATE_BUCKET_TOKENS
+        key = (agent, paper_type, bucket)
+        if key not in self._estimates:
+            placeholder = " " * (bucket * CHARS_PER_TOKEN)
+            self._estimates[key] = self.cost_model.estimate(agent, placeholder, {"paper_type": paper_type})
+        return self._estimates[key]
+
+    def estimates_for(self, submission: SimulatedSubmission) -> list:
+        metadata = {"paper_type": submission.paper_type}
+        estimates = [self._estimate(agent, submission.paper_type, submission.paper_tokens)
+                     for agent in self.router.agents_for(metadata)]
+        if self.router.needs_meta_review(metadata):
+            key = ("meta", submission.paper_type, len(estimates))
+            if key not in self._estimates:
+                self._estimates[key] = self.cost_model.estimate_meta(estimates)
+            estimates.append(self._estimates[key])
+        return estimates
+
+    # Simulation
+
+    def _start(self, submission: SimulatedSubmission, now: float, day: int, jobs: deque):
+        """Charge an admitted submission's sampled spend and queue its reviews."""
+        submission.admitted = now
+        for estimate in submission.estimates:
+            tokens, cost, latency = self.usage.sample(self.rng, estimate["agent"], estimate, submission.paper_tokens)
+            submission.tokens += tokens
+            submission.cost += cost
+            self.ledger.record(day, submission.id, tokens, cost)
+            if estimate["agent"] == "meta":
+                submission.meta_latency = latency
+            else:
+                jobs.append((submission, latency))
+                submission.remaining += 1
+        if not submission.remaining:
+            submission.completed = now
+
+    def run(self, arrivals: list, days: int, drain_days: int = None) -> dict:
+        """Simulate the arrivals and return the capacity report."""
+        drain_days = drain_days if drain_days is not None else max(days, 30)
+        events, sequence = [], 0
+
+        def push(time, kind, payload=None):
+            nonlocal sequence
+            heapq.heappush(events, (time, sequence, kind, payload))
+            sequence += 1
+
+        submissions = []
+        for number, (time, paper_type, paper_tokens) in enumerate(arrivals):
+            submission = SimulatedSubmission(number, time, paper_type, paper_tokens)
+            submissions.append(submission)
+            push(time, "arrive", submission)
+        for day in range(1, days + drain_days):
+            push(float(day), "midnight")
+
+        # Waiting submissions by estimated size, each in arrival order.
+        # Sizes come from memoized bucket estimates, so there are few keys.
+        pending, jobs = defaultdict(deque), deque()
+        free = self.concurrency
+        busy_seconds = 0.0
+        refused_days = set()
+        never_admissible = []
+        # Size of today's smallest refusal: spend only grows within a day, so
+        # until midnight only a smaller arrival can be admitted
+        refused = [None]
+        budgeted = self.admission.daily_token_budget is not None or self.admission.daily_cost_budget is not None
+
+        def try_admit(submission, now):
+            day = int(now)
+            if not self.admission.admit(submission.estimates, day)[0]:
+                refused_days.add(day)
+                # A review-count limit refuses everything else too
+                refused[0] = submission.size if budgeted else 0
+                return False
+            self._start(submission, now, day, jobs)
+            return True
+
+        def arrive(submission, now):
+            submission.estimates = self.estimates_for(submission)
+            submission.size = sum(e["input_tokens"] + e["output_tokens"] for e in submission.estimates)
+            if not self.admission.admit(submission.estimates, day=None)[0]:
+                # Over a whole day's budget: production would queue it forever
+                never_admissible.append(submission)
+                return
+            if (refused[0] is not None and submission.size >= refused[0]) or not try_admit(submission, now):
+                pending[submission.size].append(submission)
+
+        def midnight(now):
+            """Admit waiting submissions in arrival order; after a refusal only
+            smaller ones are tried."""
+            refused[0] = None
+            # Heads of each size by arrival; a size at or above a refusal is
+            # dropped from the scan since the threshold only shrinks
+            heads = [(waiting[0].id, size) for size, waiting in pending.items()]
+            heapq.heapify(heads)
+            while heads:
+                _, size = heapq.heappop(heads)
+                if refused[0] is not None and size >= refused[0]:
+                    continue
+                waiting = pending[size]
+                if not try_admit(waiting[0], now):
+                    continue
+                waiting.popleft()
+                if waiting:
+                    heapq.heappush(heads, (waiting[0].id, size))
+                else:
+                    del pending[size]
+
+        def dispatch(now):
+            nonlocal free, busy_seconds
+            while free and jobs:
+                submission, latency = jobs.popleft()
+                free -= 1
+                busy_seconds += latency
+                push(now + latency / SECONDS_PER_DAY, "done", submission)
+
+        while events:
+            now, _, kind, submission = heapq.heappop(events)
+            if kind == "arrive":
+                arrive(submission, now)
+            elif kind == "midnight":
+                if not pending and not jobs and free == self.concurrency and now >= days:
+                    break
+                midnight(now)
+            else:
+                free += 1
+                submission.remaining -= 1
+                if submission.remaining == 0:
+                    if submission.meta_latency is not None:
+                        jobs.append((submission, submission.meta_latency))
+                        submission.meta_latency = None
+                        submission.remaining = 1
+                    else:
+                        submission.completed = now
+            dispatch(now)
+
+        horizon = max(now, days)
+        return self.report(submissions, days, horizon, busy_seconds, refused_days, never_admissible)
+
+    def report(self, submissions: list, days: int, horizon: float, busy_seconds: float,
+               refused_days: set, never_admissible: list) -> dict:
+        timelines = {name: settings.get("timeline_days") for name, settings in self.config.get("paper_types", {}).items()}
+        by_type = defaultdict(lambda: {"submissions": 0, "sla_misses": 0})
+        waits, turnarounds = [], []
+        misses = 0
+        for submission in submissions:
+            stats = by_type[submission.paper_type]
+            stats["submissions"] += 1
+            stats["timeline_days"] = timelines.get(submission.paper_type)
+            if submission.admitted is not None:
+                waits.append(submission.admitted - submission.arrival)
+            finished = submission.completed if submission.completed is not None else horizon
+            if submission.completed is not None:
+                turnarounds.append(submission.completed - submission.arrival)
+            timeline = timelines.get(submission.paper_type)
+            if timeline is not None and (finished - submission.arrival > timeline or submission.completed is None):
+                stats["sla_misses"] += 1
+                misses += 1
+
+        cost = sum(s.cost for s in submissions)
+        tokens = sum(s.tokens for s in submissions)
+        completed = sum(1 for s in submissions if s.completed is not None)
+        return {
+            "days": days,
+            "concurrency": self.concurrency,
+            "submissions": len(submissions),
+            "admitted": len(waits),
+            "completed": completed,
+            "unfinished": len(submissions) - completed,
+            "never_admissible": len(never_admissible),
+            "queue_wait_days": percentiles(waits),
+            "turnaround_days": percentiles(turnarounds),
+            "sla": {
+                "misses": misses,
+                "miss_rate": round(misses / len(submissions), 4) if submissions else 0.0,
+                "by_paper_type": dict(by_type),
+            },
+            "spend": {
+                "total_cost": round(cost, 2),
+                "cost_per_day": round(cost / days, 4),
+                "tokens_per_day": int(tokens / days),
+                "cost_per_submission": round(cost / len(waits), 4) if waits else 0.0,
+                "budget_limited_days": len(refused_days),
+            },
+            "worker_utilization": round(busy_seconds / (self.concurrency * horizon * SECONDS_PER_DAY), 4),
+        }
+
+
+def load_history(ledger: UsageLedger, usage: UsageModel, submissions_dir: Path = Path("submissions")) -> list:
+    """Recorded (epoch seconds, paper type, paper tokens) per reviewed submission.
+
+    The arrival time is ``submitted_at`` from the metadata when recorded,
+    else the submission's first ledger entry.
+    """
+    first_seen = {}
+    for entry in ledger.entries():
+        submission_id, timestamp = entry.get("submission_id"), entry.get("timestamp")
+        if submission_id and timestamp:
+            first_seen[submission_id] = min(first_seen.get(submission_id, timestamp), timestamp)
+
+    lengths = {}
+    for agent, samples in usage.samples.items():
+        if agent != "meta":
+            for sample in samples:
+                lengths.setdefault(sample["submission_id"], sample["paper_tokens"])
+
+    history = []
+    for submission_id, timestamp in first_seen.items():
+        metadata = {}
+        metadata_path = submissions_dir / submission_id / "metadata.yaml"
+        if metadata_path.exists():
+            with open(metadata_path) as f:
+                metadata = yaml.safe_load(f) or {}
+        arrival = parse_timestamp(timestamp)
+        if metadata.get("submitted_at"):
+            try:
+                arrival = parse_timestamp(str(metadata["submitted_at"]))
+            except ValueError:
+                pass
+        paper_tokens = lengths.get(submission_id)
+        if paper_tokens:
+            history.append((arrival, metadata.get("paper_type", "research"), paper_tokens))
+    return history
@@ -0,0 +1,121 @@
+"""Adaptive Extended-Thinking Budgets"""
+
+from .budget import LEDGER_PATH, UsageLedger
+
+# Smallest thinking budget the API accepts
+MIN_THINKING_BUDGET = 1024
+
+
+def score_disagreement(reviews: dict) -> float:
+    """Return reviewer disagreement in [0, 1] from the spread of overall scores."""
+    scores = []
+    for review in reviews.values():
+        overall = (review or {}).get("scores", {}).get("overall")
+        if isinstance(overall, (int, float)):
+            scores.append(float(overall))
+    if len(scores) < 2:
+        return 0.0
+    # Scores run 1-5, so a spread of 4 is total disagreement
+    return min((max(scores) - min(scores)) / 4.0, 1.0)
+
+
+class ThinkingPolicy:
+    """Chooses thinking budget and max_tokens per agent and per paper."""
+
+    def __init__(self, config: dict):
+        review = config["review"]
+        self.model = review["model"]
+        self.agents = review.get("agents", {})
+        self.max_tokens = review["max_tokens"]
+        self.max_output_tokens = review.get("max_output_tokens", {})
+        self.output_reserve = review.get("cost_model", {}).get("expected_output_tokens", 2500)
+
+        extended_thinking = review.get("extended_thinking", {})
+        self.enabled = extended_thinking.get("enabled", False)
+        self.budget_tokens = extended_thinking.get("budget_tokens", 10000)
+
+        adaptive = extended_thinking.get("adaptive", {})
+        self.adaptive = adaptive.get("enabled", False)
+        self.reference_tokens = adaptive.get("reference_tokens", 15000)
+        self.min_scale = adaptive.get("min_scale", 0.5)
+        self.max_scale = adaptive.get("max_scale", 2.0)
+        self.paper_type_scale = adaptive.get("paper_type_scale", {})
+        self.disagreement_scale = adaptive.get("disagreement_scale", 1.0)
+        self.tune_from_ledger = adaptive.get("tune_from_ledger", False)
+        self.min_samples = adaptive.get("min_samples", 10)
+        self.headroom = adaptive.get("headroom", 1.25)
+
+        self.ledger = UsageLedger(config.get("rate_limits", {}).get("ledger_path", LEDGER_PATH))
+        self._observed = None
+
+    def base_budget(self, agent: str) -> tuple[int, int]:
+        """Return the configured (thinking budget, max_tokens) for an agent."""
+        overrides = self.agents.get(agent, {})
+        return (
+            overrides.get("budget_tokens", self.budget_tokens),
+            overrides.get("max_tokens", self.max_tokens),
+        )
+
+    def output_ceiling(self, model: str) -> int:
+        """Return the largest max_tokens a model accepts (None if unknown)."""
+        return self.max_output_tokens.get(model, self.max_output_tokens.get("default"))
+
+    def budget(self, agent: str, paper_tokens: int = 0, paper_type: str = None,
+               disagreement: float = None) -> tuple[int, int]:
+        """Return (thinking budget, max_tokens); a budget of 0 disables thinking."""
+        budget, max_tokens = self.base_budget(agent)
+        if not self.enabled:
+            return 0, max_tokens
+
+        if self.adaptive:
+            scale = 1.0
+            if disagreement is not None:
+                # Meta-review: spend more reasoning only when reviewers disagree
+                scale *= 0.5 + self.disagreement_scale * disagreement
+            elif paper_tokens:
+                scale *= paper_tokens / self.reference_tokens
+            scale = min(max(scale, self.min_scale), self.max_scale)
+            scale *= self.paper_type_scale.get(paper_type, 1.0)
+            budget = int(budget * scale)
+
+            observed = self.observed_usage(agent)
+            if observed is not None:
+                # Trim scaled-up budgets an agent never uses, but not below
+                # what it is configured to get
+                budget = min(budget, max(int(observed * self.headroom), self.base_budget(agent)[0]))
+
+        model = self.agents.get(agent, {}).get("model", self.model)
+        return self.fit(model, budget, max_tokens)
+
+    def fit(self, model: str, budget: int, max_tokens: int) -> tuple[int, int]:
+        """Return (budget, max_tokens) with room for the visible review after
+        thinking, within the model's output limit."""
+        ceiling = self.output_ceiling(model)
+        if ceiling is not None:
+            budget = min(budget, ceiling - self.output_reserve)
+        if budget < MIN_THINKING_BUDGET:
+            return 0, min(max_tokens, ceiling) if ceiling is not None else max_tokens
+        max_tokens = max(max_tokens, budget + self.output_reserve)
+        return budget, min(max_tokens, ceiling) if ceiling is not None else max_tokens
+
+    def observed_usage(self, agent: str):
+        """Return the 90th-percentile thinking tokens recorded for an agent.
+
+        Only entries that derive thinking from billed output tokens count:
+        older entries estimated it from the summarized thinking text, which
+        understates it.
+        """
+        if not self.tune_from_ledger:
+            return None
+        if self._observed is None:
+            samples = {}
+            for entry in self.ledger.entries():
+                if entry.get("thinking_budget") and entry.get("stage", "review") == "review" \
+                        and entry.get("thinking_source") == "billed":
+                    samples.setdefault(entry.get("agent"), []).append(entry.get("thinking_tokens", 0))
+            self._observed = {
+                name: sorted(values)[int(0.9 * (len(values) - 1))]
+                for name, values in samples.items()
+                if len(values) >= self.min_samples
+            }
+        return self._observed.get(agent)
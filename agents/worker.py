@@ -0,0 +1,282 @@
+"""Warm Review Worker"""
+
+import http.client
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from . import runner
+from .artifacts import resolve_pdf
+
+JOB_TYPES = ("review", "synthesize")
+
+
+class ReviewWorker:
+    """Runs review jobs in a long-lived process with warm imports, client and caches."""
+
+    def __init__(self, concurrency: int = 4, job_ttl_s: float = 3600, max_jobs: int = 1000,
+                 max_papers: int = 32):
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.jobs = {}
+        self.job_ttl_s = job_ttl_s
+        self.max_jobs = max_jobs
+        self.max_papers = max_papers
+        self._lock = threading.Lock()
+        self._client = None
+        # submission_id -> (pdf stat fingerprint, mapped paper text, metadata), least recently used first
+        self._papers = OrderedDict()
+        self._papers_lock = threading.Lock()
+        self._readers = {}  # mapped paper text -> jobs reading it
+        self._retired = set()  # replaced texts to close once their last reader is done
+
+    @property
+    def client(self):
+        """One Anthropic client (and connection pool) shared by every job."""
+        with self._lock:
+            if self._client is None:
+                from anthropic import Anthropic
+                self._client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+            return self._client
+
+    def _acquire_paper(self, submission_id: str) -> tuple[str, dict]:
+        """Return paper content and metadata, kept in memory while the PDF is
+        unchanged; release the content with ``_release_paper`` when done.
+
+        At most ``max_papers`` texts are kept; the least recently used is
+        retired and closed once no job is reading it.
+        """
+        # A replaced PDF changes size or mtime; stat outside the lock so
+        # jobs for other papers are not held up
+        stat = resolve_pdf(Path("submissions") / submission_id).stat()
+        fingerprint = (stat.st_size, stat.st_mtime_ns)
+        with self._papers_lock:
+            cached = self._papers.get(submission_id)
+            if not cached or cached[0] != fingerprint:
+                paper_content, metadata = runner.load_submission(submission_id)
+                if cached:
+                    self._retire(cached[1])
+                cached = self._papers[submission_id] = (fingerprint, paper_content, metadata)
+            self._papers.move_to_end(submission_id)
+            while len(self._papers) > self.max_papers:
+                _, (_, evicted, _) = self._papers.popitem(last=False)
+                self._retire(evicted)
+            self._readers[cached[1]] = self._readers.get(cached[1], 0) + 1
+            return cached[1], cached[2]
+
+    def _retire(self, paper_content):
+        # Other jobs may still be reading the old text
+        self._retired.add(paper_content)
+        self._close_if_unread(paper_content)
+
+    def _release_paper(self, paper_content):
+        with self._papers_lock:
+            self._readers[paper_content] -= 1
+            self._close_if_unread(paper_content)
+
+    def _close_if_unread(self, paper_content):
+        if paper_content in self._retired and not self._readers.get(paper_content):
+            self._retired.discard(paper_content)
+            self._readers.pop(paper_content, None)
+            paper_content.close()
+
+    def _evict_jobs(self):
+        """Drop finished job records past their TTL, then the oldest finished
+        ones while over ``max_jobs``. Called with the lock held."""
+        now = time.time()
+        finished = sorted((record["finished_at"], job_id) for job_id, record in self.jobs.items()
+                          if "finished_at" in record)
+        excess = len(self.jobs) - self.max_jobs
+        for finished_at, job_id in finished:
+            if now - finished_at > self.job_ttl_s or excess > 0:
+                del self.jobs[job_id]
+                excess -= 1
+
+    def submit(self, job: dict) -> dict:
+        """Queue a job and return its status record."""
+        if job.get("type") not in JOB_TYPES:
+            raise ValueError(f"job type must be one of {JOB_TYPES}")
+        if not job.get("submission_id"):
+            raise ValueError("submission_id required")
+        if job["type"] == "review" and job.get("agent") not in runner.AGENT_CLASSES:
+            raise ValueError(f"agent must be one of {list(runner.AGENT_CLASSES)}")
+
+        job_id = uuid.uuid4().hex[:12]
+        record = {"id": job_id, "status": "queued", "job": job, "submitted_at": time.time()}
+        with self._lock:
+            self._evict_jobs()
+            self.jobs[job_id] = record
+        self.executor.submit(self._run, job_id)
+        return self.status(job_id)
+
+    def _run(self, job_id: str):
+        record = self.jobs[job_id]
+        job = record["job"]
+        record["status"] = "running"
+        record["started_at"] = time.time()
+        try:
+            if job["type"] == "review":
+                paper_content, metadata = self._acquire_paper(job["submission_id"])
+                try:
+                    record["result"] = runner.run_agent_review(
+                        job["agent"], job["submission_id"], paper_content, metadata, client=self.client
+                    )
+                finally:
+                    self._release_paper(paper_content)
+            else:
+                record["result"] = runner.run_meta_review(job["submission_id"], client=self.client)
+            record["status"] = "done"
+        except Exception as e:
+            traceback.print_exc()
+            record["status"] = "failed"
+            record["error"] = f"{type(e).__name__}: {e}"
+        record["finished_at"] = time.time()
+
+    def status(self, job_id: str) -> dict:
+        """Return a job's status record without its result."""
+        record = self.jobs[job_id]
+        return {key: value for key, value in record.items() if key != "result"}
+
+    def result(self, job_id: str) -> dict:
+        return self.jobs[job_id].get("result")
+
+
+def _handler(worker: ReviewWorker):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: dict):
+            payload = json.dumps(body, default=str).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            parts = [p for p in self.path.split("/") if p]
+            if parts == ["health"]:
+                return self._send(200, {"status": "ok", "jobs": len(worker.jobs)})
+            if len(parts) in (2, 3) and parts[0] == "jobs":
+                if parts[1] not in worker.jobs:
+                    return self._send(404, {"error": "unknown job"})
+                if len(parts) == 2:
+                    return self._send(200, worker.status(parts[1]))
+                if parts[2] == "result":
+                    status = worker.status(parts[1])
+                    if status["status"] != "done":
+                        return self._send(409, status)
+                    return self._send(200, {"id": parts[1], "result": worker.result(parts[1])})
+            self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/jobs":
+                return self._send(404, {"error": "not found"})
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                job = json.loads(self.rfile.read(length) or b"{}")
+                self._send(202, worker.submit(job))
+            except (ValueError, json.JSONDecodeError) as e:
+                self._send(400, {"error": str(e)})
+
+        def address_string(self):
+            # Unix-socket peers have no host address
+            return self.client_address[0] if self.client_address else "unix"
+
+    return Handler
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(worker: ReviewWorker, host: str = "127.0.0.1", port: int = 8765, socket_path: str = None):
+    """Serve the job API over local TCP or a Unix socket until interrupted."""
+    handler = _handler(worker)
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = UnixHTTPServer(socket_path, handler)
+        print(f"Review worker listening on unix:{socket_path}")
+    else:
+        server = ThreadingHTTPServer((host, port), handler)
+        print(f"Review worker listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float = 30):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class WorkerClient:
+    """Talks to a review worker at http://host:port or unix:/path/to/socket."""
+
+    def __init__(self, address: str):
+        self.address = address
+
+    def _connection(self):
+        if self.address.startswith("unix:"):
+            return _UnixConnection(self.address[len("unix:"):])
+        host_port = self.address.split("://", 1)[-1].rstrip("/")
+        host, _, port = host_port.partition(":")
+        return http.client.HTTPConnection(host, int(port or 80), timeout=30)
+
+    def _request(self, method: str, path: str, body: dict = None) -> tuple[int, dict]:
+        connection = self._connection()
+        try:
+            payload = json.dumps(body).encode() if body is not None else None
+            headers = {"Content-Type": "application/json"} if payload else {}
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            return response.status, json.loads(response.read() or b"{}")
+        finally:
+            connection.close()
+
+    def submit(self, job: dict) -> dict:
+        status, body = self._request("POST", "/jobs", job)
+        if status != 202:
+            raise RuntimeError(body.get("error", f"worker returned {status}"))
+        return body
+
+    def _job_request(self, path: str) -> dict:
+        status, body = self._request("GET", path)
+        if status == 404:
+            raise LookupError(f"Worker {self.address} has no such job ({path}); "
+                              "it may have restarted or expired the job record")
+        if status >= 400 and status != 409:
+            raise RuntimeError(body.get("error", f"worker returned {status}"))
+        return body
+
+    def status(self, job_id: str) -> dict:
+        return self._job_request(f"/jobs/{job_id}")
+
+    def result(self, job_id: str) -> dict:
+        return self._job_request(f"/jobs/{job_id}/result").get("result")
+
+    def wait(self, job_id: str, poll_seconds: float = 1.0) -> dict:
+        """Block until a job finishes and return its result."""
+        while True:
+            status = self.status(job_id)
+            if status["status"] == "done":
+                return self.result(job_id)
+            if status["status"] == "failed":
+                raise RuntimeError(status.get("error", "job failed"))
+            time.sleep(poll_seconds)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Build or refresh the related-work index over the journal's papers."""
+
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.registry import get_config
+from agents.related_work import RelatedWorkIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Update the related-work index")
+    parser.add_argument("--no-extract", action="store_true",
+                        help="Index only text already in the extraction cache")
+    parser.add_argument("--query", help="Print the top matches for a query after updating")
+    args = parser.parse_args()
+
+    index = RelatedWorkIndex(get_config())
+    stats = index.update(extract=not args.no_extract)
+    print(f"Indexed {stats['documents']} papers ({stats['added']} added or updated, "
+          f"{stats['removed']} removed)")
+
+    if args.query:
+        for doc_id, score in index.search(args.query):
+            print(f"  {score:8.3f}  {index.docs[doc_id]['title']} [{doc_id}]")
+
+
+if __name__ == "__main__":
+    main()
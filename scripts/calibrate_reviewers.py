@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Calibrate reviewer agents against each other across all saved reviews."""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.calibration import REPORT_PATH, CalibrationReport, ReviewScores, write_report
+from agents.registry import get_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reviewer calibration and agreement analytics")
+    parser.add_argument("--reviews-dir", default="reviews")
+    parser.add_argument("--output", default=str(REPORT_PATH), help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    config = get_config()
+    started = time.monotonic()
+    data = ReviewScores(config, Path(args.reviews_dir))
+    updated = data.update()
+    report = CalibrationReport(config).compute(data)
+    print(f"Read {updated} new or changed review files; {report['submissions']} submissions "
+          f"analyzed in {time.monotonic() - started:.2f}s")
+
+    print("Agent bias against the other reviewers (overall score):")
+    for agent, stats in report["agents"].items():
+        print(f"  - {agent}: {stats['reviews']} reviews, mean {stats['mean']}, bias {'n/a' if stats['bias'] is None else format(stats['bias'], '+')}, "
+              f"variance {stats['variance']}; decisions flipped by a weight change: "
+              f"{report['sensitivity'].get(agent, 0):.1%}")
+    for pair, value in sorted(report["correlation"].items()):
+        print(f"  {pair.replace(':', ' vs ')}: r={value}")
+
+    decisions = report["decisions"]
+    agreement = decisions["threshold_agrees_with_meta"]
+    if agreement is not None:
+        print(f"Score thresholds agree with {agreement:.1%} of {decisions['meta_reviews']} meta-review decisions")
+
+    configured = {agent: spec.get("weight", 1.0) for agent, spec in config["review"]["agents"].items()}
+    print("Suggested weights:")
+    for agent, weight in report["suggested_weights"].items():
+        print(f"  - {agent}: {weight} (configured {configured.get(agent, 1.0)})")
+
+    path = write_report(report, Path(args.output))
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Admit a submission for review against the daily token budget."""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.registry import get_config
+from agents.budget import AdmissionController, CostModel
+from agents.routing import ReviewRouter
+from agents.runner import load_submission
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check daily review budget")
+    parser.add_argument("--submission-id", default=os.environ.get("SUBMISSION_ID"))
+    parser.add_argument("--runs-today", type=int,
+                        default=int(os.environ["REVIEW_RUNS_TODAY"]) if os.environ.get("REVIEW_RUNS_TODAY") else None,
+                        help="Reviews already run today, used if the ledger has no usage for today")
+    args = parser.parse_args()
+
+    if not args.submission_id:
+        print("Error: submission-id required")
+        sys.exit(1)
+
+    config = get_config()
+
+    paper_content, metadata = load_submission(args.submission_id)
+
+    # Estimate the routed agent reviews plus the meta-review
+    router = ReviewRouter(config)
+    cost_model = CostModel(config)
+    with paper_content:
+        estimates = [cost_model.estimate(agent, paper_content, metadata) for agent in router.agents_for(metadata)]
+    if router.needs_meta_review(metadata):
+        estimates.append(cost_model.estimate_meta(estimates))
+
+    print(f"Estimated cost for {args.submission_id}:")
+    for estimate in estimates:
+        print(f"  - {estimate['agent']}: {estimate['input_tokens']} in / "
+              f"{estimate['output_tokens']} out (${estimate['cost']:.4f})")
+
+    allowed, reason = AdmissionController(config).admit(estimates, runs_today=args.runs_today)
+    print(f"Admitted: {allowed} ({reason})")
+
+    # Set GitHub Actions output
+    if os.environ.get("GITHUB_OUTPUT"):
+        with open(os.environ["GITHUB_OUTPUT"], "a") as f:
+            f.write(f"allowed={str(allowed).lower()}\n")
+            f.write(f"reason={reason}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Build the journal health report from local timings and review records."""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.health import STATUS_PATH, HealthCollector, write_status
+from agents.registry import get_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect journal health metrics")
+    parser.add_argument("--workflow-total", type=int, default=int(os.environ.get("WORKFLOW_TOTAL_RUNS", 0)))
+    parser.add_argument("--workflow-failed", type=int, default=int(os.environ.get("WORKFLOW_FAILED_RUNS", 0)))
+    parser.add_argument("--output", default=str(STATUS_PATH))
+    args = parser.parse_args()
+
+    workflow_runs = {"total": args.workflow_total, "failed": args.workflow_failed}
+    if args.workflow_total:
+        workflow_runs["success_rate"] = round(100 * (args.workflow_total - args.workflow_failed) / args.workflow_total)
+
+    collector = HealthCollector(get_config())
+    report = collector.report(workflow_runs)
+    collector.save_state()
+    path = write_status(report, args.output)
+
+    print(f"Status: {report['status']}")
+    print(f"Pending submissions: {report['pending_submissions']} "
+          f"(oldest {report['oldest_pending_hours']}h)")
+    for window, rates in report["api_errors"].items():
+        print(f"API errors ({window}): {rates['errors']}/{rates['calls']} calls, {rates['overloads']} overloads")
+    for stage, summary in report["latency_seconds"]["stages"].items():
+        print(f"Latency ({stage}): p50={summary['p50']}s p95={summary['p95']}s p99={summary['p99']}s")
+    print(f"Report written to: {path}")
+
+    if os.environ.get("GITHUB_OUTPUT"):
+        recent = report["recent_api_errors"]
+        with open(os.environ["GITHUB_OUTPUT"], "a") as f:
+            f.write(f"status={report['status']}\n")
+            f.write(f"queue_alert={report['queue_alert']}\n")
+            f.write(f"pending_submissions={report['pending_submissions']}\n")
+            f.write(f"oldest_pending_hours={report['oldest_pending_hours']}\n")
+            f.write(f"error_rate={recent['error_rate']}\n")
+
+
+if __name__ == "__main__":
+    main()
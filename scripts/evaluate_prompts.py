@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Evaluate prompt, model and thinking-budget variants against past reviews."""
+
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.evaluation import Evaluator, FakeClient, load_variants, select_submissions
+from agents.registry import get_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate review prompt variants on past submissions")
+    parser.add_argument("--variants", help="YAML file with a list of variants (default: evaluation.variants)")
+    parser.add_argument("--submissions", nargs="*", help="Submission IDs (default: every meta-reviewed one)")
+    parser.add_argument("--match", help="Only submissions whose ID matches this regex")
+    parser.add_argument("--limit", type=int, help="At most this many submissions")
+    parser.add_argument("--client", choices=["fake", "api"], help="Offline fake client or the real API")
+    parser.add_argument("--concurrency", type=int)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    config = get_config()
+    evaluation = config.get("evaluation", {})
+    variants = load_variants(args.variants or evaluation.get("variants", []))
+    if not variants:
+        print("Error: no variants configured")
+        sys.exit(1)
+    submission_ids = args.submissions or select_submissions(args.match, args.limit)
+    if not submission_ids:
+        print("Error: no submissions to evaluate")
+        sys.exit(1)
+
+    client_name = args.client or evaluation.get("client", "fake")
+    if client_name == "api":
+        if not os.environ.get("ANTHROPIC_API_KEY"):
+            print("Error: ANTHROPIC_API_KEY is required for --client api")
+            sys.exit(1)
+        from anthropic import Anthropic
+        client = Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+    else:
+        client = FakeClient()
+
+    evaluator = Evaluator(config, client=client, client_name=client_name, concurrency=args.concurrency)
+    print(f"Evaluating {len(variants)} variants on {len(submission_ids)} submissions "
+          f"({client_name} client, {evaluator.concurrency} concurrent)")
+    started = time.monotonic()
+    results = evaluator.run(variants, submission_ids)
+    report = evaluator.report(variants, results)
+    print(f"Finished {len(results)} runs in {time.monotonic() - started:.1f}s")
+
+    for name, stats in report.items():
+        delta = stats["score_delta"]
+        print(f"\n{name} ({stats['agent']}): {stats['runs']} runs, {stats['cached']} cached, "
+              f"{stats['errors']} errors")
+        if stats["parse_failure_rate"] is not None:
+            print(f"  parse failures: {stats['parse_failure_rate']:.1%}")
+        if delta:
+            print(f"  score delta vs saved reviews ({stats['compared']} compared): mean {delta['mean']:+}, "
+                  f"median {delta['p50']:+}, mean absolute {stats['mean_abs_delta']}")
+        print(f"  recommendation flips: {stats['recommendation_flips']}, "
+              f"threshold decision flips: {stats['decision_flips']}")
+        if stats["latency_s"]:
+            print(f"  latency: p50 {stats['latency_s']['p50']}s, p90 {stats['latency_s']['p90']}s")
+        print(f"  tokens: {stats['input_tokens']} in / {stats['output_tokens']} out; "
+              f"spent ${stats['spent']:.4f} on uncached calls")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"variants": report, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
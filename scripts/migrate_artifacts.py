@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Move submission PDFs into the content-addressed artifact store."""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.artifacts import ArtifactStore, migrate_submission
+from agents.registry import get_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate submission PDFs to the artifact store")
+    parser.add_argument("--submission-id", default=os.environ.get("SUBMISSION_ID"))
+    parser.add_argument("--all", action="store_true", help="Migrate every submission")
+    parser.add_argument("--keep", action="store_true", help="Keep the original PDFs in place")
+    args = parser.parse_args()
+
+    if not args.submission_id and not args.all:
+        print("Error: submission-id or --all required")
+        sys.exit(1)
+
+    store = ArtifactStore.from_config(get_config())
+    submissions_dir = Path("submissions")
+    if args.all:
+        submission_dirs = [
+            d for d in sorted(submissions_dir.iterdir())
+            if d.is_dir() and not d.name.startswith('.') and d.name != 'SUBMISSION_TEMPLATE'
+        ]
+    else:
+        submission_dirs = [submissions_dir / args.submission_id]
+
+    for submission_dir in submission_dirs:
+        manifest = migrate_submission(submission_dir, store, keep=args.keep)
+        print(f"{submission_dir.name}: {len(manifest['files'])} PDFs in manifest")
+        for name, entry in manifest["files"].items():
+            print(f"  - {name}: {entry['sha256'][:12]} ({entry['size']} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,12 @@
 import os
 import sys
 import yaml
-import requests
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents import profiling
+
 
 def load_reviews(submission_id: str) -> dict:
     """Load all reviews including meta-review."""
@@ -31,7 +34,8 @@ def format_review_comment(submission_id: str, reviews: dict) -> str:
         "ACCEPT": "✅",
         "MINOR_REVISION": "📝",
         "MAJOR_REVISION": "🔄",
-        "REJECT": "❌"
+        "REJECT": "❌",
+        "ESCALATE": "⚠️"
     }.get(decision, "⏳")
 
     comment = f"""# {emoji} Review Complete: {decision}
@@ -80,7 +84,7 @@ def format_review_comment(submission_id: str, reviews: dict) -> str:
     # Add individual reviews
     comment += "---\n\n## Detailed Reviews\n\n"
 
-    for agent in ["technical", "domain", "ethics", "clarity"]:
+    for agent in ["technical", "domain", "ethics", "clarity", "screening"]:
         if agent in reviews:
             review = reviews[agent]
             comment += f"""<details>
@@ -119,8 +123,10 @@ Reviews are AI-generated and should be evaluated critically.*
     return comment
 
 
-def post_comment(pr_number: int, comment: str):
-    """Post comment to GitHub PR."""
+def post_comment(pr_number: int, comment: str) -> bool:
+    """Post comment to GitHub PR; return whether it was posted."""
+    import requests
+
     token = os.environ.get("GITHUB_TOKEN")
     repo = os.environ.get("GITHUB_REPOSITORY", "akz4ol/agentic-journal")
 
@@ -130,18 +136,21 @@ def post_comment(pr_number: int, comment: str):
         "Accept": "application/vnd.github.v3+json"
     }
 
-    response = requests.post(url, headers=headers, json={"body": comment})
+    with profiling.stage("post_comment", network=True):
+        response = requests.post(url, headers=headers, json={"body": comment})
 
     if response.status_code == 201:
         print(f"Comment posted successfully")
-    else:
-        print(f"Failed to post comment: {response.status_code}")
-        print(response.text)
+        return True
+    print(f"Failed to post comment: {response.status_code}")
+    print(response.text)
+    return False
 
 
 def main():
     submission_id = os.environ.get("SUBMISSION_ID")
     pr_number = os.environ.get("PR_NUMBER")
+    profiling.enable("notify", submission_id)
 
     if not submission_id or not pr_number:
         print("Error: SUBMISSION_ID and PR_NUMBER required")
@@ -150,11 +159,13 @@ def main():
     print(f"Preparing notification for {submission_id} on PR #{pr_number}")
 
     # Load reviews
-    reviews = load_reviews(submission_id)
+    with profiling.stage("load_reviews"):
+        reviews = load_reviews(submission_id)
     print(f"Loaded {len(reviews)} reviews")
 
     # Format comment
-    comment = format_review_comment(submission_id, reviews)
+    with profiling.stage("format_comment"):
+        comment = format_review_comment(submission_id, reviews)
     print(f"Comment length: {len(comment)} characters")
 
     # Post to PR
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Publish accepted papers, their reviews and the paper indexes to the site."""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.publisher import Publisher
+from agents.registry import get_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish accepted papers")
+    parser.add_argument("--submission-id", default=os.environ.get("SUBMISSION_ID"))
+    parser.add_argument("--all", action="store_true", help="Check every reviewed submission")
+    parser.add_argument("--rebuild", action="store_true", help="Re-render pages even if their sources are unchanged")
+    parser.add_argument("--commit", action="store_true", help="Commit all written pages in one commit")
+    args = parser.parse_args()
+
+    if not args.submission_id and not args.all:
+        print("Error: submission-id or --all required")
+        sys.exit(1)
+
+    config = get_config()
+    if not config.get("publishing", {}).get("auto_publish", True):
+        print("Publishing disabled (publishing.auto_publish is false)")
+        return
+
+    publisher = Publisher(config)
+    started = time.monotonic()
+    stats = publisher.build(None if args.all else [args.submission_id], rebuild=args.rebuild)
+    print(f"Published {stats.get('rendered', 0)} papers, {stats.get('unchanged', 0)} unchanged, "
+          f"{stats.get('withdrawn', 0)} withdrawn in {time.monotonic() - started:.2f}s")
+    for path in publisher.written:
+        print(f"  wrote {path}")
+    for path in publisher.removed:
+        print(f"  removed {path}")
+
+    if args.commit:
+        subject = f"Publish paper {args.submission_id}" if args.submission_id and not args.all else "Publish papers"
+        if publisher.commit(subject):
+            print("Committed published pages")
+
+    if os.environ.get("GITHUB_OUTPUT"):
+        with open(os.environ["GITHUB_OUTPUT"], "a") as f:
+            f.write(f"published={stats.get('rendered', 0)}\n")
+            f.write(f"pages_written={len(publisher.written) + len(publisher.removed)}\n")
+
+
+if __name__ == "__main__":
+    main()
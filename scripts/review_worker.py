@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Run a long-lived review worker serving a local job API."""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.registry import get_config
+from agents.worker import ReviewWorker, serve
+
+
+def main():
+    worker_config = get_config().get("worker", {})
+
+    parser = argparse.ArgumentParser(description="Run the review worker")
+    parser.add_argument("--host", default=worker_config.get("host", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=worker_config.get("port", 8765))
+    parser.add_argument("--socket", default=os.environ.get("REVIEW_WORKER_SOCKET", worker_config.get("socket")),
+                        help="Serve on a Unix socket instead of TCP")
+    parser.add_argument("--concurrency", type=int, default=worker_config.get("concurrency", 4))
+    args = parser.parse_args()
+
+    worker = ReviewWorker(concurrency=args.concurrency, job_ttl_s=worker_config.get("job_ttl_s", 3600),
+                          max_jobs=worker_config.get("max_jobs", 1000),
+                          max_papers=worker_config.get("max_papers", 32))
+    try:
+        serve(worker, host=args.host, port=args.port, socket_path=args.socket)
+    except KeyboardInterrupt:
+        print("Review worker stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Run the full review pipeline for a submission with stage checkpoints."""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.artifacts import resolve_pdf, submission_pdfs
+from agents.budget import AdmissionController, CostModel
+from agents.extraction import cached_text_path, extract_to_cache, load_report, open_text
+from agents.pipeline import Pipeline, Stage, StageError
+from agents.registry import get_config
+from agents.routing import ReviewRouter, load_metadata
+from agents.runner import run_agent_review, run_meta_review
+from agents.sandbox import ExtractionLimits
+
+import notify
+import validate_submission
+
+
+def build_stages(submission_id: str, config: dict, with_notify: bool = True) -> list:
+    """validate -> extract -> screen -> agent reviews (concurrent) -> meta -> notify."""
+    submission_dir = Path("submissions") / submission_id
+    review_dir = Path("reviews") / submission_id
+    metadata_path = submission_dir / "metadata.yaml"
+    config_path = Path("config.yaml")
+
+    def submission_files(context):
+        return [metadata_path, submission_dir / "manifest.yaml",
+                *(submission_dir / name for name in submission_pdfs(submission_dir))]
+
+    def validate(context):
+        errors = []
+        for check in (validate_submission.validate_metadata, validate_submission.validate_pdf):
+            valid, check_errors = check(submission_dir, config)
+            errors.extend(check_errors)
+        if errors:
+            raise StageError("; ".join(errors))
+        return {"valid": True}
+
+    def extract(context):
+        cache_path = extract_to_cache(resolve_pdf(submission_dir), limits=ExtractionLimits.from_config(config))
+        report = load_report(cache_path)
+        return {"text": str(cache_path), "pages": report.get("pages"), "skipped_pages": len(report.get("skipped", []))}
+
+    def screen(context):
+        metadata = load_metadata(submission_id)
+        router = ReviewRouter(config)
+        agents = router.agents_for(metadata)
+        with open_text(resolve_pdf(submission_dir)) as paper_content:
+            cost_model = CostModel(config)
+            estimates = [cost_model.estimate(agent, paper_content, metadata) for agent in agents]
+        if router.needs_meta_review(metadata):
+            estimates.append(cost_model.estimate_meta(estimates))
+        allowed, reason = AdmissionController(config).admit(estimates)
+        if not allowed:
+            raise StageError(f"Not admitted: {reason}")
+        return {"agents": agents, "review_type": router.review_type(metadata), "reason": reason}
+
+    def review_stage(agent):
+        def run(context):
+            with open(metadata_path) as f:
+                metadata = yaml.safe_load(f)
+            with open_text(resolve_pdf(submission_dir)) as paper_content:
+                review = run_agent_review(agent, submission_id, paper_content, metadata)
+            return {"review": str(review_dir / f"{agent}.yaml"), "recommendation": review.get("recommendation")}
+
+        return Stage(
+            f"review:{agent}", run, deps=("screen",),
+            inputs=lambda context: [Path(context["extract"]["text"]), metadata_path,
+                                    Path("prompts") / f"{agent}.md", config_path],
+            outputs=lambda context: [review_dir / f"{agent}.yaml"],
+        )
+
+    def meta(context):
+        meta_review = run_meta_review(submission_id)
+        return {"decision": meta_review.get("decision", "unknown")}
+
+    def post(context):
+        pr_number = os.environ.get("PR_NUMBER")
+        if not pr_number:
+            raise StageError("PR_NUMBER required to notify")
+        reviews = notify.load_reviews(submission_id)
+        if not notify.post_comment(int(pr_number), notify.format_review_comment(submission_id, reviews)):
+            raise StageError("Posting the review comment failed")
+        return {"pr_number": int(pr_number)}
+
+    # Agent stages come from the routing plan, which depends only on metadata
+    agents = ReviewRouter(config).agents_for(load_metadata(submission_id))
+    review_stages = [review_stage(agent) for agent in agents]
+
+    stages = [
+        Stage("validate", validate, inputs=lambda context: [*submission_files(context), config_path]),
+        Stage("extract", extract, deps=("validate",),
+              inputs=lambda context: submission_files(context),
+              outputs=lambda context: [cached_text_path(resolve_pdf(submission_dir))]),
+        Stage("screen", screen, deps=("extract",), inputs=lambda context: [metadata_path, config_path]),
+        *review_stages,
+        Stage("meta", meta, deps=tuple(stage.name for stage in review_stages),
+              inputs=lambda context: [*(review_dir / f"{agent}.yaml" for agent in agents),
+                                      Path("prompts") / "meta.md", config_path],
+              outputs=lambda context: [review_dir / "meta-review.yaml"]),
+    ]
+    if with_notify:
+        stages.append(Stage("notify", post, deps=("meta",),
+                            inputs=lambda context: [review_dir / "meta-review.yaml", os.environ.get("PR_NUMBER")]))
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the checkpointed review pipeline")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--submission-id", default=os.environ.get("SUBMISSION_ID"))
+    group.add_argument("--resume", metavar="SUBMISSION_ID",
+                       help="Resume a previous run from its first incomplete stage")
+    parser.add_argument("--force", action="store_true", help="Ignore checkpoints and rerun every stage")
+    parser.add_argument("--no-notify", action="store_true", help="Stop after the meta-review")
+    parser.add_argument("--workers", type=int, default=4, help="Stages to run concurrently")
+    args = parser.parse_args()
+
+    submission_id = args.resume or args.submission_id
+    if not submission_id:
+        print("Error: submission-id or --resume required")
+        sys.exit(1)
+
+    config = get_config()
+    pipeline = Pipeline(submission_id, build_stages(submission_id, config, with_notify=not args.no_notify),
+                        max_workers=args.workers)
+
+    if args.resume:
+        if not pipeline.checkpoint:
+            print(f"Error: no checkpoint for {submission_id}")
+            sys.exit(1)
+        first = pipeline.first_incomplete()
+        if first is None:
+            print(f"All stages for {submission_id} are up to date")
+            return
+        print(f"Resuming {submission_id} from stage: {first}")
+
+    status = pipeline.run(force=args.force)
+
+    print(f"\nPipeline summary for {submission_id}:")
+    for name in pipeline.order():
+        print(f"  - {name}: {status.get(name, 'not run')}")
+
+    if any(s in ("failed", "blocked") for s in status.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
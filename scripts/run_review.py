@@ -3,97 +3,84 @@
 
 import os
 import sys
-import yaml
+import json
 import argparse
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from agents import TechnicalReviewer, DomainReviewer, EthicsReviewer, ClarityReviewer
-
-
-AGENT_CLASSES = {
-    "technical": TechnicalReviewer,
-    "domain": DomainReviewer,
-    "ethics": EthicsReviewer,
-    "clarity": ClarityReviewer
-}
-
-
-def load_submission(submission_id: str) -> tuple[str, dict]:
-    """Load paper content and metadata."""
-    submission_dir = Path("submissions") / submission_id
-
-    # Load metadata
-    metadata_path = submission_dir / "metadata.yaml"
-    with open(metadata_path) as f:
-        metadata = yaml.safe_load(f)
-
-    # Load PDF content
-    pdf_files = list(submission_dir.glob("*.pdf"))
-    if not pdf_files:
-        raise FileNotFoundError("No PDF found")
-
-    pdf_path = pdf_files[0]
-
-    # Extract text from PDF
-    try:
-        import pdfplumber
-        text_parts = []
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-        paper_content = "\n\n".join(text_parts)
-    except ImportError:
-        # Fallback: try pypdf
-        from pypdf import PdfReader
-        reader = PdfReader(pdf_path)
-        text_parts = []
-        for page in reader.pages:
-            text = page.extract_text()
-            if text:
-                text_parts.append(text)
-        paper_content = "\n\n".join(text_parts)
-
-    return paper_content, metadata
+from agents import profiling
+from agents.registry import get_config
+from agents.artifacts import submission_pdfs
+from agents.routing import ReviewRouter, load_metadata
+from agents.runner import AGENT_CLASSES, load_submission, run_agent_review
+from agents.worker import WorkerClient
 
 
 def main():
     parser = argparse.ArgumentParser(description="Run agent review")
-    parser.add_argument("--agent", required=True, choices=AGENT_CLASSES.keys())
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--agent", choices=AGENT_CLASSES.keys())
+    group.add_argument("--all", action="store_true", help="Run every agent routed to the submission")
+    group.add_argument("--plan", action="store_true", help="Print the routed agents as JSON and exit")
     parser.add_argument("--submission-id", default=os.environ.get("SUBMISSION_ID"))
+    parser.add_argument("--profile", action="store_true",
+                        help=f"Write CPU and memory profiles next to the reviews (or set {profiling.PROFILE_ENV}=1)")
+    parser.add_argument("--revision", action="store_true", help="Require a revised PDF to review")
     args = parser.parse_args()
 
     if not args.submission_id:
         print("Error: submission-id required")
         sys.exit(1)
 
-    print(f"Running {args.agent} review for {args.submission_id}")
+    profiling.enable("run_review", args.submission_id, args.profile)
+
+    # Route by paper type and enabled agents
+    config = get_config()
+    router_metadata = load_metadata(args.submission_id)
+    router = ReviewRouter(config)
+    agents = router.agents_for(router_metadata)
+
+    if args.plan:
+        print(json.dumps(agents))
+        if os.environ.get("GITHUB_OUTPUT"):
+            with open(os.environ["GITHUB_OUTPUT"], "a") as f:
+                f.write(f"agents={json.dumps(agents)}\n")
+                f.write(f"review_type={router.review_type(router_metadata)}\n")
+        return
+
+    if args.agent and args.agent not in agents:
+        print(f"Skipping {args.agent} review: not routed for a {router.review_type(router_metadata)} review")
+        return
+
+    if args.revision and not any(name.startswith("revisions/")
+                                 for name in submission_pdfs(Path("submissions") / args.submission_id)):
+        print("Error: no revision found")
+        sys.exit(1)
+
+    # Hand the jobs to a warm review worker when one is configured
+    if os.environ.get("REVIEW_WORKER"):
+        client = WorkerClient(os.environ["REVIEW_WORKER"])
+        jobs = [
+            client.submit({"type": "review", "agent": agent_name, "submission_id": args.submission_id})
+            for agent_name in ([args.agent] if args.agent else agents)
+        ]
+        for job in jobs:
+            print(f"Waiting for {job['job']['agent']} review (worker job {job['id']})...")
+            review = client.wait(job["id"])
+            print(f"Recommendation: {review.get('recommendation', 'N/A')}")
+        return
 
     # Load submission
     paper_content, metadata = load_submission(args.submission_id)
     print(f"Loaded paper: {metadata.get('title', 'Untitled')}")
-    print(f"Paper length: {len(paper_content)} characters")
-
-    # Run review
-    agent_class = AGENT_CLASSES[args.agent]
-    agent = agent_class()
-
-    print(f"Running {args.agent} review...")
-    review = agent.review(paper_content, metadata)
-
-    # Save review
-    review_path = agent.save_review(args.submission_id, review)
-    print(f"Review saved to: {review_path}")
+    print(f"Paper length: {len(paper_content)} bytes of text")
 
-    # Print summary
-    if "scores" in review:
-        print(f"Overall score: {review['scores'].get('overall', 'N/A')}")
-    if "recommendation" in review:
-        print(f"Recommendation: {review['recommendation']}")
+    with paper_content:
+        for agent_name in ([args.agent] if args.agent else agents):
+            print(f"Running {agent_name} review for {args.submission_id}")
+            run_agent_review(agent_name, args.submission_id, paper_content, metadata)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Review pending submissions of several journals over one shared job pool."""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.registry import get_config
+from agents.scheduler import FairScheduler, load_journals, pending_jobs
+
+
+def parse_journal(value: str) -> dict:
+    """ROOT or ROOT=WEIGHT"""
+    root, _, weight = value.partition("=")
+    return {"root": root, "weight": float(weight) if weight else 1.0}
+
+
+def main():
+    scheduler_config = get_config().get("scheduler", {})
+
+    parser = argparse.ArgumentParser(description="Schedule reviews across journals")
+    parser.add_argument("--journal", action="append", type=parse_journal, metavar="ROOT[=WEIGHT]",
+                        help="Journal root with its own config.yaml (default: scheduler.journals)")
+    parser.add_argument("--concurrency", type=int, default=scheduler_config.get("concurrency", 8))
+    parser.add_argument("--dry-run", action="store_true", help="Show the dispatch order without running jobs")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    journals = load_journals(args.journal or scheduler_config.get("journals", [{"root": "."}]))
+    default_tokens = scheduler_config.get("default_job_tokens", 30000)
+    scheduler = FairScheduler(journals, concurrency=args.concurrency,
+                              run_job=(lambda job: True) if args.dry_run else None)
+    for journal in journals:
+        jobs, meta = pending_jobs(journal, default_tokens)
+        scheduler.add(jobs, meta)
+        print(f"{journal.name} ({journal.root}): {len(jobs)} agent reviews and {len(meta)} meta-reviews pending, "
+              f"weight {journal.weight}")
+
+    started = time.monotonic()
+    report = scheduler.run()
+    print(f"Finished in {time.monotonic() - started:.1f}s")
+    for name, stats in report.items():
+        print(f"  - {name}: {stats.get('done', 0)} done, {stats.get('failed', 0)} failed, "
+              f"{stats['deferred']} deferred, {stats.get('skipped', 0)} meta-reviews skipped after a failure, ~{stats.get('tokens', 0)} tokens dispatched"
+              + (f" (blocked: {stats['blocked']})" if "blocked" in stats else ""))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Simulate the review queue offline to try capacity and budget policies."""
+
+import sys
+import copy
+import json
+import time
+import argparse
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.budget import LEDGER_PATH, CostModel, UsageLedger
+from agents.registry import get_config
+from agents.simulator import CapacitySimulator, UsageModel, load_history
+
+
+def apply_override(config: dict, assignment: str):
+    """Set a dotted config key, e.g. rate_limits.daily_token_budget=800000."""
+    key, _, value = assignment.partition("=")
+    *parents, leaf = key.split(".")
+    section = config
+    for name in parents:
+        section = section.setdefault(name, {})
+    section[leaf] = yaml.safe_load(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate review queue capacity")
+    parser.add_argument("--days", type=int, help="Simulated days of arrivals")
+    parser.add_argument("--arrivals-per-day", type=float, help="Synthetic arrival rate")
+    parser.add_argument("--replay", action="store_true",
+                        help="Repeat the recorded submission arrivals instead of synthetic ones")
+    parser.add_argument("--concurrency", type=int, help="Concurrent agent reviews")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a config value, e.g. rate_limits.daily_token_budget=800000")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    config = copy.deepcopy(get_config())
+    for assignment in args.set:
+        apply_override(config, assignment)
+    simulation = config.get("simulation", {})
+    days = args.days or simulation.get("days", 365)
+
+    ledger = UsageLedger(config.get("rate_limits", {}).get("ledger_path", LEDGER_PATH))
+    usage = UsageModel.from_ledger(CostModel(config), ledger, simulation.get("median_latency_s", 90))
+    simulator = CapacitySimulator(config, usage, concurrency=args.concurrency, seed=args.seed)
+
+    if args.replay:
+        history = load_history(ledger, usage)
+        if not history:
+            print("Error: no recorded submissions to replay")
+            sys.exit(1)
+        arrivals = simulator.replay_arrivals(history, days)
+    else:
+        arrivals = simulator.synthetic_arrivals(days, args.arrivals_per_day or simulation.get("arrivals_per_day", 2.0))
+
+    started = time.monotonic()
+    report = simulator.run(arrivals, days)
+    print(f"Simulated {days} days ({report['submissions']} submissions) in {time.monotonic() - started:.1f}s")
+
+    wait, sla, spend = report["queue_wait_days"], report["sla"], report["spend"]
+    print(f"Queue wait (days): mean {wait.get('mean', 0)}, p90 {wait.get('p90', 0)}, max {wait.get('max', 0)}")
+    print(f"SLA misses: {sla['misses']} ({sla['miss_rate']:.1%}); unfinished at end: {report['unfinished']}")
+    if report["never_admissible"]:
+        print(f"Over a whole day's budget (never admitted): {report['never_admissible']}")
+    for paper_type, stats in sorted(sla["by_paper_type"].items()):
+        print(f"  - {paper_type}: {stats['sla_misses']}/{stats['submissions']} over {stats['timeline_days']} days")
+    print(f"Spend: ${spend['total_cost']:.2f} (${spend['cost_per_day']:.2f}/day, "
+          f"${spend['cost_per_submission']:.2f}/submission); budget-limited days: {spend['budget_limited_days']}")
+    print(f"Worker utilization: {report['worker_utilization']:.1%}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
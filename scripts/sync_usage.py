@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Sync the local usage ledger with the shared ledger branch."""
+
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.registry import get_config
+from agents.budget import LEDGER_BRANCH, LEDGER_PATH, LedgerBranch, UsageLedger
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync the shared usage ledger")
+    parser.add_argument("action", choices=["pull", "push"])
+    parser.add_argument("--message", default="📊 Record review usage", help="Commit message for push")
+    args = parser.parse_args()
+
+    limits = get_config().get("rate_limits", {})
+    ledger = UsageLedger(limits.get("ledger_path", LEDGER_PATH))
+    shared = LedgerBranch(ledger, limits.get("ledger_branch", LEDGER_BRANCH))
+
+    if args.action == "pull":
+        added = shared.pull()
+        print(f"Pulled {added} usage entries from {shared.branch} into {ledger.path}")
+    elif shared.push(args.message):
+        print(f"Pushed {ledger.path} to {shared.branch}")
+    else:
+        print(f"Error: could not push usage ledger to {shared.branch}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
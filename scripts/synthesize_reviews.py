@@ -3,43 +3,39 @@
 
 import os
 import sys
-import yaml
 import argparse
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from agents import MetaReviewer
+from agents import profiling
+from agents.runner import run_meta_review
+from agents.worker import WorkerClient
 
 
 def main():
     parser = argparse.ArgumentParser(description="Synthesize reviews")
     parser.add_argument("--submission-id", default=os.environ.get("SUBMISSION_ID"))
+    parser.add_argument("--profile", action="store_true",
+                        help=f"Write CPU and memory profiles next to the reviews (or set {profiling.PROFILE_ENV}=1)")
     args = parser.parse_args()
 
     if not args.submission_id:
         print("Error: submission-id required")
         sys.exit(1)
 
-    print(f"Synthesizing reviews for {args.submission_id}")
-
-    # Load all reviews
-    meta_reviewer = MetaReviewer()
-    reviews = meta_reviewer.load_reviews(args.submission_id)
+    profiling.enable("synthesize_reviews", args.submission_id, args.profile)
 
-    print(f"Loaded {len(reviews)} agent reviews")
-    for agent, review in reviews.items():
-        score = review.get("scores", {}).get("overall", "N/A")
-        rec = review.get("recommendation", "N/A")
-        print(f"  - {agent}: score={score}, recommendation={rec}")
-
-    # Run meta-review
-    print("Running meta-review synthesis...")
-    meta_review = meta_reviewer.synthesize(args.submission_id, reviews)
+    print(f"Synthesizing reviews for {args.submission_id}")
 
-    # Save meta-review
-    review_path = meta_reviewer.save_review(args.submission_id, meta_review)
-    print(f"Meta-review saved to: {review_path}")
+    if os.environ.get("REVIEW_WORKER"):
+        # Hand the job to a warm review worker
+        client = WorkerClient(os.environ["REVIEW_WORKER"])
+        job = client.submit({"type": "synthesize", "submission_id": args.submission_id})
+        print(f"Waiting for meta-review (worker job {job['id']})...")
+        meta_review = client.wait(job["id"])
+    else:
+        meta_review = run_meta_review(args.submission_id)
 
     # Extract decision
     decision = meta_review.get("decision", "unknown")
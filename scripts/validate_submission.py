@@ -8,10 +8,15 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents import profiling
+from agents.artifacts import resolve_pdf, submission_pdfs
+from agents.registry import get_config
+
 
 def load_config():
-    with open("config.yaml") as f:
-        return yaml.safe_load(f)
+    return get_config()
 
 
 def find_submission():
@@ -85,7 +90,8 @@ def validate_pdf(submission_path: Path, config: dict) -> tuple[bool, list]:
     """Validate PDF file."""
     errors = []
 
-    pdf_files = list(submission_path.glob("*.pdf"))
+    # Top-level PDFs, whether in the working tree or the artifact store
+    pdf_files = [name for name in submission_pdfs(submission_path) if "/" not in name]
     if not pdf_files:
         errors.append("No PDF file found")
         return False, errors
@@ -93,18 +99,29 @@ def validate_pdf(submission_path: Path, config: dict) -> tuple[bool, list]:
     if len(pdf_files) > 1:
         errors.append("Multiple PDF files found - please include only one")
 
-    pdf_path = pdf_files[0]
+    # Validate the latest version (a revision if one exists)
+    pdf_path = resolve_pdf(submission_path)
 
     # Check file size (max 50MB)
     size_mb = pdf_path.stat().st_size / (1024 * 1024)
     if size_mb > 50:
         errors.append(f"PDF too large ({size_mb:.1f}MB, max 50MB)")
 
-    # Try to read PDF for page count
+    # Extract the text (warming the cache) under the configured resource
+    # limits, so pathological PDFs fail here before any API spend
     try:
-        from pypdf import PdfReader
-        reader = PdfReader(pdf_path)
-        pages = len(reader.pages)
+        from agents.extraction import extract_to_cache, load_report, page_count
+        from agents.sandbox import ExtractionError, ExtractionLimits, ExtractionTimeout
+
+        limits = ExtractionLimits.from_config(config)
+        pages = None
+        if limits is not None:
+            report = load_report(extract_to_cache(pdf_path, limits=limits))
+            pages = report.get("pages")
+            for skipped in report.get("skipped", []):
+                print(f"Warning: page {skipped['page']} could not be extracted ({skipped['reason']})")
+        if pages is None:
+            pages = page_count(pdf_path)
 
         max_pages = config["screening"]["max_pages"]
         min_pages = config["screening"]["min_pages"]
@@ -115,7 +132,11 @@ def validate_pdf(submission_path: Path, config: dict) -> tuple[bool, list]:
             errors.append(f"Too few pages ({pages}, min {min_pages})")
 
     except ImportError:
-        pass  # pypdf not available, skip page check
+        pass  # No PDF library available, skip page check
+    except ExtractionTimeout as e:
+        errors.append(f"PDF extraction timed out: {e}")
+    except ExtractionError as e:
+        errors.append(str(e))
     except Exception as e:
         errors.append(f"Could not read PDF: {e}")
 
@@ -135,6 +156,7 @@ def generate_submission_id(config: dict) -> str:
 
 
 def main():
+    profiling.enable("validate_submission", os.environ.get("SUBMISSION_ID"))
     config = load_config()
 
     submission_path = find_submission()
@@ -148,13 +170,15 @@ def main():
     all_errors = []
 
     # Validate metadata
-    valid, errors = validate_metadata(submission_path, config)
+    with profiling.stage("validate_metadata"):
+        valid, errors = validate_metadata(submission_path, config)
     if not valid:
         all_valid = False
         all_errors.extend(errors)
 
     # Validate PDF
-    valid, errors = validate_pdf(submission_path, config)
+    with profiling.stage("validate_pdf"):
+        valid, errors = validate_pdf(submission_path, config)
     if not valid:
         all_valid = False
         all_errors.extend(errors)
@@ -0,0 +1,57 @@
+"""Usage ledger sharing and admission"""
+
+import subprocess
+
+from agents.budget import AdmissionController, LedgerBranch, UsageLedger
+
+CONFIG = {"rate_limits": {"daily_reviews": 2, "daily_token_budget": 1000, "daily_cost_budget": None}}
+DAY = "2026-01-02"
+
+
+def ledger_with(tmp_path, name: str, submissions: list) -> UsageLedger:
+    ledger = UsageLedger(tmp_path / name / "usage.jsonl")
+    for submission_id in submissions:
+        ledger.record({"submission_id": submission_id, "agent": "screening", "input_tokens": 10,
+                       "output_tokens": 5, "cost": 0.01, "timestamp": f"{DAY}T00:00:00Z"})
+    return ledger
+
+
+def git(*args, cwd):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def clone(tmp_path, origin, name: str):
+    git("clone", "--quiet", str(origin), name, cwd=tmp_path)
+    return tmp_path / name
+
+
+def test_run_count_caps_admission_when_ledger_misses_runs(tmp_path):
+    ledger = ledger_with(tmp_path, "local", ["AJ-1"])
+    admission = AdmissionController(CONFIG, ledger)
+    estimate = [{"input_tokens": 10, "output_tokens": 10, "cost": 0.0}]
+
+    # One run is in the ledger, another was never persisted
+    allowed, reason = admission.admit(estimate, day=DAY, runs_today=2)
+    assert not allowed and "ledger has usage for 1" in reason
+    # The run count agrees with the ledger: the token budget decides
+    assert admission.admit(estimate, day=DAY, runs_today=1)[0]
+
+
+def test_ledger_branch_shares_entries_between_checkouts(tmp_path):
+    origin = tmp_path / "origin.git"
+    git("init", "--quiet", "--bare", str(origin), cwd=tmp_path)
+    first, second = clone(tmp_path, origin, "first"), clone(tmp_path, origin, "second")
+
+    a = ledger_with(tmp_path, "a", ["AJ-1"])
+    b = ledger_with(tmp_path, "b", ["AJ-2"])
+    assert LedgerBranch(a, repo=first).pull() == 0
+    assert LedgerBranch(a, repo=first).push()
+    # The second checkout started before the first push; its push must keep AJ-1
+    assert LedgerBranch(b, repo=second).push()
+
+    c = UsageLedger(tmp_path / "c" / "usage.jsonl")
+    assert LedgerBranch(c, repo=first).pull() == 2
+    assert c.spent(DAY)["submissions"] == 2
+    # Pushing again adds nothing and pulling twice is idempotent
+    assert LedgerBranch(c, repo=first).push()
+    assert LedgerBranch(c, repo=first).pull() == 0
@@ -0,0 +1,60 @@
+"""Meta-review digest rendering"""
+
+from agents.digest import ReviewDigest
+
+
+def review(overall, recommendation, strengths=(), weaknesses=(), **extra):
+    return dict({"scores": {"overall": overall, "rigor": overall}, "recommendation": recommendation,
+                 "confidence": 0.8,
+                 "evaluation": {"summary": f"Scored {overall}.", "strengths": list(strengths),
+                                "weaknesses": list(weaknesses)}}, **extra)
+
+
+def test_shared_points_are_merged_once_with_their_reviewers():
+    reviews = {
+        "technical": review(4, "accept", strengths=["Clear ablation study of the attention variants"]),
+        "domain": review(4, "accept", strengths=["Clear ablation study of attention variants"]),
+        "clarity": review(4, "minor_revision", strengths=["Well written introduction"]),
+    }
+    digest = ReviewDigest({}).build(reviews)
+
+    assert "| technical | 4 | accept | 0.8 | rigor 4 |" in digest
+    merged = digest.split("### Strengths (merged across reviewers)\n")[1]
+    assert merged.count("ablation study") == 1
+    assert "(technical, domain)" in merged
+    assert "Other strengths" not in digest
+    assert "### Disagreement" not in digest
+
+
+def test_disagreement_adds_detail_for_the_extremes_only():
+    reviews = {
+        "technical": review(2, "reject", weaknesses=["Baselines are missing"],
+                            issues=[{"severity": "critical", "issue": "Leaked test set", "location": "Sec 4"}]),
+        "domain": review(3, "major_revision"),
+        "clarity": review(4.5, "accept"),
+    }
+    digest = ReviewDigest({}).build(reviews)
+
+    assert "### Disagreement" in digest
+    assert digest.rstrip().endswith("clarity, technical")
+    assert "- [critical] Leaked test set (Sec 4)" in digest
+    technical = digest.split("### TECHNICAL REVIEWER")[1].split("###")[0]
+    assert "Weaknesses:" not in technical  # Already in the merged list
+
+
+def test_unparsed_review_is_excerpted_and_long_sections_truncated():
+    reviews = {
+        "technical": {"parse_error": True, "raw_response": "x " * 5000},
+        "domain": review(3, "major_revision", weaknesses=[f"gap{n}a gap{n}b gap{n}c " * 5 for n in range(30)]),
+    }
+    digest = ReviewDigest({"meta_digest": {"max_merged_chars": 300, "max_agent_chars": 500}}).build(reviews)
+
+    technical = digest.split("### TECHNICAL REVIEWER\n")[1].split("\n\n")[0]
+    assert technical.startswith("(Review could not be parsed; excerpt)")
+    assert len(technical) < 700
+    domain = digest.split("### DOMAIN REVIEWER\n")[1].split("\n\n")[0]
+    assert "Other weaknesses:" in domain and domain.endswith("- ... (truncated)")
+    assert len(domain) <= 500 + len("\n- ... (truncated)")
+    # Points that fit the merged budget are not repeated under the reviewer
+    merged = digest.split("### Weaknesses (merged across reviewers)\n")[1]
+    assert "gap0a" in merged and "gap0a" not in domain
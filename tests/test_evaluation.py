@@ -0,0 +1,63 @@
+"""Prompt variant evaluation"""
+
+from pathlib import Path
+
+import yaml
+
+from agents.evaluation import Evaluator, ResponseCache, Variant
+from agents.registry import get_config
+
+ROOT = Path(__file__).parent.parent
+
+
+def evaluator(tmp_path) -> Evaluator:
+    return Evaluator(get_config(str(ROOT / "config.yaml")), cache=ResponseCache(tmp_path / "responses"))
+
+
+def test_thinking_budget_zero_turns_thinking_off(tmp_path, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    runner = evaluator(tmp_path)
+    metadata = {"title": "T", "abstract": "A", "paper_type": "research"}
+    off = runner.request(Variant("off", "technical", thinking_budget=0), "Paper text.", metadata, "AJ-1")
+    on = runner.request(Variant("on", "technical", thinking_budget=4000), "Paper text.", metadata, "AJ-1")
+
+    assert not runner._agent(Variant("off", "technical")).use_extended_thinking
+    assert runner._agent(Variant("on", "technical")).use_extended_thinking
+    assert "thinking" not in off
+    assert on["thinking"]["budget_tokens"] == 4000
+
+
+def result(submission_id, overall, recommendation, **extra):
+    return dict({"submission_id": submission_id, "variant": "strict", "cached": False, "parse_error": overall is None,
+                 "overall": overall, "recommendation": recommendation, "model": "claude-sonnet-4-20250514",
+                 "input_tokens": 1000, "output_tokens": 500, "latency_s": 1.0}, **extra)
+
+
+def test_report_counts_score_deltas_and_decision_flips(tmp_path, monkeypatch):
+    runner = evaluator(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    for submission_id in ("AJ-1", "AJ-2"):
+        for agent in ("technical", "domain"):
+            path = tmp_path / "reviews" / submission_id / f"{agent}.yaml"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(yaml.safe_dump({"scores": {"overall": 4.0}, "recommendation": "accept"}))
+
+    variant = Variant("strict", "technical")
+    results = [
+        # Averages 3.0 with domain's 4.0: accept becomes major revision
+        result("AJ-1", 2.0, "major_revision"),
+        # Averages 4.1: still accept
+        result("AJ-2", 4.2, "accept", cached=True),
+        result("AJ-2", None, None),
+        {"submission_id": "AJ-1", "variant": "strict", "error": "overloaded"},
+    ]
+    report = runner.report([variant], results)["strict"]
+
+    assert report["runs"] == 4 and report["errors"] == 1 and report["cached"] == 1
+    assert report["compared"] == 2
+    assert report["parse_failure_rate"] == round(1 / 3, 3)
+    assert report["score_delta"]["max"] == 0.2 and report["mean_abs_delta"] == 1.1
+    assert report["recommendation_flips"] == 1
+    assert report["decision_flips"] == 1
+    # Only the uncached live runs are charged
+    assert report["spent"] > 0 and report["input_tokens"] == 3000
@@ -0,0 +1,84 @@
+"""Peak memory of PDF text extraction"""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Extracts one PDF into the text cache in a fresh interpreter and prints how
+# far peak RSS rose above the resident size after imports, in KiB
+CHILD = textwrap.dedent("""
+    import os
+    import resource
+    import sys
+
+    sys.path.insert(0, sys.argv[1])
+    import pdfplumber  # noqa: F401  (imported before the baseline)
+    from agents.extraction import extract_to_cache
+
+    with open("/proc/self/statm") as f:
+        baseline = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    extract_to_cache(sys.argv[2], sys.argv[3])
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline)
+""")
+
+
+def write_pdf(path: Path, pages: int, lines_per_page: int = 50):
+    """Write a minimal PDF of text-only pages."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Page tree, filled in once the page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for page in range(pages):
+        lines = [f"Page {page + 1} line {line}: extracted text should stream page by page to the cache."
+                 for line in range(lines_per_page)]
+        stream = "BT /F1 9 Tf 40 800 Td 11 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream.encode()))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        " ".join(f"{kid} 0 R" for kid in kids).encode(), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+def peak_growth_kib(pdf_path: Path, cache_dir: Path) -> int:
+    result = subprocess.run([sys.executable, "-c", CHILD, str(ROOT), str(pdf_path), str(cache_dir)],
+                            capture_output=True, text=True, check=True)
+    return int(result.stdout.split()[-1])
+
+
+@pytest.mark.skipif(not Path("/proc/self/statm").exists(), reason="needs Linux /proc")
+def test_peak_rss_does_not_grow_with_page_count(tmp_path):
+    small, large = tmp_path / "small.pdf", tmp_path / "large.pdf"
+    write_pdf(small, pages=10)
+    write_pdf(large, pages=100)
+
+    small_growth = peak_growth_kib(small, tmp_path / "cache-small")
+    large_growth = peak_growth_kib(large, tmp_path / "cache-large")
+
+    # Pages are parsed, normalized and written one at a time: 10x the pages
+    # may cost the PDF's object index, but not every page's layout at once
+    # (holding them all takes ~7 MiB per page of this PDF)
+    assert large_growth < small_growth + 32 * 1024, (small_growth, large_growth)
+
+    text = next((tmp_path / "cache-large").glob("*.txt")).read_text(encoding="utf-8")
+    assert "Page 100 line 25:" in text
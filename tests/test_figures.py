@@ -0,0 +1,48 @@
+"""Sandboxed figure extraction"""
+
+import pytest
+
+from agents.base import BaseReviewer
+from agents.figures import FigureExtractor
+from agents.sandbox import ExtractionError
+
+CONFIG = {
+    "figures": {"enabled": True, "agents": ["technical"]},
+    "extraction": {"sandbox": True, "limits": {"wall_seconds": 60}},
+}
+
+
+def test_broken_pdf_fails_in_the_sandbox(tmp_path):
+    pytest.importorskip("pdfplumber")
+    pdf = tmp_path / "broken.pdf"
+    pdf.write_bytes(b"%PDF-1.7\nnot really a pdf")
+    extractor = FigureExtractor(CONFIG, cache_dir=tmp_path / "figures")
+    assert extractor.limits is not None
+
+    with pytest.raises(ExtractionError):
+        extractor.extract(pdf)
+    assert not list((tmp_path / "figures").rglob("figures.json"))
+
+
+class Reviewer(BaseReviewer):
+    agent_type = "technical"
+    dimensions = []
+
+    def _default_prompt(self):
+        return ""
+
+
+def test_figure_failure_falls_back_to_text_only(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "submissions" / "AJ-1").mkdir(parents=True)
+    (tmp_path / "submissions" / "AJ-1" / "paper.pdf").write_bytes(b"%PDF")
+
+    class Failing(FigureExtractor):
+        def content_blocks(self, pdf_path):
+            raise ExtractionError("Extraction timed out after 300s")
+
+    reviewer = Reviewer.__new__(Reviewer)
+    reviewer.figures = Failing(CONFIG)
+    images, summary = reviewer._figure_blocks("AJ-1")
+    assert images == []
+    assert summary["images"] == 0 and "timed out" in summary["error"]
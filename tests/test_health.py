@@ -0,0 +1,37 @@
+"""Stage latency from pipeline checkpoints and profiles"""
+
+import json
+
+from agents.health import HealthCollector
+
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+
+
+def test_stage_timings_are_ingested_once(tmp_path):
+    checkpoints, reviews = tmp_path / "pipeline", tmp_path / "reviews"
+    write_json(checkpoints / "AJ-1" / "checkpoint.json", {
+        "extract": {"status": "done", "started_at": 100.0, "duration_s": 4.0},
+        "review:technical": {"status": "done", "started_at": 105.0, "duration_s": 60.0},
+        "meta": {"status": "failed", "error": "boom"},
+    })
+    write_json(reviews / "AJ-1" / "profile" / "run_review-stages.json",
+               {"stages": {"build_prompt": {"calls": 2, "wall_s": 1.0}}})
+
+    collector = HealthCollector({}, state_path=tmp_path / "state.json")
+    assert collector.ingest_stage_timings(checkpoints, reviews) == 4
+    assert collector.latency["stage:extract"].count == 1
+    assert collector.latency["stage:build_prompt"].summary()["mean"] == 0.5
+    assert "stage:meta" not in collector.latency
+    collector.save_state()
+
+    # A later run sees the same files and adds nothing until a stage re-runs
+    collector = HealthCollector({}, state_path=tmp_path / "state.json")
+    assert collector.ingest_stage_timings(checkpoints, reviews) == 0
+    write_json(checkpoints / "AJ-1" / "checkpoint.json", {
+        "extract": {"status": "done", "started_at": 200.0, "duration_s": 6.0},
+    })
+    assert collector.ingest_stage_timings(checkpoints, reviews) == 1
+    assert collector.latency["stage:extract"].count == 2
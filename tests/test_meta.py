@@ -0,0 +1,30 @@
+"""Score-threshold decisions"""
+
+from agents.meta import MetaReviewer, weighted_scores
+
+CONFIG = {"review": {"model": "m", "max_tokens": 4000,
+                     "thresholds": {"accept": 4.0, "minor_revision": 3.5, "major_revision": 3.0}}}
+
+
+def decide(reviews: dict) -> dict:
+    reviewer = MetaReviewer.__new__(MetaReviewer)
+    reviewer.config = CONFIG
+    return reviewer.decide_by_threshold(reviews, {})
+
+
+def test_no_scored_review_escalates_instead_of_rejecting():
+    assert decide({})["decision"] == "escalate"
+    assert decide({"screening": {"parse_error": True, "raw_response": "..."}})["decision"] == "escalate"
+    assert decide({"screening": {"scores": None}})["decision"] == "escalate"
+
+
+def test_scored_reviews_are_thresholded():
+    assert decide({"screening": {"scores": {"overall": 4.2}}})["decision"] == "accept"
+    assert decide({"screening": {"scores": {"overall": 2.0}}})["decision"] == "reject"
+
+
+def test_weighted_scores_skip_unscored_reviews():
+    average, breakdown = weighted_scores({"a": {"scores": {"overall": 4}}, "b": {"scores": {"overall": 2}},
+                                          "c": {"parse_error": True}}, {"a": 3.0})
+    assert breakdown == {"a": 4.0, "b": 2.0}
+    assert average == 3.5
@@ -0,0 +1,82 @@
+"""Checkpointed pipeline resume"""
+
+import pytest
+
+from agents.pipeline import Pipeline, Stage, StageError
+
+
+def make_pipeline(tmp_path, calls, fail=()):
+    source = tmp_path / "source.txt"
+    output = tmp_path / "extracted.txt"
+
+    def extract(context):
+        calls.append("extract")
+        output.write_text(source.read_text().upper())
+        return {"text": str(output)}
+
+    def review(name):
+        def run(context):
+            calls.append(name)
+            if name in fail:
+                raise StageError("API overloaded")
+            return {"length": len(open(context["extract"]["text"]).read())}
+        return Stage(name, run, deps=("extract",))
+
+    def meta(context):
+        calls.append("meta")
+        return {"reviews": [context["review:a"]["length"], context["review:b"]["length"]]}
+
+    stages = [
+        Stage("extract", extract, inputs=lambda context: [source], outputs=lambda context: [output]),
+        review("review:a"),
+        review("review:b"),
+        Stage("meta", meta, deps=("review:a", "review:b")),
+    ]
+    return Pipeline("AJ-1", stages, checkpoint_dir=tmp_path / "pipeline")
+
+
+def test_resume_reruns_only_the_failed_stage_and_its_dependents(tmp_path):
+    (tmp_path / "source.txt").write_text("paper")
+    calls = []
+    status = make_pipeline(tmp_path, calls, fail={"review:b"}).run()
+    assert status == {"extract": "done", "review:a": "done", "review:b": "failed", "meta": "blocked"}
+
+    calls.clear()
+    pipeline = make_pipeline(tmp_path, calls)
+    assert pipeline.first_incomplete() == "review:b"
+    status = pipeline.run()
+    assert status == {"extract": "skipped", "review:a": "skipped", "review:b": "done", "meta": "done"}
+    assert sorted(calls) == ["meta", "review:b"]
+    assert pipeline.context["meta"] == {"reviews": [5, 5]}
+
+    calls.clear()
+    assert set(make_pipeline(tmp_path, calls).run().values()) == {"skipped"}
+    assert calls == []
+
+
+def test_changed_input_or_missing_output_invalidates_downstream(tmp_path):
+    source = tmp_path / "source.txt"
+    source.write_text("paper")
+    calls = []
+    make_pipeline(tmp_path, calls).run()
+
+    calls.clear()
+    (tmp_path / "extracted.txt").unlink()
+    make_pipeline(tmp_path, calls).run()
+    # Reviews depend on extract's start time, so they re-run after it
+    assert sorted(calls) == ["extract", "meta", "review:a", "review:b"]
+
+    calls.clear()
+    source.write_text("revised paper")
+    pipeline = make_pipeline(tmp_path, calls)
+    pipeline.run()
+    assert pipeline.context["meta"] == {"reviews": [13, 13]}
+    assert len(calls) == 4
+
+
+def test_unknown_dependency_and_cycles_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="unknown"):
+        Pipeline("x", [Stage("a", dict, deps=("b",))], checkpoint_dir=tmp_path)
+    with pytest.raises(ValueError, match="cycle"):
+        Pipeline("x", [Stage("a", dict, deps=("b",)), Stage("b", dict, deps=("a",))],
+                 checkpoint_dir=tmp_path).order()
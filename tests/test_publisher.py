@@ -0,0 +1,83 @@
+"""Incremental publication builds"""
+
+import json
+
+import yaml
+
+from agents.publisher import MANIFEST_PATH, Publisher
+
+
+def write_yaml(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(yaml.safe_dump(data))
+
+
+def add_submission(root, submission_id, title, decision="accept"):
+    write_yaml(root / "submissions" / submission_id / "metadata.yaml", {
+        "title": title, "paper_type": "research", "abstract": "An   abstract.",
+        "authors": [{"name": "Ada", "email": "ada@example.org", "affiliation": "Lab"}],
+    })
+    write_yaml(root / "reviews" / submission_id / "technical.yaml", {
+        "scores": {"overall": 4.5}, "recommendation": "accept",
+        "evaluation": {"strengths": ["Sound method"], "weaknesses": ["Small dataset"]},
+    })
+    write_yaml(root / "reviews" / submission_id / "meta-review.yaml", {
+        "decision": decision, "rationale": "Strong paper.", "synthesis": {"weighted_average": 4.5},
+    })
+
+
+def front_matter(path):
+    return yaml.safe_load(path.read_text().split("---")[1])
+
+
+def test_accepted_papers_are_rendered_with_private_emails(tmp_path):
+    add_submission(tmp_path, "AJ-1", "Sparse Attention at Scale")
+    add_submission(tmp_path, "AJ-2", "Rejected Work", decision="reject")
+    publisher = Publisher({}, root=tmp_path)
+    stats = publisher.build()
+
+    assert stats["rendered"] == 1 and "withdrawn" not in stats
+    entry = publisher.manifest["papers"]["AJ-1"]
+    post = tmp_path / entry["path"]
+    fields = front_matter(post)
+    assert entry["url"].endswith("/sparse-attention-at-scale/")
+    assert fields["authors"] == [{"name": "Ada", "affiliation": "Lab"}]
+    assert fields["abstract"] == "An abstract."
+    assert fields["reviews"][0]["strengths"] == "Sound method"
+    assert "**Weighted review score:** 4.5/5" in post.read_text()
+
+    feed = json.loads((tmp_path / "papers" / "feed.json").read_text())
+    assert [item["title"] for item in feed["items"]] == ["Sparse Attention at Scale"]
+    assert "Rejected Work" not in (tmp_path / "papers" / "index.md").read_text()
+
+
+def test_unchanged_sources_are_skipped_and_changes_rerender(tmp_path):
+    add_submission(tmp_path, "AJ-1", "Sparse Attention at Scale")
+    Publisher({}, root=tmp_path).build()
+
+    publisher = Publisher({}, root=tmp_path)
+    assert publisher.build() == {"unchanged": 1, "pages_written": 0}
+
+    # A new title moves the page and keeps the publication date
+    first = publisher.manifest["papers"]["AJ-1"]
+    add_submission(tmp_path, "AJ-1", "Dense Attention at Scale")
+    publisher = Publisher({}, root=tmp_path)
+    assert publisher.build()["rendered"] == 1
+    entry = publisher.manifest["papers"]["AJ-1"]
+    assert entry["date"] == first["date"]
+    assert not (tmp_path / first["path"]).exists() and (tmp_path / entry["path"]).exists()
+    assert publisher.removed == [tmp_path.joinpath(first["path"]).relative_to(tmp_path)]
+
+
+def test_reversed_decision_withdraws_the_paper(tmp_path):
+    add_submission(tmp_path, "AJ-1", "Sparse Attention at Scale")
+    Publisher({}, root=tmp_path).build()
+    path = json.loads((tmp_path / MANIFEST_PATH).read_text())["papers"]["AJ-1"]["path"]
+
+    write_yaml(tmp_path / "reviews" / "AJ-1" / "meta-review.yaml", {"decision": "reject"})
+    publisher = Publisher({}, root=tmp_path)
+    assert publisher.build()["withdrawn"] == 1
+    assert not (tmp_path / path).exists()
+    assert "AJ-1" not in publisher.manifest["papers"]
+    # The year page listed only this paper
+    assert not list((tmp_path / "papers").glob("*/index.md"))
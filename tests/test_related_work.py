@@ -0,0 +1,85 @@
+"""Related-work BM25 index"""
+
+import yaml
+
+from agents import related_work
+from agents.related_work import RelatedWorkIndex, split_references
+
+
+def add_paper(root, name, title, abstract, keywords=()):
+    paper_dir = root / name
+    paper_dir.mkdir(parents=True)
+    with open(paper_dir / "metadata.yaml", "w") as f:
+        yaml.safe_dump({"title": title, "abstract": abstract, "keywords": list(keywords)}, f)
+    return paper_dir
+
+
+def make_index(tmp_path, **settings) -> RelatedWorkIndex:
+    config = {"related_work": {"enabled": True, "roots": [str(tmp_path / "submissions")],
+                               "index_path": str(tmp_path / "index.json"), **settings}}
+    return RelatedWorkIndex(config)
+
+
+def test_search_ranks_matching_papers_and_honours_exclusions(tmp_path):
+    root = tmp_path / "submissions"
+    add_paper(root, "AJ-1", "Sparse attention for long documents", "Attention over long contexts.", ["attention"])
+    add_paper(root, "AJ-2", "Reward modelling from preferences", "Learning rewards from human feedback.")
+    add_paper(root, "AJ-3", "Graph neural networks", "Message passing on molecules.")
+    index = make_index(tmp_path)
+    assert index.update() == {"documents": 3, "added": 3, "removed": 0}
+
+    results = index.search("efficient attention for long contexts")
+    assert results[0][0] == str(root / "AJ-1")
+    assert str(root / "AJ-1") not in dict(index.search("attention", exclude={str(root / "AJ-1")}))
+    assert index.search("quantum chromodynamics") == []
+
+
+def test_unchanged_papers_are_not_reloaded(tmp_path, monkeypatch):
+    root = tmp_path / "submissions"
+    paper = add_paper(root, "AJ-1", "Sparse attention", "Attention.")
+    index = make_index(tmp_path)
+    index.update()
+
+    def fail(*args):
+        raise AssertionError("manifest parsed for an unchanged paper")
+
+    monkeypatch.setattr(related_work, "load_manifest", fail)
+    assert index.update()["added"] == 0
+
+    monkeypatch.undo()
+    with open(paper / "metadata.yaml", "w") as f:
+        yaml.safe_dump({"title": "Dense attention revisited", "abstract": "Attention."}, f)
+    assert index.update()["added"] == 1
+    assert index.docs[str(paper)]["title"] == "Dense attention revisited"
+
+
+def test_removed_papers_leave_the_index_and_reloads_match(tmp_path):
+    root = tmp_path / "submissions"
+    add_paper(root, "AJ-1", "Sparse attention", "Attention.")
+    gone = add_paper(root, "AJ-2", "Reward modelling", "Rewards.")
+    index = make_index(tmp_path)
+    index.update()
+    (gone / "metadata.yaml").unlink()
+    assert index.update()["removed"] == 1
+    assert "reward" not in index.postings
+
+    reloaded = make_index(tmp_path)
+    assert reloaded.postings == index.postings
+    assert reloaded.total_length == index.total_length
+
+
+def test_refresh_skips_a_recent_index(tmp_path):
+    add_paper(tmp_path / "submissions", "AJ-1", "Sparse attention", "Attention.")
+    index = make_index(tmp_path, refresh_seconds=300)
+    assert index.refresh()["added"] == 1
+    add_paper(tmp_path / "submissions", "AJ-2", "Reward modelling", "Rewards.")
+    assert index.refresh() is None
+    assert make_index(tmp_path, refresh_seconds=0).refresh()["added"] == 1
+
+
+def test_split_references_keeps_appendix_in_body():
+    text = ("Introduction\nWe study attention.\n\nReferences\n[1] Vaswani et al. Attention. 2017.\n"
+            "[2] Smith. Long documents. 2021.\n\nAppendix A\nProof of the main theorem.")
+    body, references = split_references(text)
+    assert references.startswith("[1] Vaswani") and "2021" in references
+    assert "Proof of the main theorem" in body and "Vaswani" not in body
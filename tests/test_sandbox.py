@@ -0,0 +1,84 @@
+"""Sandboxed extraction skip and timeout paths"""
+
+import os
+import time
+
+import pytest
+
+from agents import sandbox
+from agents.normalize import PageMarker, TextNormalizer
+from agents.sandbox import ExtractionError, ExtractionLimits, ExtractionTimeout, sandboxed_extract
+
+# Per-page behaviour of the fake extractor: text, an exception, a hang or a crash
+BEHAVIOUR = {}
+
+
+def fake_pages(pdf_path, start=0, on_error=None):
+    for index in range(start, len(BEHAVIOUR["pages"])):
+        action = BEHAVIOUR["pages"][index]
+        if action == "raise":
+            on_error(index, ValueError("bad content stream"))
+            yield ""
+        elif action == "hang":
+            time.sleep(30)
+        elif action == "crash":
+            os._exit(1)
+        else:
+            yield action
+
+
+@pytest.fixture
+def pdf(tmp_path, monkeypatch):
+    # Fork so the children see the fake extractor
+    monkeypatch.setattr(sandbox, "START_METHOD", "fork")
+    monkeypatch.setattr(sandbox, "iter_page_text", fake_pages)
+    monkeypatch.setattr(sandbox, "page_count", lambda path: len(BEHAVIOUR["pages"]))
+    path = tmp_path / "paper.pdf"
+    path.write_bytes(b"%PDF")
+    return path
+
+
+def extract(pdf, pages, **limits):
+    BEHAVIOUR["pages"] = pages
+    limits = ExtractionLimits(**{"page_seconds": 0.5, "max_skipped_fraction": 0.5, **limits})
+    report = {}
+    texts = list(sandbox.iter_sandboxed_pages(pdf, limits, report))
+    return texts, report
+
+
+def test_skipped_pages_are_replaced_by_markers_in_order(pdf):
+    texts, report = extract(pdf, ["one", "raise", "three", "crash", "five", "hang"])
+
+    assert texts[0::2] == ["one", "three", "five"]
+    assert all(isinstance(text, PageMarker) for text in texts[1::2])
+    assert [text.split(" could")[0] for text in texts[1::2]] == ["[Page 2", "[Page 4", "[Page 6"]
+    assert [skipped["page"] for skipped in report["skipped"]] == [2, 4, 6]
+    assert "bad content stream" in report["skipped"][0]["reason"]
+    assert "died" in report["skipped"][1]["reason"]
+    assert "timed out" in report["skipped"][2]["reason"]
+
+
+def test_markers_reach_the_cache_without_counting_as_pages(pdf, tmp_path):
+    BEHAVIOUR["pages"] = ["first page", "second page", "hang"]
+    cache = tmp_path / "paper.txt"
+    normalizer = TextNormalizer()
+    report = sandboxed_extract(pdf, cache, ExtractionLimits(page_seconds=0.5, max_skipped_fraction=0.5),
+                               normalizer)
+
+    text = cache.read_text()
+    assert text.endswith("[Page 3 could not be extracted: timed out after 0.5s]")
+    assert report["normalization"]["pages"] == 2
+
+
+def test_too_many_skipped_pages_fail_without_a_cache(pdf, tmp_path):
+    BEHAVIOUR["pages"] = ["text", "raise", "raise"]
+    cache = tmp_path / "paper.txt"
+    with pytest.raises(ExtractionError, match="2 of 3 pages"):
+        sandboxed_extract(pdf, cache, ExtractionLimits(max_skipped_fraction=0.5))
+    assert not cache.exists()
+    assert not cache.with_suffix(".incomplete").exists()
+
+
+def test_whole_document_timeout(pdf):
+    with pytest.raises(ExtractionTimeout):
+        extract(pdf, ["text", "hang", "hang"], wall_seconds=0.8, page_seconds=5)
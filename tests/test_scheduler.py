@@ -0,0 +1,107 @@
+"""Fair scheduling across journals"""
+
+import threading
+from pathlib import Path
+
+import pytest
+import yaml
+
+from agents.scheduler import FairScheduler, Job, Journal, load_journals
+
+ROOT = Path(__file__).parent.parent
+
+
+def journal(tmp_path, name, weight=1.0, budget=None, max_concurrency=None) -> Journal:
+    config = {"journal": {"submission_prefix": name},
+              "rate_limits": {"daily_token_budget": budget, "daily_cost_budget": None,
+                              "ledger_path": str(tmp_path / name / "usage.jsonl")}}
+    return Journal(tmp_path / name, weight, max_concurrency, config)
+
+
+def jobs(journal, count, tokens=1000, submissions=None):
+    return [Job(journal, f"{journal.name}-{number if submissions is None else submissions}", "technical",
+                {"input_tokens": tokens, "output_tokens": 0, "cost": 0.0}) for number in range(count)]
+
+
+def recorder():
+    order, lock = [], threading.Lock()
+
+    def run(job):
+        with lock:
+            order.append(job.journal.name)
+        return True
+
+    return order, run
+
+
+def test_backlogged_journals_share_by_weight(tmp_path):
+    heavy, light = journal(tmp_path, "A", weight=2), journal(tmp_path, "B", weight=1)
+    order, run = recorder()
+    scheduler = FairScheduler([heavy, light], concurrency=1, run_job=run)
+    scheduler.add(jobs(heavy, 12) + jobs(light, 12), {})
+    report = scheduler.run()
+
+    assert order[:9].count("A") == 6
+    assert report["A"]["done"] == report["B"]["done"] == 12
+
+
+def test_idle_journal_does_not_hold_back_the_other(tmp_path):
+    busy, idle = journal(tmp_path, "A"), journal(tmp_path, "B")
+    order, run = recorder()
+    scheduler = FairScheduler([busy, idle], concurrency=1, run_job=run)
+    scheduler.add(jobs(busy, 5), {})
+    scheduler.run()
+    assert order == ["A"] * 5
+
+
+def test_budget_blocks_a_journal_and_reports_deferred_jobs(tmp_path):
+    capped, open_ = journal(tmp_path, "A", budget=2500), journal(tmp_path, "B")
+    order, run = recorder()
+    scheduler = FairScheduler([capped, open_], concurrency=4, run_job=run)
+    scheduler.add(jobs(capped, 5) + jobs(open_, 3), {})
+    report = scheduler.run()
+
+    # Two 1000-token jobs fit; the third would pass 2500 counting the running ones
+    assert report["A"]["dispatched"] == 2 and report["A"]["deferred"] == 3
+    assert "token budget exceeded" in report["A"]["blocked"]
+    assert report["B"]["done"] == 3 and "blocked" not in report["B"]
+
+
+def test_meta_review_waits_for_agent_reviews_and_is_skipped_after_a_failure(tmp_path):
+    a = journal(tmp_path, "A")
+    ran = []
+
+    def run(job):
+        ran.append((job.submission_id, job.agent))
+        return job.submission_id != "A-bad"
+
+    scheduler = FairScheduler([a], concurrency=2, run_job=run)
+    good, bad = jobs(a, 2, submissions="good"), jobs(a, 2, submissions="bad")
+    meta = {f"A-{name}": Job(a, f"A-{name}", "meta", {"input_tokens": 1, "output_tokens": 0, "cost": 0.0})
+            for name in ("good", "bad")}
+    scheduler.add(good + bad, meta)
+    report = scheduler.run()
+
+    assert ran.index(("A-good", "meta")) > max(i for i, r in enumerate(ran) if r == ("A-good", "technical"))
+    assert ("A-bad", "meta") not in ran
+    assert report["A"]["skipped"] == 1 and report["A"]["failed"] == 2
+
+
+def write_root(tmp_path, name) -> dict:
+    config = yaml.safe_load((ROOT / "config.yaml").read_text())
+    config.setdefault("journal", {})["submission_prefix"] = name
+    (tmp_path / name).mkdir()
+    (tmp_path / name / "config.yaml").write_text(yaml.safe_dump(config))
+    return {"root": str(tmp_path / name)}
+
+
+def test_weight_zero_disables_a_journal_and_negative_weights_are_rejected(tmp_path):
+    a, b = write_root(tmp_path, "A"), write_root(tmp_path, "B")
+    journals = load_journals([dict(a, weight=2), dict(b, weight=0)])
+    assert [(j.name, j.weight) for j in journals] == [("A", 2)]
+
+    for weight in (-1, True, "1"):
+        with pytest.raises(ValueError, match="non-negative"):
+            load_journals([dict(a, weight=weight)])
+    with pytest.raises(ValueError, match="distinct"):
+        load_journals([a, dict(a)])
@@ -0,0 +1,57 @@
+"""Review queue capacity simulator"""
+
+import copy
+from pathlib import Path
+
+import pytest
+
+from agents.registry import get_config
+from agents.simulator import CapacitySimulator
+
+ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def config(monkeypatch):
+    # Cost estimates read the agent prompts relative to the repo root
+    monkeypatch.chdir(ROOT)
+    config = copy.deepcopy(get_config())
+    config["rate_limits"].update(daily_token_budget=600000, daily_cost_budget=None)
+    config["simulation"] = {"paper_type_mix": {"research": 1.0}, "median_latency_s": 60}
+    return config
+
+
+def test_budget_defers_overflow_to_the_next_day_in_arrival_order(config):
+    # Each research paper estimates ~170k tokens: three fit in a day
+    arrivals = [(0.1 * number, "research", 10000) for number in range(5)]
+    report = CapacitySimulator(config, concurrency=4, seed=1).run(arrivals, days=3)
+
+    assert report["admitted"] == report["completed"] == 5
+    assert report["spend"]["budget_limited_days"] == 1
+    assert report["queue_wait_days"]["p50"] == 0.0
+    # The last two wait for the first midnight
+    assert report["queue_wait_days"]["max"] == pytest.approx(1 - 0.3)
+
+
+def test_submission_over_a_whole_days_budget_is_never_admitted(config):
+    arrivals = [(0.0, "research", 200000), (0.5, "research", 10000)]
+    report = CapacitySimulator(config, seed=1).run(arrivals, days=2)
+
+    assert report["never_admissible"] == 1
+    assert report["admitted"] == report["completed"] == 1
+    assert report["sla"]["misses"] == 1
+
+
+def test_same_seed_gives_the_same_report(config):
+    first = CapacitySimulator(config, seed=7)
+    second = CapacitySimulator(config, seed=7)
+    assert first.run(first.synthetic_arrivals(5, 2.0), 5) == second.run(second.synthetic_arrivals(5, 2.0), 5)
+
+
+def test_replay_repeats_history_to_fill_the_horizon(config):
+    day = 86400
+    history = [(1000.0, "research", 9000), (1000.0 + day, "survey", 12000)]
+    arrivals = CapacitySimulator(config).replay_arrivals(history, days=4)
+    assert [(round(time, 3), paper_type) for time, paper_type, _ in arrivals] == [
+        (0.0, "research"), (1.0, "survey"), (1.0, "research"), (2.0, "survey"),
+        (2.0, "research"), (3.0, "survey"), (3.0, "research")]
@@ -0,0 +1,34 @@
+"""Warm worker paper cache"""
+
+from agents import worker as worker_module
+from agents.worker import ReviewWorker
+
+
+class Text:
+    def __init__(self, submission_id):
+        self.submission_id = submission_id
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_least_recently_used_paper_is_closed_after_its_last_reader(tmp_path, monkeypatch):
+    for submission_id in ("AJ-1", "AJ-2"):
+        (tmp_path / f"{submission_id}.pdf").write_bytes(b"%PDF")
+    monkeypatch.setattr(worker_module, "resolve_pdf", lambda path: tmp_path / f"{path.name}.pdf")
+    monkeypatch.setattr(worker_module.runner, "load_submission", lambda sid: (Text(sid), {"id": sid}))
+    worker = ReviewWorker(concurrency=1, max_papers=1)
+
+    first, _ = worker._acquire_paper("AJ-1")
+    assert worker._acquire_paper("AJ-1")[0] is first
+    worker._release_paper(first)
+
+    second, _ = worker._acquire_paper("AJ-2")
+    assert list(worker._papers) == ["AJ-2"]
+    # Evicted, but a job is still reading it
+    assert not first.closed
+    worker._release_paper(first)
+    assert first.closed
+    assert not second.closed
+    worker._release_paper(second)